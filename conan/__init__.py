@@ -1,5 +1,5 @@
 from conans.model.conan_file import ConanFile
-from conan.tools.scm import Version
+from conans.model.version import Version
 from conans import __version__
 
 
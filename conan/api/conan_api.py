@@ -16,6 +16,7 @@ from conan.api.subapi.remotes import RemotesAPI
 from conan.api.subapi.remove import RemoveAPI
 from conan.api.subapi.search import SearchAPI
 from conan.api.subapi.upload import UploadAPI
+from conan.internal.conan_app import ConanSession
 from conans.client.conf.required_version import check_required_conan_version
 from conans.client.migrations import ClientMigrator
 from conans.client.userio import init_colorama
@@ -39,6 +40,7 @@ class ConanAPI(object):
         migrator = ClientMigrator(self.cache_folder, Version(client_version))
         migrator.migrate()
         check_required_conan_version(self.cache_folder)
+        self._session = None
 
         self.remotes = RemotesAPI(self)
         # Search recipes by wildcard and packages filtering by configuracion
@@ -57,3 +59,17 @@ class ConanAPI(object):
         self.cache = CacheAPI(self)
         self.lockfile = LockfileAPI(self)
         self.local = LocalAPI(self)
+
+    @property
+    def session(self):
+        """ The ConanSession (cache, configuration, hooks, remotes connections) shared by all the
+        API calls, loaded the first time it is needed, and again if the files it loaded (the
+        global.conf, editables, hooks...) have been modified since then """
+        if self._session is None or self._session.outdated():
+            self._session = ConanSession(self.cache_folder)
+        return self._session
+
+    def reinit(self):
+        """ Discards the current session, so the next API call loads again the configuration,
+        hooks and remotes connections. Called by the API calls that modify them """
+        self._session = None
@@ -1,4 +1,7 @@
 import sys
+import threading
+from contextlib import contextmanager
+from io import StringIO
 
 from colorama import Fore, Style
 
@@ -51,6 +54,7 @@ class ConanOutput:
     # Singleton
     _conan_output_level = LEVEL_STATUS
     _silent_warn_tags = []
+    _captured = threading.local()  # The output of the current thread, see capture_output()
 
     def __init__(self, scope=""):
         self.stream = sys.stderr
@@ -58,6 +62,9 @@ class ConanOutput:
         # FIXME:  This is needed because in testing we are redirecting the sys.stderr to a buffer
         #         stream to capture it, so colorama is not there to strip the color bytes
         self._color = color_enabled(self.stream)
+        captured = getattr(self._captured, "stream", None)
+        if captured is not None:
+            self.stream = captured
 
     @classmethod
     def define_silence_warnings(cls, warnings):
@@ -213,6 +220,21 @@ class ConanOutput:
         self.stream.flush()
 
 
+@contextmanager
+def capture_output():
+    """ The ConanOutput of the current thread is written to the returned buffer instead of
+    stderr, so the output of a task running in a background thread can be written later, by the
+    main thread, not interleaved with its output
+    """
+    buffer = StringIO()
+    previous = getattr(ConanOutput._captured, "stream", None)
+    ConanOutput._captured.stream = buffer
+    try:
+        yield buffer
+    finally:
+        ConanOutput._captured.stream = previous
+
+
 def cli_out_write(data, fg=None, bg=None, endline="\n", indentation=0):
     """
     Output to be used by formatters to dump information to stdout
@@ -14,40 +14,58 @@ class CacheAPI:
         self.conan_api = conan_api
 
     def export_path(self, ref: RecipeReference):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         ref = _resolve_latest_ref(app, ref)
         ref_layout = app.cache.ref_layout(ref)
         return ref_layout.export()
 
     def export_source_path(self, ref: RecipeReference):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         ref = _resolve_latest_ref(app, ref)
         ref_layout = app.cache.ref_layout(ref)
         return ref_layout.export_sources()
 
     def source_path(self, ref: RecipeReference):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         ref = _resolve_latest_ref(app, ref)
         ref_layout = app.cache.ref_layout(ref)
         return ref_layout.source()
 
     def build_path(self, pref: PkgReference):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         pref = _resolve_latest_pref(app, pref)
         ref_layout = app.cache.pkg_layout(pref)
         return ref_layout.build()
 
     def package_path(self, pref: PkgReference):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         pref = _resolve_latest_pref(app, pref)
         ref_layout = app.cache.pkg_layout(pref)
         return ref_layout.package()
 
-    def check_integrity(self, package_list):
-        """Check if the recipes and packages are corrupted (it will raise a ConanExcepcion)"""
-        app = ConanApp(self.conan_api.cache_folder)
+    def check_integrity(self, package_list, report=None, corrupted=None):
+        """Check if the recipes and packages are corrupted (it will raise a ConanExcepcion)
+
+        :param package_list: the recipes and packages to check
+        :param report: optional path of a json file to write the corrupted recipes and packages
+        :param corrupted: "remove" or "quarantine" the corrupted recipes and packages, or None
+                          to keep them
+        """
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         checker = IntegrityChecker(app)
-        checker.check(package_list)
+        checker.check(package_list, report, corrupted)
+
+    def evict(self, max_size=None, max_age=None):
+        """ Remove the least recently used package revisions, and then the recipe revisions
+        without packages, until the cache is within the given budgets. The recipes and packages
+        used by other running Conan processes are never removed.
+
+        :param max_size: maximum size in bytes of the cache storage, or None
+        :param max_age: maximum time in seconds since the last usage, or None
+        :return: the removed recipe references, package references, and freed bytes
+        """
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
+        return app.cache.evict(max_size, max_age)
 
     def clean(self, package_list, source=True, build=True, download=True, temp=True):
         """
@@ -57,13 +75,15 @@ class CacheAPI:
         :param source: boolean, remove the "source" folder if True
         :param build: boolean, remove the "build" folder if True
         :param download: boolen, remove the "download (.tgz)" folder if True
-        :param temp: boolean, remove the temporary folders
+        :param temp: boolean, remove the temporary folders, and the deduplicated files that
+                     no package uses anymore
         :return:
         """
 
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         if temp:
             rmdir(app.cache.temp_folder)
+            app.cache.clean_objects()
         for ref, ref_bundle in package_list.refs():
             ref_layout = app.cache.ref_layout(ref)
             if source:
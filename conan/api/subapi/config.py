@@ -13,15 +13,20 @@ class ConfigAPI:
                 source_folder=None, target_folder=None):
         # TODO: We probably want to split this into git-folder-http cases?
         from conans.client.conf.config_installer import configuration_install
-        app = ConanApp(self.conan_api.cache_folder)
-        return configuration_install(app, path_or_url, verify_ssl,
-                                     config_type=config_type, args=args,
-                                     source_folder=source_folder, target_folder=target_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
+        try:
+            return configuration_install(app, path_or_url, verify_ssl,
+                                         config_type=config_type, args=args,
+                                         source_folder=source_folder,
+                                         target_folder=target_folder)
+        finally:
+            # The installed configuration, hooks, remotes... might be different
+            self.conan_api.reinit()
 
     def get(self, name, default=None, check_type=None):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         return app.cache.new_config.get(name, default=default, check_type=check_type)
 
     def show(self, pattern):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         return app.cache.new_config.show(pattern)
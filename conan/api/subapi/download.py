@@ -14,7 +14,7 @@ class DownloadAPI:
 
     def recipe(self, ref: RecipeReference, remote: Remote):
         output = ConanOutput()
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         skip_download = app.cache.exists_rrev(ref)
         if skip_download:
             output.info(f"Skip recipe {ref.repr_notime()} download, already in cache")
@@ -34,7 +34,7 @@ class DownloadAPI:
 
     def package(self, pref: PkgReference, remote: Remote):
         output = ConanOutput()
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         if not app.cache.exists_rrev(pref.ref):
             raise ConanException("The recipe of the specified package "
                                  "doesn't exist, download it first")
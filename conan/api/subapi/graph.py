@@ -6,6 +6,7 @@ from conans.client.graph.graph import Node, RECIPE_CONSUMER, CONTEXT_HOST, RECIP
     CONTEXT_BUILD
 from conans.client.graph.graph_binaries import GraphBinariesAnalyzer
 from conans.client.graph.graph_builder import DepsGraphBuilder
+from conans.client.graph.graph_cache import GraphCache, BinariesCache
 from conans.client.graph.profile_node_definer import initialize_conanfile_profile, consumer_definer
 from conans.client.loader import parse_conanfile
 
@@ -23,17 +24,19 @@ class GraphAPI:
                                       name=None, version=None, user=None, channel=None,
                                       update=None, remotes=None, lockfile=None,
                                       is_build_require=False):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
 
         if path.endswith(".py"):
-            conanfile = app.loader.load_consumer(path,
-                                                 name=name,
-                                                 version=version,
-                                                 user=user,
-                                                 channel=channel,
-                                                 graph_lock=lockfile,
-                                                 remotes=remotes,
-                                                 update=update)
+            # The python_requires are resolved too
+            with self.conan_api.session.metadata_cache.reuse_fresh(not update):
+                conanfile = app.loader.load_consumer(path,
+                                                     name=name,
+                                                     version=version,
+                                                     user=user,
+                                                     channel=channel,
+                                                     graph_lock=lockfile,
+                                                     remotes=remotes,
+                                                     update=update)
             ref = RecipeReference(conanfile.name, conanfile.version,
                                   conanfile.user, conanfile.channel)
             context = CONTEXT_BUILD if is_build_require else CONTEXT_HOST
@@ -66,7 +69,7 @@ class GraphAPI:
         :return: a graph Node, recipe=RECIPE_CONSUMER
         """
 
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         # necessary for correct resolution and update of remote python_requires
 
         loader = app.loader
@@ -91,7 +94,7 @@ class GraphAPI:
     def _load_root_virtual_conanfile(self, profile_host, profile_build, requires, tool_requires):
         if not requires and not tool_requires:
             raise ConanException("Provide requires or tool_requires")
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         conanfile = app.loader.load_virtual(requires=requires,  tool_requires=tool_requires)
         consumer_definer(conanfile, profile_host, profile_build)
         root_node = Node(ref=None, conanfile=conanfile, context=CONTEXT_HOST, recipe=RECIPE_VIRTUAL)
@@ -164,7 +167,7 @@ class GraphAPI:
         :param check_update: For "graph info" command, check if there are recipe updates
         """
         ConanOutput().title("Computing dependency graph")
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
 
         assert profile_host is not None
         assert profile_build is not None
@@ -172,7 +175,25 @@ class GraphAPI:
         remotes = remotes or []
         builder = DepsGraphBuilder(app.proxy, app.loader, app.range_resolver, app.cache, remotes,
                                    update, check_update)
-        deps_graph = builder.load_graph(root_node, profile_host, profile_build, lockfile)
+        graph_cache = None
+        cached = None
+        # Checking for updates always needs the remotes, the cache can't be used
+        if app.cache.new_config.get("core.graph:cache", check_type=bool) and \
+                not update and not check_update:
+            graph_cache = GraphCache(app.cache, root_node, profile_host, profile_build, lockfile,
+                                     remotes)
+            cached = graph_cache.get(graph_cache.key())
+        if cached is not None:
+            ConanOutput().info("Using the cached resolution of the dependency graph")
+            # Only the very same version ranges take it, the changed ones are resolved again
+            app.range_resolver.resolved_ranges.update(cached)
+        metadata_cache = self.conan_api.session.metadata_cache
+        with metadata_cache.reuse_fresh(not update and not check_update):
+            deps_graph = builder.load_graph(root_node, profile_host, profile_build, lockfile)
+        if graph_cache is not None and not deps_graph.error:
+            if cached is None or len(deps_graph.resolved_ranges) > len(cached):
+                # The resolution could have retrieved new recipes from remotes, changing the key
+                graph_cache.save(graph_cache.key(), deps_graph.resolved_ranges)
         return deps_graph
 
     def analyze_binaries(self, graph, build_mode=None, remotes=None, update=None, lockfile=None):
@@ -188,9 +209,15 @@ class GraphAPI:
             revisions for already existing recipes in the Conan cache
         """
         ConanOutput().title("Computing necessary packages")
-        conan_app = ConanApp(self.conan_api.cache_folder)
+        conan_app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         binaries_analyzer = GraphBinariesAnalyzer(conan_app)
-        binaries_analyzer.evaluate_graph(graph, build_mode, lockfile, remotes, update)
+        binaries_cache = None
+        # Checking for updates always needs the remotes, the cache can't be used
+        if conan_app.cache.new_config.get("core.graph:cache", check_type=bool) and not update:
+            binaries_cache = BinariesCache(conan_app.cache, build_mode, lockfile, remotes)
+        with self.conan_api.session.metadata_cache.reuse_fresh(not update):
+            binaries_analyzer.evaluate_graph(graph, build_mode, lockfile, remotes, update,
+                                             binaries_cache)
 
     def load_conanfile_class(self, path):
         """ Given a path to a conanfile.py file, it loads its class (not instance) to allow
@@ -44,7 +44,7 @@ class LocalAPI:
     def editable_add(self, path, name=None, version=None, user=None, channel=None, cwd=None,
                      output_folder=None):
         path = self._conan_api.local.get_conanfile_path(path, cwd, py=True)
-        app = ConanApp(self._conan_api.cache_folder)
+        app = ConanApp(self._conan_api.cache_folder, self._conan_api.session)
         conanfile = app.loader.load_named(path, name, version, user, channel)
         ref = RecipeReference(conanfile.name, conanfile.version, conanfile.user, conanfile.channel)
         # Retrieve conanfile.py from target_path
@@ -52,22 +52,25 @@ class LocalAPI:
         output_folder = make_abs_path(output_folder) if output_folder else None
         # Check the conanfile is there, and name/version matches
         app.cache.editable_packages.add(ref, target_path, output_folder=output_folder)
+        self._conan_api.reinit()
         return ref
 
     def editable_remove(self, path=None, requires=None, cwd=None):
-        app = ConanApp(self._conan_api.cache_folder)
+        app = ConanApp(self._conan_api.cache_folder, self._conan_api.session)
         if path:
             path = self._conan_api.local.get_conanfile_path(path, cwd, py=True)
-        return app.cache.editable_packages.remove(path, requires)
+        removed = app.cache.editable_packages.remove(path, requires)
+        self._conan_api.reinit()
+        return removed
 
     def editable_list(self):
-        app = ConanApp(self._conan_api.cache_folder)
+        app = ConanApp(self._conan_api.cache_folder, self._conan_api.session)
         return app.cache.editable_packages.edited_refs
 
     def source(self, path, name=None, version=None, user=None, channel=None):
         """ calls the 'source()' method of the current (user folder) conanfile.py
         """
-        app = ConanApp(self._conan_api.cache_folder)
+        app = ConanApp(self._conan_api.cache_folder, self._conan_api.session)
         conanfile = app.loader.load_consumer(path, name=name, version=version,
                                              user=user, channel=channel, graph_lock=None)
         # This profile is empty, but with the conf from global.conf
@@ -85,13 +88,13 @@ class LocalAPI:
         conanfile.folders.set_base_build(None)
         conanfile.folders.set_base_package(None)
 
-        app = ConanApp(self._conan_api.cache_folder)
+        app = ConanApp(self._conan_api.cache_folder, self._conan_api.session)
         run_source_method(conanfile, app.hook_manager)
 
     def build(self, conanfile):
         """ calls the 'build()' method of the current (user folder) conanfile.py
         """
-        app = ConanApp(self._conan_api.cache_folder)
+        app = ConanApp(self._conan_api.cache_folder, self._conan_api.session)
         conanfile.folders.set_base_package(conanfile.folders.base_build)
         conanfile.folders.set_base_pkg_metadata(os.path.join(conanfile.build_folder, "metadata"))
         run_build_method(conanfile, app.hook_manager)
@@ -105,7 +108,7 @@ class LocalAPI:
                 conanfile.test()
 
     def inspect(self, conanfile_path, remotes, lockfile):
-        app = ConanApp(self._conan_api.cache_folder)
+        app = ConanApp(self._conan_api.cache_folder, self._conan_api.session)
         conanfile = app.loader.load_named(conanfile_path, name=None, version=None,
                                           user=None, channel=None, remotes=remotes, graph_lock=lockfile)
         return conanfile
@@ -1,8 +1,6 @@
 import fnmatch
 import os
 
-from jinja2 import Template, StrictUndefined
-
 from conans.util.files import load
 from conans import __version__
 
@@ -105,6 +103,7 @@ class NewAPI:
         definitions["package_name"] = as_package_name(name)
         definitions["as_name"] = as_name
         definitions["names"] = lambda x: ", ".join(r.split("/", 1)[0] for r in x)
+        from jinja2 import Template, StrictUndefined
         for k, v in template_files.items():
             k = Template(k, keep_trailing_newline=True, undefined=StrictUndefined).render(
                 **definitions)
@@ -1,6 +1,5 @@
 import os
 
-from conans.client.cache.cache import ClientCache
 from conans.client.profile_loader import ProfileLoader
 from conans.model.profile import Profile
 
@@ -15,7 +14,7 @@ class ProfilesAPI:
         :return: the path to the default "host" profile, either in the cache or as defined
             by the user in configuration
         """
-        cache = ClientCache(self._conan_api.cache_folder)
+        cache = self._conan_api.session.cache
         loader = ProfileLoader(cache)
         return loader.get_default_host()
 
@@ -24,7 +23,7 @@ class ProfilesAPI:
         :return: the path to the default "build" profile, either in the cache or as
             defined by the user in configuration
         """
-        cache = ClientCache(self._conan_api.cache_folder)
+        cache = self._conan_api.session.cache
         loader = ProfileLoader(cache)
         return loader.get_default_build()
 
@@ -43,7 +42,7 @@ class ProfilesAPI:
         finally adding the individual settings, options (priority over the profiles)
         """
         assert isinstance(profiles, list), "Please provide a list of profiles"
-        cache = ClientCache(self._conan_api.cache_folder)
+        cache = self._conan_api.session.cache
         loader = ProfileLoader(cache)
         profile = loader.from_cli_args(profiles, settings, options, conf, cwd)
         profile.conf.validate()
@@ -57,7 +56,7 @@ class ProfilesAPI:
         :return: the resolved path of the given profile name, that could be in the cache,
             or local, depending on the "cwd"
         """
-        cache = ClientCache(self._conan_api.cache_folder)
+        cache = self._conan_api.session.cache
         loader = ProfileLoader(cache)
         cwd = cwd or os.getcwd()
         profile_path = loader.get_profile_path(profile, cwd, exists=exists)
@@ -72,7 +71,7 @@ class ProfilesAPI:
         paths_to_ignore = ['.DS_Store']
 
         profiles = []
-        cache = ClientCache(self._conan_api.cache_folder)
+        cache = self._conan_api.session.cache
         profiles_path = cache.profiles_path
         if os.path.exists(profiles_path):
             for current_directory, _, files in os.walk(profiles_path, followlinks=True):
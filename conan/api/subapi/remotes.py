@@ -19,7 +19,7 @@ class RemotesAPI:
         :param only_enabled:
         :return:
         """
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         remotes = app.cache.remotes_registry.list()
         if only_enabled:
             remotes = [r for r in remotes if not r.disabled]
@@ -59,51 +59,56 @@ class RemotesAPI:
         return remotes
 
     def get(self, remote_name):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         return app.cache.remotes_registry.read(remote_name)
 
     def add(self, remote: Remote, force=False):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         app.cache.remotes_registry.add(remote, force=force)
+        self.conan_api.reinit()
 
     def remove(self, remote_name):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         remotes = self.list(remote_name, only_enabled=False)
         for remote in remotes:
             app.cache.remotes_registry.remove(remote.name)
             users_clean(app.cache.localdb, remote.url)
+        self.conan_api.reinit()
 
     def update(self, remote: Remote):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         app.cache.remotes_registry.update(remote)
+        self.conan_api.reinit()
 
     def move(self, remote: Remote, index: int):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         app.cache.remotes_registry.move(remote, index)
+        self.conan_api.reinit()
 
     def rename(self, remote: Remote, new_name: str):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         app.cache.remotes_registry.rename(remote, new_name)
+        self.conan_api.reinit()
 
     def user_info(self, remote: Remote):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         return users_list(app.cache.localdb, remotes=[remote])[0]
 
     def login(self, remote: Remote, username, password):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         app.remote_manager.authenticate(remote, username, password)
 
     def logout(self, remote: Remote):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         # The localdb only stores url + username + token, not remote name, so use URL as key
         users_clean(app.cache.localdb, remote.url)
 
     def user_set(self, remote: Remote, username):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         return user_set(app.cache.localdb, username, remote)
 
     def auth(self, remote: Remote, with_user=False):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         if with_user:
             user, token, _ = app.cache.localdb.get_login(remote.url)
             if not user:
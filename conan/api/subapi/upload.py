@@ -17,7 +17,7 @@ class UploadAPI:
     def check_upstream(self, package_list, remote, force=False):
         """Check if the artifacts are already in the specified remote, skipping them from
         the package_list in that case"""
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         for ref, bundle in package_list.refs():
             layout = app.cache.ref_layout(ref)
             conanfile_path = layout.conanfile()
@@ -33,7 +33,7 @@ class UploadAPI:
         """Compress the recipes and packages and fill the upload_data objects
         with the complete information. It doesn't perform the upload nor checks upstream to see
         if the recipe is still there"""
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         preparator = PackagePreparator(app)
         preparator.prepare(package_list, enabled_remotes)
         signer = PkgSignaturesPlugin(app.cache)
@@ -41,13 +41,13 @@ class UploadAPI:
         signer.sign(package_list)
 
     def upload(self, package_list, remote):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         app.remote_manager.check_credentials(remote)
         executor = UploadExecutor(app)
         executor.upload(package_list, remote)
 
     def upload_backup_sources(self, package_list):
-        app = ConanApp(self.conan_api.cache_folder)
+        app = ConanApp(self.conan_api.cache_folder, self.conan_api.session)
         config = app.cache.new_config
         url = config.get("core.sources:upload_url")
         if url is None:
@@ -1,4 +1,5 @@
 import importlib
+import json
 import os
 import pkgutil
 import re
@@ -10,17 +11,77 @@ from collections import defaultdict
 from difflib import get_close_matches
 from inspect import getmembers
 
-from conan.api.conan_api import ConanAPI
 from conan.api.output import ConanOutput, Color, cli_out_write, LEVEL_TRACE
 from conan.cli.command import ConanSubCommand
 from conan.cli.exit_codes import SUCCESS, ERROR_MIGRATION, ERROR_GENERAL, USER_CTRL_C, \
     ERROR_SIGTERM, USER_CTRL_BREAK, ERROR_INVALID_CONFIGURATION, ERROR_UNEXPECTED
 from conans import __version__ as client_version
-from conans.client.cache.cache import ClientCache
 from conan.errors import ConanException, ConanInvalidConfiguration, ConanMigrationError
+from conans.client.cache.cache import EXTENSIONS_FOLDER
 from conans.util.files import exception_message_safe
 
 
+COMMANDS_MANIFEST = ".commands_manifest.json"
+
+
+class _CommandsManifest:
+    """ The name, group and documentation of the command of every module of conan.cli.commands
+    and of the custom commands, cached in the Conan home, so building the commands table and the
+    help doesn't need to import all of them, only the one that runs. The entry of a module is
+    discarded when its file changes, and all of them with a different Conan version.
+    """
+
+    def __init__(self, cache_folder):
+        self._path = os.path.join(cache_folder, COMMANDS_MANIFEST)
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self._modules = data.get("modules", {}) if data.get("version") == client_version else {}
+        self._visited = {}
+
+    @staticmethod
+    def _stamp(folder, module):
+        if module.ispkg:
+            path = os.path.join(folder, module.name, "__init__.py")
+        else:
+            path = os.path.join(folder, module.name + ".py")
+        try:
+            st = os.stat(path)
+        except OSError:  # Not a source file, cannot be checked, it is never cached
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def get(self, import_path, folder, module):
+        """ the cached {"name", "group", "doc"} of the module command, None if it must be
+        imported """
+        stamp = self._stamp(folder, module)
+        entry = self._modules.get(import_path)
+        if stamp is None or entry is None or entry["stamp"] != stamp:
+            return None
+        self._visited[import_path] = entry
+        return entry["command"]
+
+    def set(self, import_path, folder, module, command):
+        stamp = self._stamp(folder, module)
+        if stamp is not None:
+            self._visited[import_path] = {"stamp": stamp, "command": command}
+
+    def save(self):
+        """ only the visited modules are kept, the removed ones are discarded """
+        if self._visited == self._modules:
+            return
+        tmp = "{}.{}.tmp".format(self._path, os.getpid())
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"version": client_version, "modules": self._visited}, f)
+            os.replace(tmp, self._path)  # Atomic, for concurrent conan processes
+        except OSError:  # A read-only home, it will just be slower
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
 class Cli:
     """A single command of the conan application, with all the first level commands. Manages the
     parsing of parameters and delegates functionality to the conan python api. It can also show the
@@ -28,20 +89,26 @@ class Cli:
     """
 
     def __init__(self, conan_api):
+        from conan.api.conan_api import ConanAPI  # Not imported by the "conan --version" path
         assert isinstance(conan_api, ConanAPI), \
             "Expected 'Conan' type, got '{}'".format(type(conan_api))
         self._conan_api = conan_api
         self._groups = defaultdict(list)
-        self._commands = {}
+        self._commands = {}  # The imported commands
+        self._command_infos = {}  # {name: (import_path, method_name, doc)} of all commands
 
     def _add_commands(self):
+        manifest = _CommandsManifest(self._conan_api.cache_folder)
         conan_commands_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commands")
         for module in pkgutil.iter_modules([conan_commands_path]):
             module_name = module[1]
-            self._add_command("conan.cli.commands.{}".format(module_name), module_name)
+            self._add_command("conan.cli.commands.{}".format(module_name), module_name,
+                              manifest=manifest, folder=conan_commands_path, module=module)
 
-        custom_commands_path = ClientCache(self._conan_api.cache_folder).custom_commands_path
+        custom_commands_path = os.path.join(self._conan_api.cache_folder, EXTENSIONS_FOLDER,
+                                            "commands")
         if not os.path.isdir(custom_commands_path):
+            manifest.save()
             return
 
         sys.path.append(custom_commands_path)
@@ -49,7 +116,9 @@ class Cli:
             module_name = module[1]
             if module_name.startswith("cmd_"):
                 try:
-                    self._add_command(module_name, module_name.replace("cmd_", ""))
+                    self._add_command(module_name, module_name.replace("cmd_", ""),
+                                      manifest=manifest, folder=custom_commands_path,
+                                      module=module)
                 except Exception as e:
                     ConanOutput().error("Error loading custom command "
                                         "'{}.py': {}".format(module_name, e))
@@ -64,18 +133,37 @@ class Cli:
                     module_path = f"{folder}.{module_name}"
                     try:
                         self._add_command(module_path, module_name.replace("cmd_", ""),
-                                          package=folder)
+                                          package=folder, manifest=manifest,
+                                          folder=layer_folder, module=module)
                     except Exception as e:
                         ConanOutput().error(f"Error loading custom command {module_path}: {e}")
+        manifest.save()
 
-    def _add_command(self, import_path, method_name, package=None):
+    def _add_command(self, import_path, method_name, package=None, manifest=None, folder=None,
+                     module=None):
+        """ registers the command of the module, only importing it if it is not in the manifest
+        """
+        command = manifest.get(import_path, folder, module) if manifest is not None else None
+        if command is None:
+            command_wrapper = self._import_command(import_path, method_name)
+            command = {"name": command_wrapper.name, "group": command_wrapper.group,
+                       "doc": command_wrapper.doc}
+            if manifest is not None:
+                manifest.set(import_path, folder, module, command)
+        else:
+            command_wrapper = None
+        if command["doc"]:
+            name = f"{package}:{command['name']}" if package else command["name"]
+            self._command_infos[name] = (import_path, method_name, command["doc"])
+            self._groups[command["group"]].append(name)
+            if command_wrapper is not None:
+                self._commands[name] = command_wrapper
+
+    @staticmethod
+    def _import_command(import_path, method_name):
         try:
             imported_module = importlib.import_module(import_path)
             command_wrapper = getattr(imported_module, method_name)
-            if command_wrapper.doc:
-                name = f"{package}:{command_wrapper.name}" if package else command_wrapper.name
-                self._commands[name] = command_wrapper
-                self._groups[command_wrapper.group].append(name)
             for name, value in getmembers(imported_module):
                 if isinstance(value, ConanSubCommand):
                     if name.startswith("{}_".format(method_name)):
@@ -87,13 +175,23 @@ class Cli:
         except AttributeError:
             raise ConanException("There is no {} method defined in {}".format(method_name,
                                                                               import_path))
+        return command_wrapper
+
+    def _command(self, name):
+        """ the command, imported now if it was in the manifest """
+        command = self._commands.get(name)
+        if command is None:
+            import_path, method_name, _ = self._command_infos[name]
+            command = self._import_command(import_path, method_name)
+            self._commands[name] = command
+        return command
 
     def _print_similar(self, command):
         """ Looks for similar commands and prints them if found.
         """
         output = ConanOutput()
         matches = get_close_matches(
-            word=command, possibilities=self._commands.keys(), n=5, cutoff=0.75)
+            word=command, possibilities=self._command_infos.keys(), n=5, cutoff=0.75)
 
         if len(matches) == 0:
             return
@@ -112,7 +210,7 @@ class Cli:
         """
         Prints a summary of all commands.
         """
-        max_len = max((len(c) for c in self._commands)) + 1
+        max_len = max((len(c) for c in self._command_infos)) + 1
         line_format = '{{: <{}}}'.format(max_len)
 
         for group_name, comm_names in sorted(self._groups.items()):
@@ -122,7 +220,7 @@ class Cli:
                 cli_out_write(line_format.format(name), Color.GREEN, endline="")
 
                 # Help will be all the lines up to the first empty one
-                docstring_lines = self._commands[name].doc.split('\n')
+                docstring_lines = self._command_infos[name][2].split('\n')
                 start = False
                 data = []
                 for line in docstring_lines:
@@ -152,7 +250,7 @@ class Cli:
             self._output_help_cli()
             return
         try:
-            command = self._commands[command_argument]
+            command = self._command(command_argument)
         except KeyError as exc:
             if command_argument in ["-v", "--version"]:
                 cli_out_write("Conan version %s" % client_version, fg=Color.BRIGHT_GREEN)
@@ -168,7 +266,7 @@ class Cli:
             raise ConanException("Unknown command %s" % str(exc))
 
         try:
-            command.run(self._conan_api, self._commands[command_argument].parser, args[0][1:])
+            command.run(self._conan_api, command.parser, args[0][1:])
         except Exception as e:
             # must be a local-import to get updated value
             if ConanOutput.level_allowed(LEVEL_TRACE):
@@ -224,28 +322,23 @@ class Cli:
         return ERROR_UNEXPECTED
 
 
-def main(args):
-    """ main entry point of the conan application, using a Command to
-    parse parameters
-
-    Exit codes for conan command:
-
-        0: Success (done)
-        1: General ConanException error (done)
-        2: Migration error
-        3: Ctrl+C
-        4: Ctrl+Break
-        5: SIGTERM
-        6: Invalid configuration (done)
+def run_cli(args, cache_folder=None, conan_api=None):
+    """ runs the command with the given ConanAPI, or a new one for the given Conan home (the
+    default one if None), and returns its exit code
     """
-
-    try:
-        conan_api = ConanAPI()
-    except ConanMigrationError:  # Error migrating
-        sys.exit(ERROR_MIGRATION)
-    except ConanException as e:
-        sys.stderr.write("Error in Conan initialization: {}".format(e))
-        sys.exit(ERROR_GENERAL)
+    if args and args[0] in ["-v", "--version"]:
+        # Doesn't need the ConanAPI, nor its imports, nor initializing the Conan home
+        cli_out_write("Conan version %s" % client_version, fg=Color.BRIGHT_GREEN)
+        return SUCCESS
+    if conan_api is None:
+        from conan.api.conan_api import ConanAPI
+        try:
+            conan_api = ConanAPI(cache_folder)
+        except ConanMigrationError:  # Error migrating
+            return ERROR_MIGRATION
+        except ConanException as e:
+            sys.stderr.write("Error in Conan initialization: {}".format(e))
+            return ERROR_GENERAL
 
     def ctrl_c_handler(_, __):
         print('You pressed Ctrl+C!')
@@ -271,4 +364,21 @@ def main(args):
         cli.run(args)
     except BaseException as e:
         error = cli.exception_exit_error(e)
-    sys.exit(error)
+    return error
+
+
+def main(args):
+    """ main entry point of the conan application, using a Command to
+    parse parameters
+
+    Exit codes for conan command:
+
+        0: Success (done)
+        1: General ConanException error (done)
+        2: Migration error
+        3: Ctrl+C
+        4: Ctrl+Break
+        5: SIGTERM
+        6: Invalid configuration (done)
+    """
+    sys.exit(run_cli(args))
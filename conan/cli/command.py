@@ -127,6 +127,8 @@ class ConanCommand(BaseConanCommand):
                                                                   help='sub-command help')
             self._subcommand_parser.required = True
         subcommand.set_name(self.name)
+        if subcommand.name in self._subcommands:
+            return  # The module was already loaded by another Cli, e.g. in the Conan daemon
         subcommand.set_parser(self._parser, self._subcommand_parser)
         self._subcommands[subcommand.name] = subcommand
 
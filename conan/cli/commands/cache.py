@@ -1,10 +1,12 @@
 from conan.api.conan_api import ConanAPI
 from conan.api.model import ListPattern
-from conan.api.output import cli_out_write
+from conan.api.output import cli_out_write, ConanOutput
+from conan.cli import make_abs_path
 from conan.cli.command import conan_command, conan_subcommand, OnceArgument
 from conan.errors import ConanException
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
+from conans.util.dates import timedelta_from_text
 
 
 @conan_command(group="Consumer")
@@ -81,6 +83,43 @@ def cache_clean(conan_api: ConanAPI, parser, subparser, *args):
         conan_api.cache.clean(package_list)
 
 
+def _size_from_text(size):
+    units = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    value = size.upper().rstrip("B")
+    unit = value[-1:] if value[-1:] in units else ""
+    try:
+        return int(float(value[:len(value) - len(unit)]) * units[unit])
+    except ValueError:
+        raise ConanException(f"Incorrect size definition: {size}")
+
+
+@conan_subcommand()
+def cache_evict(conan_api: ConanAPI, parser, subparser, *args):
+    """
+    Remove the least recently used packages, and then the recipes without packages, until the
+    cache fits the given size and/or age budgets.
+    """
+    subparser.add_argument("--max-size", action=OnceArgument,
+                           help="Maximum size of the cache, e.g. 500M, 50GB")
+    subparser.add_argument("--max-age", action=OnceArgument,
+                           help="Remove everything not used in this time, e.g. 30d, 2w, 12h")
+    args = parser.parse_args(*args)
+
+    if args.max_size is None and args.max_age is None:
+        raise ConanException("Define at least one of --max-size or --max-age")
+    max_size = _size_from_text(args.max_size) if args.max_size is not None else None
+    max_age = timedelta_from_text(args.max_age).total_seconds() \
+        if args.max_age is not None else None
+    refs, prefs, freed = conan_api.cache.evict(max_size=max_size, max_age=max_age)
+    out = ConanOutput()
+    for pref in prefs:
+        out.info(f"Removed package {pref.repr_notime()}")
+    for ref in refs:
+        out.info(f"Removed recipe {ref.repr_notime()}")
+    out.success(f"Removed {len(refs)} recipes and {len(prefs)} packages, "
+                f"{freed / 1024 ** 2:.1f} MB freed")
+
+
 @conan_subcommand(formatters={"text": cli_out_write})
 def cache_check_integrity(conan_api: ConanAPI, parser, subparser, *args):
     """
@@ -90,8 +129,15 @@ def cache_check_integrity(conan_api: ConanAPI, parser, subparser, *args):
     subparser.add_argument('-p', '--package-query', action=OnceArgument,
                            help="Only the packages matching a specific query, e.g., "
                                 "os=Windows AND (arch=x86 OR compiler=gcc)")
+    subparser.add_argument("--report", action=OnceArgument,
+                           help="Write a json report of the corrupted recipes and packages to "
+                                "this file")
+    subparser.add_argument("--corrupted", choices=["remove", "quarantine"],
+                           help="Remove the corrupted recipes and packages from the cache, or "
+                                "move them to the quarantine folder of the cache storage")
     args = parser.parse_args(*args)
 
     ref_pattern = ListPattern(args.pattern, rrev="*", package_id="*", prev="*")
     package_list = conan_api.list.select(ref_pattern, package_query=args.package_query)
-    conan_api.cache.check_integrity(package_list)
+    report = make_abs_path(args.report) if args.report else None
+    conan_api.cache.check_integrity(package_list, report, args.corrupted)
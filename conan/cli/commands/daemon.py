@@ -0,0 +1,38 @@
+from conan.api.conan_api import ConanAPI
+from conan.api.output import ConanOutput
+from conan.cli.command import conan_command, conan_subcommand
+from conan.cli.daemon import ConanDaemon
+from conan.errors import ConanException
+from conans.client.daemon import daemon_supported, stop_daemon
+
+
+@conan_command()
+def daemon(conan_api: ConanAPI, parser, *args):
+    """
+    Manage the Conan daemon, a resident process that runs the conan commands for the current
+    Conan home, saving the startup time of every invocation.
+    """
+
+
+@conan_subcommand()
+def daemon_start(conan_api: ConanAPI, parser, subparser, *args):
+    """
+    Run the Conan daemon in the foreground, until 'conan daemon stop'. Meanwhile, the conan
+    commands for this Conan home are executed by it.
+    """
+    parser.parse_args(*args)
+    if not daemon_supported():
+        raise ConanException("The Conan daemon needs Unix domain sockets, not available here")
+    ConanDaemon(conan_api).serve()
+
+
+@conan_subcommand()
+def daemon_stop(conan_api: ConanAPI, parser, subparser, *args):
+    """
+    Stop the Conan daemon of the current Conan home.
+    """
+    parser.parse_args(*args)
+    if stop_daemon(conan_api.cache_folder):
+        ConanOutput().info("Conan daemon stopped")
+    else:
+        ConanOutput().info("There is no Conan daemon running")
@@ -0,0 +1,262 @@
+import os
+import re
+import signal
+import socket
+import struct
+import sys
+import threading
+from importlib import import_module
+
+import colorama
+
+from conan.api.conan_api import ConanAPI
+from conan.api.output import ConanOutput
+from conan.cli.cli import run_cli, COMMANDS_MANIFEST
+from conan.cli.exit_codes import ERROR_UNEXPECTED
+from conans.client.cache.cache import LOCALDB, COMPILED_SETTINGS, EXTENSIONS_FOLDER
+from conans.client.daemon import daemon_socket_path, receive_request, send_exit_code, \
+    daemon_running, CTRL_C
+from conans.client.graph.compatibility import BinaryCompatibility
+from conans.client.loader import load_python_file
+from conans.client.rest.metadata_cache import METADATA_CACHE_FOLDER
+from conans.client.userio import init_colorama
+from conans.errors import ConanException
+from conans.util.files import load
+
+# os.getenv("VAR"), os.environ.get("VAR") and os.environ["VAR"] in the global.conf template
+_ENV_REFERENCE = re.compile(r"""(?:getenv|environ\.get)\(\s*["'](\w+)["']"""
+                            r"""|environ\[\s*["'](\w+)["']\s*\]""")
+# Changed by the shell just by changing the current folder or running a command
+_SHELL_VARIABLES = ("PWD", "OLDPWD", "_", "SHLVL")
+
+
+class ConanDaemon:
+    """ Resident process that keeps a warm ConanAPI (imported modules, migrated home, loaded
+    configuration, settings and plugins) to run the commands of the thin clients, so they don't
+    pay the Python and Conan startup time.
+
+    Every command runs in a process forked from the daemon, with the stdin, stdout and stderr,
+    the current folder and the environment of the client, so commands are isolated from each
+    other exactly as different ``conan`` invocations. The daemon creates its ConanAPI again when
+    the top level files and folders of the Conan home (configuration, remotes...) or the
+    extensions change, and loads its configuration again when the ``CONAN_*`` variables of the
+    client environment, or the ones read by the global.conf template, are not the ones it was
+    loaded with. Only the processes of the same user that runs the daemon can run commands.
+    """
+
+    def __init__(self, conan_api):
+        self._home = conan_api.cache_folder
+        self._conan_api = conan_api
+        self._env = None  # The configuration variables the ConanAPI was loaded with
+        self._variables = None  # The variables read by the global.conf template
+        self.socket_path = daemon_socket_path(self._home)
+        # The files that Conan writes by itself, like the caches of other files contents
+        self._excluded = {self.socket_path,
+                          os.path.join(self._home, LOCALDB),
+                          os.path.join(self._home, METADATA_CACHE_FOLDER),
+                          os.path.join(self._home, COMMANDS_MANIFEST),
+                          os.path.join(self._home, COMPILED_SETTINGS)}
+        self._fingerprint = None
+
+    def _home_fingerprint(self):
+        """ the state of the top level files and folders of the home, and of the extensions,
+        without walking the packages storage or the profiles (loaded by every command)
+        """
+        result = []
+        extensions = os.path.join(self._home, EXTENSIONS_FOLDER)
+        watched = [entry.path for entry in os.scandir(self._home)
+                   if entry.path not in self._excluded]
+        for root, dirs, files in os.walk(extensions):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]  # Written by Python itself
+            watched.extend(os.path.join(root, d) for d in dirs)
+            watched.extend(os.path.join(root, f) for f in files)
+        for path in watched:
+            try:
+                st = os.stat(path)
+            except OSError:  # Removed meanwhile
+                continue
+            result.append((path, st.st_mtime_ns, st.st_size))
+        return result
+
+    def _template_variables(self):
+        """ the environment variables the global.conf template reads, None if they can't be told
+        """
+        path = os.path.join(self._home, "global.conf")
+        if not os.path.isfile(path):
+            return set()
+        content = load(path)
+        names = [a or b for a, b in _ENV_REFERENCE.findall(content)]
+        if len(names) != len(re.findall(r"getenv|environ", content)) or \
+                any(tag in content for tag in ("include", "import")):
+            return None
+        return set(names)
+
+    def _config_env(self, env):
+        """ the variables of the client environment that can change the loaded configuration """
+        if self._variables is None:
+            return {k: v for k, v in env.items() if k not in _SHELL_VARIABLES}
+        return {k: v for k, v in env.items() if k.startswith("CONAN_") or k in self._variables}
+
+    def _warm_up(self, env):
+        """ loads (again if the home files or the configuration variables of the environment
+        changed) everything that doesn't depend on the command, with the client environment
+        """
+        if self._fingerprint is not None and self._home_fingerprint() != self._fingerprint:
+            self._conan_api = None
+        if self._conan_api is not None and self._config_env(env) == self._env:
+            return
+        daemon_env = os.environ.copy()
+        os.environ.clear()
+        os.environ.update(env)
+        try:
+            if self._conan_api is None:
+                self._conan_api = ConanAPI(self._home)
+            else:
+                self._conan_api.reinit()
+            session = self._conan_api.session
+            cache = session.cache
+            cache.settings  # noqa
+            load_python_file(os.path.join(cache.plugins_path, "profile.py"))
+            BinaryCompatibility(cache)
+            self._excluded.update({cache.store, cache.default_sources_backup_folder})
+        except Exception:
+            self._conan_api = None  # The command creates it again, and reports the error
+        finally:
+            os.environ.clear()
+            os.environ.update(daemon_env)
+        self._variables = self._template_variables()
+        self._env = self._config_env(env)
+        self._fingerprint = self._home_fingerprint()
+
+    @staticmethod
+    def _import_commands():
+        """ imports everything that doesn't depend on the Conan home """
+        import jinja2  # noqa
+        import yaml  # noqa
+        commands_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commands")
+        for module in os.listdir(commands_path):
+            if module.endswith(".py") and module != "__init__.py":
+                import_module("conan.cli.commands.{}".format(module[:-3]))
+
+    def serve(self):
+        if daemon_running(self._home):
+            raise ConanException("There is already a Conan daemon for '{}'".format(self._home))
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)  # Stale socket of a killed daemon
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)  # Only the user can connect
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        server.listen(16)
+        self._import_commands()
+        self._warm_up(os.environ.copy())
+        ConanOutput().info("Conan daemon serving '{}' in {}".format(self._home, self.socket_path))
+        try:
+            while True:
+                conn, _ = server.accept()
+                self._reap_children()
+                with conn:
+                    request, fds = receive_request(conn)
+                    if _peer_uid(conn) != os.getuid():
+                        request = None  # Other users cannot run commands as this one
+                    if request is None or request.get("stop"):
+                        for fd in fds:
+                            os.close(fd)
+                        if request is None:
+                            continue
+                        break
+                    self._warm_up(request["env"])
+                    pid = os.fork()
+                    if pid == 0:
+                        exit_code = ERROR_UNEXPECTED
+                        try:
+                            server.close()
+                            exit_code = self._run_command(conn, request, fds)
+                        finally:
+                            os._exit(exit_code)
+                    for fd in fds:
+                        os.close(fd)
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            ConanOutput().info("Conan daemon finished")
+
+    @staticmethod
+    def _reap_children():
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except ChildProcessError:
+            pass
+
+    def _run_command(self, conn, request, fds):
+        """ runs in the forked process, as if it was the client process """
+        exit_code = ERROR_UNEXPECTED
+        try:
+            for target, fd in enumerate(fds[:3]):
+                os.dup2(fd, target)
+                os.close(fd)
+            sys.stdin = open(0, "r", closefd=False)
+            sys.stdout = open(1, "w", buffering=1, closefd=False)
+            sys.stderr = open(2, "w", buffering=1, closefd=False)
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            colorama.deinit()
+            init_colorama(sys.stderr)
+            self._watch_client(conn)
+
+            if self._conan_api is not None:
+                self._conan_api.session.requester.reset_connections()
+            exit_code = run_cli(request["args"], self._home, self._conan_api)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else ERROR_UNEXPECTED
+        except BaseException as e:
+            sys.stderr.write("Unexpected error in the Conan daemon: {}\n".format(e))
+        finally:
+            # The command finished, the client closing the connection must not interrupt this
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                send_exit_code(conn, exit_code)
+            except OSError:
+                pass
+        return exit_code
+
+    @staticmethod
+    def _watch_client(conn):
+        """ the client forwards its Ctrl+C, and if it dies, there is nobody to get the output """
+        def watch():
+            while True:
+                try:
+                    data = conn.recv(1)
+                except OSError:
+                    data = b""
+                if data == CTRL_C:
+                    os.kill(os.getpid(), signal.SIGINT)
+                elif not data:
+                    os.kill(os.getpid(), signal.SIGTERM)
+                    return
+
+        threading.Thread(target=watch, daemon=True).start()
+
+
+def _peer_uid(conn):
+    """ the user id of the process at the other end of the Unix socket, None if unknown """
+    try:
+        if hasattr(socket, "SO_PEERCRED"):  # Linux
+            creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            _, uid, _ = struct.unpack("3i", creds)
+            return uid
+        # macOS and BSDs: struct xucred {u_int cr_version; uid_t cr_uid; ...} in LOCAL_PEERCRED
+        sol_local, local_peercred = 0, 1
+        creds = conn.getsockopt(sol_local, local_peercred, struct.calcsize("2I"))
+        _, uid = struct.unpack("2I", creds[:struct.calcsize("2I")])
+        return uid
+    except (OSError, struct.error):
+        return None
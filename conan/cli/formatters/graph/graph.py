@@ -1,9 +1,6 @@
 import json
 import os
 
-from jinja2 import Template, select_autoescape
-
-
 from conan.api.output import cli_out_write
 from conan.cli.formatters.graph.graph_info_text import filter_graph
 from conan.cli.formatters.graph.info_graph_dot import graph_info_dot
@@ -93,6 +90,7 @@ class _Grapher(object):
 def _render_graph(graph, template, template_folder):
     graph = _Grapher(graph)
     from conans import __version__ as client_version
+    from jinja2 import Template, select_autoescape
     template = Template(template, autoescape=select_autoescape(['html', 'xml']))
     return template.render(graph=graph, base_template_path=template_folder, version=client_version)
 
@@ -1,23 +1,32 @@
 import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from conan.internal.cache.conan_reference_layout import RecipeLayout, PackageLayout
 # TODO: Random folders are no longer accessible, how to get rid of them asap?
-# TODO: Add timestamp for LRU
 # TODO: We need the workflow to remove existing references.
 from conan.internal.cache.db.cache_database import CacheDatabase
-from conans.errors import ConanReferenceAlreadyExistsInDB, ConanReferenceDoesNotExistInDB
+from conan.internal.cache.dedup import ObjectStore
+from conan.internal.cache.lru import register_user, in_use, protect_items, LRU_RESOLUTION
+from conans.errors import ConanReferenceAlreadyExistsInDB, ConanReferenceDoesNotExistInDB, \
+    ConanException
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.util.dates import revision_timestamp_now
 from conans.util.files import rmdir, renamedir
 
 
+# The corrupted recipes and packages are moved here, when they are not just removed
+QUARANTINE_FOLDER = ".quarantine"
+
+
 class DataCache:
 
-    def __init__(self, base_folder, db_filename):
+    def __init__(self, base_folder, db_filename, deduplicate=None):
         self._base_folder = os.path.realpath(base_folder)
         self._db = CacheDatabase(filename=db_filename)
+        self._deduplicate = deduplicate
+        self._object_store = None
 
     def _create_path(self, relative_path, remove_contents=True):
         path = self._full_path(relative_path)
@@ -135,8 +144,168 @@ class DataCache:
         assert ref.timestamp
         self._db.update_recipe_timestamp(ref)
 
-    def list_references(self):
-        return self._db.list_references()
+    def register_user(self):
+        """ the recipes and packages this process uses from now on are never evicted """
+        register_user(self._base_folder)
+
+    def protect(self, items):
+        """ the recipe and package revisions just resolved by this process are not evicted while
+        it runs, even if their last usage time is old, as it is written later
+        """
+        protect_items(self._base_folder, items)
+
+    def update_recipes_lru(self, refs):
+        self._update_lru(self._db.update_recipes_lru, refs)
+
+    def update_packages_lru(self, prefs):
+        self._update_lru(self._db.update_packages_lru, prefs)
+
+    def _update_lru(self, update, items):
+        self.register_user()
+        try:
+            update(items, revision_timestamp_now(), LRU_RESOLUTION)
+        except ConanException:
+            # Locked by other process, not worth waiting for it, but they can't be evicted
+            protect_items(self._base_folder, items)
+
+    def evict(self, max_size=None, max_age=None, threads=8):
+        """ Removes the least recently used package revisions, and then the recipe revisions
+        without packages, until the storage is not larger than ``max_size`` bytes and nothing
+        has been unused for more than ``max_age`` seconds. The recipes and packages used by the
+        running Conan processes are never removed.
+
+        The database entries are removed in a single transaction, and then the folders are
+        removed in parallel.
+        :return: the removed recipe references, package references, and the freed bytes
+        """
+        now = revision_timestamp_now()
+        in_use_time, in_use_items = in_use(self._base_folder)
+        protected = None if in_use_time is None else in_use_time - LRU_RESOLUTION
+        recipes = self._db.lru_recipes()
+        packages = self._db.lru_packages()
+
+        with ThreadPoolExecutor(threads, thread_name_prefix="conan_evict") as pool:
+            sizes = {}
+            if max_size is not None:
+                paths = [d["path"] for d in packages + recipes]
+                folders = [self._full_path(path) for path in paths]
+                sizes = dict(zip(paths, pool.map(_folder_size, folders)))
+            total = sum(sizes.values())
+
+            def evictable(item):
+                if _in_use(item, in_use_items):
+                    return False
+                lru = item["lru"] or 0
+                if protected is not None and lru >= protected:
+                    return False
+                return (max_age is not None and lru < now - max_age) or \
+                       (max_size is not None and total > max_size)
+
+            evicted_packages = []
+            for d in packages:
+                if evictable(d):
+                    evicted_packages.append(d)
+                    total -= sizes.get(d["path"], 0)
+            evicted_paths = {d["path"] for d in evicted_packages}
+            with_packages = {(str(d["pref"].ref), d["pref"].ref.revision) for d in packages
+                             if d["path"] not in evicted_paths}
+            evicted_recipes = []
+            for d in recipes:
+                if (str(d["ref"]), d["ref"].revision) not in with_packages and evictable(d):
+                    evicted_recipes.append(d)
+                    total -= sizes.get(d["path"], 0)
+
+            with self._db.transaction():
+                # Other processes could have used or created some of them meanwhile, or failed
+                # to write their usage because of this transaction
+                _, in_use_items = in_use(self._base_folder)
+                current_packages = self._db.lru_packages()
+                lrus = {d["path"]: d["lru"] for d in current_packages}
+                evicted_packages = [d for d in evicted_packages if d["path"] in lrus and
+                                    lrus[d["path"]] == d["lru"] and
+                                    not _in_use(d, in_use_items)]
+                evicted_paths = {d["path"] for d in evicted_packages}
+                with_packages = {(str(d["pref"].ref), d["pref"].ref.revision)
+                                 for d in current_packages if d["path"] not in evicted_paths}
+                lrus = {d["path"]: d["lru"] for d in self._db.lru_recipes()}
+                evicted_recipes = [d for d in evicted_recipes if d["path"] in lrus and
+                                   lrus[d["path"]] == d["lru"] and
+                                   not _in_use(d, in_use_items) and
+                                   (str(d["ref"]), d["ref"].revision) not in with_packages]
+                for d in evicted_packages:
+                    self._db.remove_package(d["pref"])
+                for d in evicted_recipes:
+                    self._db.remove_recipe(d["ref"])
+
+            evicted = evicted_packages + evicted_recipes
+            paths = [d["path"] for d in evicted if d["path"] not in sizes]
+            sizes.update(zip(paths, pool.map(_folder_size,
+                                             [self._full_path(path) for path in paths])))
+            list(pool.map(lambda d: rmdir(self._full_path(d["path"])), evicted))
+        if evicted_packages:
+            self.clean_objects()
+        freed = sum(sizes.get(d["path"], 0) for d in evicted)
+        return [d["ref"] for d in evicted_recipes], [d["pref"] for d in evicted_packages], freed
+
+    @property
+    def _objects(self):
+        if self._deduplicate and self._object_store is None:
+            self._object_store = ObjectStore(self._base_folder, self._deduplicate)
+        return self._object_store
+
+    def discard(self, refs, prefs, quarantine=False, threads=8):
+        """ Removes the given recipe revisions, with all their packages, and the given package
+        revisions. The database entries are removed in a single transaction, and then the
+        folders are removed in parallel, or moved to the quarantine folder, to inspect them.
+        :return: [(reference, quarantine folder or None)] of all the removed references
+        """
+        prefs = [pref for pref in prefs if pref.ref not in refs]
+        with self._db.transaction():
+            discarded = []
+            for ref in refs:
+                discarded.append((ref, self._db.try_get_recipe(ref)["path"]))
+            discarded.extend((d["pref"], d["path"]) for d in self._db.lru_packages()
+                             if d["pref"].ref in refs)
+            for pref in prefs:
+                discarded.append((pref, self._db.try_get_package(pref)["path"]))
+            for ref in refs:
+                self._db.remove_recipe(ref)  # Removes their packages too
+            for pref in prefs:
+                self._db.remove_package(pref)
+
+        def _discard(path):
+            if not quarantine:
+                rmdir(self._full_path(path))
+                return None
+            destination = os.path.join(self._base_folder, QUARANTINE_FOLDER, path)
+            rmdir(destination)  # From a previous quarantine of the same revision
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            renamedir(self._full_path(path), destination)
+            return destination
+
+        with ThreadPoolExecutor(threads, thread_name_prefix="conan_discard") as pool:
+            destinations = list(pool.map(_discard, [path for _, path in discarded]))
+        return [(ref, destination) for (ref, _), destination in zip(discarded, destinations)]
+
+    def deduplicate(self, layout: PackageLayout):
+        """ replaces the package files that other packages also have by links to the same
+        content, if the deduplication is enabled
+        :return: the number of bytes saved
+        """
+        if self._objects is None:
+            return 0
+        return self._objects.deduplicate(layout.package())
+
+    def clean_objects(self):
+        """ removes the deduplicated contents that no package uses anymore """
+        if self._objects is None:
+            return 0
+        folders = [PackageLayout(d["pref"], self._full_path(d["path"])).package()
+                   for d in self._db.lru_packages()]
+        return self._objects.clean(folders)
+
+    def list_references(self, name=None, name_prefix=False):
+        return self._db.list_references(name, name_prefix)
 
     def exists_rrev(self, ref):
         return self._db.exists_rrev(ref)
@@ -150,6 +319,18 @@ class DataCache:
     def get_latest_package_reference(self, pref):
         return self._db.get_latest_package_reference(pref)
 
+    def get_latest_recipe_references(self, refs):
+        return self._db.get_latest_recipe_references(refs)
+
+    def get_latest_package_references(self, prefs):
+        return self._db.get_latest_package_references(prefs)
+
+    def recipes_state(self):
+        return self._db.recipes_state()
+
+    def packages_state(self):
+        return self._db.packages_state()
+
     def get_recipe_revisions_references(self, ref: RecipeReference, only_latest_rrev=False):
         return self._db.get_recipe_revisions_references(ref, only_latest_rrev)
 
@@ -191,11 +372,14 @@ class DataCache:
         build_id = layout.build_id
         pref.timestamp = revision_timestamp_now()
         # Wait until it finish to really update the DB
-        try:
-            self._db.create_package(new_path, pref, build_id)
-        except ConanReferenceAlreadyExistsInDB:
-            # This was exported before, making it latest again, update timestamp
-            self._db.update_package_timestamp(pref)
+        with self._db.transaction():
+            try:
+                self._db.create_package(new_path, pref, build_id)
+            except ConanReferenceAlreadyExistsInDB:
+                # This was exported before, making it latest again, update timestamp
+                self._db.update_package_timestamp(pref)
+                self._db.update_packages_lru([pref], pref.timestamp)
+        self.deduplicate(layout)
 
         return new_path
 
@@ -225,9 +409,30 @@ class DataCache:
         layout._base_folder = os.path.join(self.base_folder, new_path_relative)
 
         # Wait until it finish to really update the DB
-        try:
-            self._db.create_recipe(new_path_relative, ref)
-        except ConanReferenceAlreadyExistsInDB:
-            # This was exported before, making it latest again, update timestamp
-            ref = layout.reference
-            self._db.update_recipe_timestamp(ref)
+        with self._db.transaction():
+            try:
+                self._db.create_recipe(new_path_relative, ref)
+            except ConanReferenceAlreadyExistsInDB:
+                # This was exported before, making it latest again, update timestamp
+                ref = layout.reference
+                self._db.update_recipe_timestamp(ref)
+                self._db.update_recipes_lru([ref], ref.timestamp)
+
+
+def _in_use(item, in_use_items):
+    """ the package revisions of the recipe revisions in use are in use too """
+    pref = item.get("pref")
+    if pref is not None:
+        return pref.repr_notime() in in_use_items or pref.ref.repr_notime() in in_use_items
+    return item["ref"].repr_notime() in in_use_items
+
+
+def _folder_size(folder):
+    size = 0
+    for root, _, files in os.walk(folder):
+        for f in files:
+            try:
+                size += os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return size
@@ -14,6 +14,8 @@ EXPORT_FOLDER = "e"
 EXPORT_SRC_FOLDER = "es"
 DOWNLOAD_EXPORT_FOLDER = "d"
 METADATA = "metadata"
+# The hashes of the files of the export and package folders, to check them faster
+HASHES_FILE = "hashes.json"
 
 
 class LayoutBase:
@@ -65,12 +67,14 @@ class RecipeLayout(LayoutBase):
     def conandata(self):
         return os.path.join(self.export(), DATA_YML)
 
-    def recipe_manifests(self):
+    def recipe_manifests(self, hash_cache=False):
         # Used for comparison and integrity check
         export_folder = self.export()
         readed_manifest = FileTreeManifest.load(export_folder)
         exports_source_folder = self.export_sources()
-        expected_manifest = FileTreeManifest.create(export_folder, exports_source_folder)
+        hashes_file = os.path.join(self.base_folder, HASHES_FILE) if hash_cache else None
+        expected_manifest = FileTreeManifest.create(export_folder, exports_source_folder,
+                                                    hashes_file=hashes_file)
         return readed_manifest, expected_manifest
 
     def sources_remove(self):
@@ -118,10 +122,11 @@ class PackageLayout(LayoutBase):
     def metadata(self):
         return os.path.join(self.download_package(), "metadata")
 
-    def package_manifests(self):
+    def package_manifests(self, hash_cache=False):
         package_folder = self.package()
         readed_manifest = FileTreeManifest.load(package_folder)
-        expected_manifest = FileTreeManifest.create(package_folder)
+        hashes_file = os.path.join(self.base_folder, HASHES_FILE) if hash_cache else None
+        expected_manifest = FileTreeManifest.create(package_folder, hashes_file=hashes_file)
         return readed_manifest, expected_manifest
 
     @contextmanager
@@ -1,16 +1,24 @@
+from conan.internal.cache.db.connection import DbConnectionManager
 from conan.internal.cache.db.packages_table import PackagesDBTable
 from conan.internal.cache.db.recipes_table import RecipesDBTable
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 
-CONNECTION_TIMEOUT_SECONDS = 1  # Time a connection will wait when the database is locked
-
 
 class CacheDatabase:
 
     def __init__(self, filename):
-        self._recipes = RecipesDBTable(filename)
-        self._packages = PackagesDBTable(filename)
+        # Both tables share the same connections, so they can be part of the same transaction
+        self._connection_manager = DbConnectionManager(filename)
+        self._recipes = RecipesDBTable(self._connection_manager)
+        self._packages = PackagesDBTable(self._connection_manager)
+
+    def transaction(self):
+        """ context manager to batch several writes in one single DB transaction """
+        return self._connection_manager.transaction()
+
+    def close(self):
+        self._connection_manager.close()
 
     def exists_rrev(self, ref):
         # TODO: This logic could be done directly against DB
@@ -40,16 +48,57 @@ class CacheDatabase:
         prevs = self.get_package_revisions_references(ref, True)
         return prevs[0] if prevs else None
 
+    def get_latest_recipe_references(self, refs):
+        """ bulk get_latest_recipe_reference() in one query: {ref: latest_ref or None} """
+        assert all(ref.revision is None for ref in refs)
+        found = self._recipes.get_latest_recipe_references(refs)
+        result = {}
+        for ref in refs:
+            ref_data = found.get(str(ref))
+            result[ref] = ref_data["ref"] if ref_data else None
+        return result
+
+    def recipes_state(self):
+        return self._recipes.state()
+
+    def packages_state(self):
+        return self._packages.state()
+
+    def get_latest_package_references(self, prefs):
+        """ bulk get_latest_package_reference() in one query: {pref: latest_pref or None} """
+        assert all(pref.revision is None for pref in prefs)
+        found = self._packages.get_latest_package_references(prefs)
+        result = {}
+        for pref in prefs:
+            pref_data = found.get((str(pref.ref), pref.ref.revision, pref.package_id))
+            result[pref] = pref_data["pref"] if pref_data else None
+        return result
+
     def update_recipe_timestamp(self, ref):
         self._recipes.update_timestamp(ref)
 
     def update_package_timestamp(self, pref: PkgReference):
         self._packages.update_timestamp(pref)
 
+    def update_recipes_lru(self, refs, lru, resolution=0):
+        self._recipes.update_lru(refs, lru, resolution)
+
+    def update_packages_lru(self, prefs, lru, resolution=0):
+        self._packages.update_lru(prefs, lru, resolution)
+
+    def lru_recipes(self):
+        """ [{"ref", "path", "lru"}] of all recipe revisions, least recently used first """
+        return self._recipes.lru_references()
+
+    def lru_packages(self):
+        """ [{"pref", "path", "lru"}] of all package revisions, least recently used first """
+        return self._packages.lru_references()
+
     def remove_recipe(self, ref: RecipeReference):
         # Removing the recipe must remove all the package binaries too from DB
-        self._recipes.remove(ref)
-        self._packages.remove_recipe(ref)
+        with self.transaction():
+            self._recipes.remove(ref)
+            self._packages.remove_recipe(ref)
 
     def remove_package(self, ref: PkgReference):
         # Removing the recipe must remove all the package binaries too from DB
@@ -79,9 +128,9 @@ class CacheDatabase:
     def create_package(self, path, ref: PkgReference, build_id):
         self._packages.create(path, ref, build_id=build_id)
 
-    def list_references(self):
+    def list_references(self, name=None, name_prefix=False):
         return [d["ref"]
-                for d in self._recipes.all_references()]
+                for d in self._recipes.all_references(name, name_prefix)]
 
     def get_package_revisions_references(self, pref: PkgReference, only_latest_prev=False):
         return [d["pref"]
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from conans.errors import ConanException
+
+CONNECTION_TIMEOUT_SECONDS = 1  # Time a connection will wait when the database is locked
+
+
+class DbConnectionManager:
+    """ Owns the sqlite3 connections to the cache database file, shared by all the tables.
+
+    One connection is kept open per thread (and re-created in forked processes), instead of
+    opening a new one for every query. Connections work in autocommit mode, unless inside an
+    explicit ``transaction()``, that batches all its statements in one single write transaction.
+
+    Lock contention: the database uses WAL journaling, so readers never block, and are not
+    blocked by, the writer. Writers are serialized, a writer waits up to ``timeout`` seconds for
+    another process (e.g. other CI job sharing the same cache) to release the write lock, and
+    then a ConanException is raised.
+    """
+
+    def __init__(self, filename, timeout=CONNECTION_TIMEOUT_SECONDS):
+        self.filename = filename
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.filename, isolation_level=None, timeout=self._timeout,
+                               check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+        except sqlite3.OperationalError:
+            pass  # Locked right now or WAL not supported (network drives), keep the default
+        return conn
+
+    def _get_connection(self):
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, "pid", None) != pid:
+            # A connection must never be used across a fork, the child opens its own one
+            local.connection = self._connect()
+            local.pid = pid
+        return local.connection
+
+    @contextmanager
+    def _translate_locked(self):
+        try:
+            yield
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e) or "busy" in str(e):
+                raise ConanException(f"The cache database '{self.filename}' is locked by another "
+                                     f"process, waited {self._timeout} seconds: {e}")
+            raise
+
+    @contextmanager
+    def connection(self):
+        """ The connection of the current thread. Inside a ``transaction()``, statements become
+        part of it, otherwise every statement is committed immediately """
+        conn = self._get_connection()
+        with self._translate_locked():
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        """ Runs all the statements inside the block in a single write transaction, that is
+        committed at the end, or rolled back if an exception is raised. Nested transactions are
+        joined to the outermost one.
+        """
+        conn = self._get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        with self._translate_locked():
+            # IMMEDIATE takes the write lock now, so it will not fail later with a deadlock
+            conn.execute("BEGIN IMMEDIATE;")
+        try:
+            yield conn
+            with self._translate_locked():
+                conn.execute("COMMIT;")
+        finally:
+            if conn.in_transaction:  # exception raised, either by the block or by the commit
+                conn.execute("ROLLBACK;")
+
+    def close(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local = threading.local()
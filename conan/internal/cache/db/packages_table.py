@@ -1,9 +1,10 @@
 import sqlite3
 
-from conan.internal.cache.db.table import BaseDbTable
+from conan.internal.cache.db.table import BaseDbTable, MAX_QUERY_PARAMETERS
 from conans.errors import ConanReferenceDoesNotExistInDB, ConanReferenceAlreadyExistsInDB
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
+from conans.util.dates import revision_timestamp_now
 
 
 class PackagesDBTable(BaseDbTable):
@@ -14,8 +15,11 @@ class PackagesDBTable(BaseDbTable):
                            ('prev', str, True),
                            ('path', str, False, None, True),
                            ('timestamp', float),
-                           ('build_id', str, True)]
+                           ('build_id', str, True),
+                           # Last time it was used, to remove the least recently used ones
+                           ('lru', float, True)]
     unique_together = ('reference', 'rrev', 'pkgid', 'prev')
+    indexes = [('reference', 'rrev', 'pkgid', 'timestamp')]
 
     @staticmethod
     def _as_dict(row):
@@ -28,6 +32,11 @@ class PackagesDBTable(BaseDbTable):
             "path": row.path,
         }
 
+    def migrate_columns(self, conn, columns):
+        if self.columns.lru in columns:
+            conn.execute(f'UPDATE {self.table_name} SET {self.columns.lru} = '
+                         f'{self.columns.timestamp}')
+
     def _where_clause(self, pref: PkgReference):
         where_dict = {
             self.columns.reference: str(pref.ref),
@@ -36,35 +45,23 @@ class PackagesDBTable(BaseDbTable):
             self.columns.prev: pref.revision,
         }
         where_expr = ' AND '.join(
-            [f'{k}="{v}" ' if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
-        return where_expr
-
-    def _set_clause(self, pref: PkgReference, path=None, build_id=None):
-        set_dict = {
-            self.columns.reference: str(pref.ref),
-            self.columns.rrev: pref.ref.revision,
-            self.columns.pkgid: pref.package_id,
-            self.columns.prev: pref.revision,
-            self.columns.path: path,
-            self.columns.timestamp: pref.timestamp,
-            self.columns.build_id: build_id,
-        }
-        set_expr = ', '.join([f'{k} = "{v}"' for k, v in set_dict.items() if v is not None])
-        return set_expr
+            [f'{k}=?' if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
+        params = [v for v in where_dict.values() if v is not None]
+        return where_expr, params
 
     def get(self, pref: PkgReference):
         """ Returns the row matching the reference or fails """
-        where_clause = self._where_clause(pref)
+        where_clause, params = self._where_clause(pref)
         query = f'SELECT * FROM {self.table_name} ' \
                 f'WHERE {where_clause};'
 
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, params)
             row = r.fetchone()
 
         if not row:
             raise ConanReferenceDoesNotExistInDB(f"No entry for package '{repr(pref)}'")
-        return self._as_dict(self.row_type(*row))
+        return self._as_dict(self.row(row))
 
     def create(self, path, pref: PkgReference, build_id):
         assert pref.revision
@@ -75,46 +72,86 @@ class PackagesDBTable(BaseDbTable):
         placeholders = ', '.join(['?' for _ in range(len(self.columns))])
         with self.db_connection() as conn:
             try:
-                conn.execute(f'INSERT INTO {self.table_name} '
-                                   f'VALUES ({placeholders})',
-                                   [str(pref.ref), pref.ref.revision, pref.package_id, pref.revision,
-                                    path, pref.timestamp, build_id])
+                conn.execute(f'INSERT INTO {self.table_name} ({", ".join(self.columns)}) '
+                             f'VALUES ({placeholders})',
+                             [str(pref.ref), pref.ref.revision, pref.package_id, pref.revision,
+                              path, pref.timestamp, build_id, revision_timestamp_now()])
             except sqlite3.IntegrityError:
                 raise ConanReferenceAlreadyExistsInDB(f"Reference '{repr(pref)}' already exists")
 
     def update_timestamp(self, pref: PkgReference):
         assert pref.revision
         assert pref.timestamp
-        where_clause = self._where_clause(pref)
-        set_clause = self._set_clause(pref)
+        where_clause, params = self._where_clause(pref)
         query = f"UPDATE {self.table_name} " \
-                f"SET {set_clause} " \
+                f"SET {self.columns.timestamp} = ? " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
             try:
-                conn.execute(query)
+                conn.execute(query, [pref.timestamp] + params)
             except sqlite3.IntegrityError:
                 raise ConanReferenceAlreadyExistsInDB(f"Reference '{repr(pref)}' already exists")
 
+    def update_lru(self, prefs, lru, resolution):
+        """ sets the last usage time of many package revisions in one query, it is only written
+        if the stored one is older than ``resolution`` seconds, to avoid writes in every command
+        """
+        query = f'UPDATE {self.table_name} SET {self.columns.lru} = ? ' \
+                f'WHERE {self.columns.reference} = ? AND {self.columns.rrev} = ? ' \
+                f'AND {self.columns.pkgid} = ? AND {self.columns.prev} = ? ' \
+                f'AND ({self.columns.lru} IS NULL OR {self.columns.lru} < ?)'
+        with self.db_connection() as conn:
+            conn.executemany(query, [(lru, str(pref.ref), pref.ref.revision, pref.package_id,
+                                      pref.revision, lru - resolution) for pref in prefs])
+
+    def state(self):
+        """ summary of the stored package revisions, that changes whenever any of them is added,
+        removed or has its timestamp updated
+        """
+        query = f'SELECT COUNT(*), MAX({self.columns.timestamp}), ' \
+                f'TOTAL({self.columns.timestamp}) FROM {self.table_name}'
+        with self.db_connection() as conn:
+            r = conn.execute(query)
+            return tuple(r.fetchone())
+
+    def lru_references(self):
+        """ all the package revisions, with their path and last usage, least recently used first
+        """
+        query = f'SELECT * FROM {self.table_name} ' \
+                f'WHERE {self.columns.prev} IS NOT NULL ' \
+                f'ORDER BY {self.columns.lru}'
+        with self.db_connection() as conn:
+            r = conn.execute(query)
+            result = []
+            for row in r.fetchall():
+                row = self.row(row)
+                d = self._as_dict(row)
+                d["lru"] = row.lru
+                result.append(d)
+        return result
+
     def remove_recipe(self, ref: RecipeReference):
         # can't use the _where_clause, because that is an exact match on the package_id, etc
         query = f"DELETE FROM {self.table_name} " \
-                f'WHERE {self.columns.reference} = "{str(ref)}" ' \
-                f'AND {self.columns.rrev} = "{ref.revision}" '
+                f'WHERE {self.columns.reference} = ? ' \
+                f'AND {self.columns.rrev} = ? '
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, [str(ref), ref.revision])
 
     def remove(self, pref: PkgReference):
-        where_clause = self._where_clause(pref)
+        where_clause, params = self._where_clause(pref)
         query = f"DELETE FROM {self.table_name} " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, params)
 
     def get_package_revisions_references(self, pref: PkgReference, only_latest_prev=False):
         assert pref.ref.revision, "To search package revisions you must provide a recipe revision."
         assert pref.package_id, "To search package revisions you must provide a package id."
-        check_prev = f'AND {self.columns.prev} = "{pref.revision}" ' if pref.revision else ''
+        check_prev = f'AND {self.columns.prev} = ? ' if pref.revision else ''
+        params = [pref.ref.revision, str(pref.ref), pref.package_id]
+        if pref.revision:
+            params.append(pref.revision)
         if only_latest_prev:
             query = f'SELECT {self.columns.reference}, ' \
                     f'{self.columns.rrev}, ' \
@@ -124,24 +161,24 @@ class PackagesDBTable(BaseDbTable):
                     f'MAX({self.columns.timestamp}), ' \
                     f'{self.columns.build_id} ' \
                     f'FROM {self.table_name} ' \
-                    f'WHERE {self.columns.rrev} = "{pref.ref.revision}" ' \
-                    f'AND {self.columns.reference} = "{str(pref.ref)}" ' \
-                    f'AND {self.columns.pkgid} = "{pref.package_id}" ' \
+                    f'WHERE {self.columns.rrev} = ? ' \
+                    f'AND {self.columns.reference} = ? ' \
+                    f'AND {self.columns.pkgid} = ? ' \
                     f'{check_prev} ' \
                     f'AND {self.columns.prev} IS NOT NULL ' \
                     f'GROUP BY {self.columns.pkgid} '
         else:
             query = f'SELECT * FROM {self.table_name} ' \
-                    f'WHERE {self.columns.rrev} = "{pref.ref.revision}" ' \
-                    f'AND {self.columns.reference} = "{str(pref.ref)}" ' \
-                    f'AND {self.columns.pkgid} = "{pref.package_id}" ' \
+                    f'WHERE {self.columns.rrev} = ? ' \
+                    f'AND {self.columns.reference} = ? ' \
+                    f'AND {self.columns.pkgid} = ? ' \
                     f'{check_prev} ' \
                     f'AND {self.columns.prev} IS NOT NULL ' \
                     f'ORDER BY {self.columns.timestamp} DESC'
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, params)
             for row in r.fetchall():
-                yield self._as_dict(self.row_type(*row))
+                yield self._as_dict(self.row(row))
 
     def get_package_references(self, ref: RecipeReference, only_latest_prev=True):
         # Return the latest revisions
@@ -156,16 +193,48 @@ class PackagesDBTable(BaseDbTable):
                     f'MAX({self.columns.timestamp}), ' \
                     f'{self.columns.build_id} ' \
                     f'FROM {self.table_name} ' \
-                    f'WHERE {self.columns.rrev} = "{ref.revision}" ' \
-                    f'AND {self.columns.reference} = "{str(ref)}" ' \
+                    f'WHERE {self.columns.rrev} = ? ' \
+                    f'AND {self.columns.reference} = ? ' \
                     f'GROUP BY {self.columns.pkgid} '
         else:
             query = f'SELECT * FROM {self.table_name} ' \
-                    f'WHERE {self.columns.rrev} = "{ref.revision}" ' \
-                    f'AND {self.columns.reference} = "{str(ref)}" ' \
+                    f'WHERE {self.columns.rrev} = ? ' \
+                    f'AND {self.columns.reference} = ? ' \
                     f'AND {self.columns.prev} IS NOT NULL ' \
                     f'ORDER BY {self.columns.timestamp} DESC'
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, [ref.revision, str(ref)])
             for row in r.fetchall():
-                yield self._as_dict(self.row_type(*row))
+                yield self._as_dict(self.row(row))
+
+    def get_latest_package_references(self, prefs):
+        """ bulk version of get_package_revisions_references(pref, only_latest_prev=True) for many
+        package references without revision, returning {(str(ref), rrev, package_id):
+        latest_pref_dict} for the found ones
+        """
+        result = {}
+        with self.db_connection() as conn:
+            for chunk in self.chunks(prefs, MAX_QUERY_PARAMETERS // 3):
+                condition = f'({self.columns.reference} = ? AND {self.columns.rrev} = ? ' \
+                            f'AND {self.columns.pkgid} = ?)'
+                conditions = ' OR '.join([condition for _ in range(len(chunk))])
+                query = f'SELECT {self.columns.reference}, ' \
+                        f'{self.columns.rrev}, ' \
+                        f'{self.columns.pkgid}, ' \
+                        f'{self.columns.prev}, ' \
+                        f'{self.columns.path}, ' \
+                        f'MAX({self.columns.timestamp}), ' \
+                        f'{self.columns.build_id} ' \
+                        f'FROM {self.table_name} ' \
+                        f'WHERE ({conditions}) ' \
+                        f'AND {self.columns.prev} IS NOT NULL ' \
+                        f'GROUP BY {self.columns.reference}, {self.columns.rrev}, ' \
+                        f'{self.columns.pkgid} '
+                params = []
+                for pref in chunk:
+                    params.extend([str(pref.ref), pref.ref.revision, pref.package_id])
+                r = conn.execute(query, params)
+                for row in r.fetchall():
+                    row = self.row(row)
+                    result[(row.reference, row.rrev, row.pkgid)] = self._as_dict(row)
+        return result
@@ -3,6 +3,7 @@ import sqlite3
 from conan.internal.cache.db.table import BaseDbTable
 from conans.errors import ConanReferenceDoesNotExistInDB, ConanReferenceAlreadyExistsInDB
 from conans.model.recipe_ref import RecipeReference
+from conans.util.dates import revision_timestamp_now
 
 
 class RecipesDBTable(BaseDbTable):
@@ -10,8 +11,16 @@ class RecipesDBTable(BaseDbTable):
     columns_description = [('reference', str),
                            ('rrev', str),
                            ('path', str, False, None, True),
-                           ('timestamp', float)]
+                           ('timestamp', float),
+                           # The reference fields, to search without parsing every reference
+                           ('name', str, True),
+                           ('version', str, True),
+                           ('user', str, True),
+                           ('channel', str, True),
+                           # Last time it was used, to remove the least recently used ones
+                           ('lru', float, True)]
     unique_together = ('reference', 'rrev')
+    indexes = [('reference', 'timestamp'), ('name COLLATE NOCASE', )]
 
     @staticmethod
     def _as_dict(row):
@@ -23,6 +32,24 @@ class RecipesDBTable(BaseDbTable):
             "path": row.path,
         }
 
+    def migrate_columns(self, conn, columns):
+        if self.columns.lru in columns:
+            conn.execute(f'UPDATE {self.table_name} SET {self.columns.lru} = '
+                         f'{self.columns.timestamp}')
+        if self.columns.name not in columns:
+            return
+        # The name, version, user and channel were added later, fill them for existing recipes
+        r = conn.execute(f'SELECT DISTINCT {self.columns.reference} FROM {self.table_name} '
+                         f'WHERE {self.columns.name} IS NULL')
+        values = []
+        for (reference, ) in r.fetchall():
+            ref = RecipeReference.loads(reference)
+            values.append([ref.name, str(ref.version), ref.user, ref.channel, reference])
+        conn.executemany(f'UPDATE {self.table_name} '
+                         f'SET {self.columns.name} = ?, {self.columns.version} = ?, '
+                         f'{self.columns.user} = ?, {self.columns.channel} = ? '
+                         f'WHERE {self.columns.reference} = ?', values)
+
     def _where_clause(self, ref):
         assert isinstance(ref, RecipeReference)
         where_dict = {
@@ -30,32 +57,23 @@ class RecipesDBTable(BaseDbTable):
             self.columns.rrev: ref.revision,
         }
         where_expr = ' AND '.join(
-            [f'{k}="{v}" ' if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
-        return where_expr
-
-    def _set_clause(self, ref: RecipeReference, path=None):
-        set_dict = {
-            self.columns.reference: str(ref),
-            self.columns.rrev: ref.revision,
-            self.columns.path: path,
-            self.columns.timestamp: ref.timestamp,
-        }
-        set_expr = ', '.join([f'{k} = "{v}"' for k, v in set_dict.items() if v is not None])
-        return set_expr
+            [f'{k}=?' if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
+        params = [v for v in where_dict.values() if v is not None]
+        return where_expr, params
 
     def get(self, ref: RecipeReference):
         """ Returns the row matching the reference or fails """
-        where_clause = self._where_clause(ref)
+        where_clause, params = self._where_clause(ref)
         query = f'SELECT * FROM {self.table_name} ' \
                 f'WHERE {where_clause};'
 
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, params)
             row = r.fetchone()
 
         if not row:
             raise ConanReferenceDoesNotExistInDB(f"No entry for recipe '{repr(ref)}'")
-        return self._as_dict(self.row_type(*row))
+        return self._as_dict(self.row(row))
 
     def create(self, path, ref: RecipeReference):
         assert ref is not None
@@ -63,63 +81,138 @@ class RecipesDBTable(BaseDbTable):
         placeholders = ', '.join(['?' for _ in range(len(self.columns))])
         with self.db_connection() as conn:
             try:
-                conn.execute(f'INSERT INTO {self.table_name} '
-                                 f'VALUES ({placeholders})',
-                                 [str(ref), ref.revision, path, ref.timestamp])
-            except sqlite3.IntegrityError as e:
+                conn.execute(f'INSERT INTO {self.table_name} ({", ".join(self.columns)}) '
+                             f'VALUES ({placeholders})',
+                             [str(ref), ref.revision, path, ref.timestamp,
+                              ref.name, str(ref.version), ref.user, ref.channel,
+                              revision_timestamp_now()])
+            except sqlite3.IntegrityError:
                 raise ConanReferenceAlreadyExistsInDB(f"Reference '{repr(ref)}' already exists")
 
     def update_timestamp(self, ref: RecipeReference):
         assert ref.revision is not None
         assert ref.timestamp is not None
-        where_clause = self._where_clause(ref)
+        where_clause, params = self._where_clause(ref)
         query = f"UPDATE {self.table_name} " \
-                f'SET {self.columns.timestamp} = "{ref.timestamp}" ' \
+                f'SET {self.columns.timestamp} = ? ' \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, [ref.timestamp] + params)
+
+    def update_lru(self, refs, lru, resolution):
+        """ sets the last usage time of many recipe revisions in one query, it is only written
+        if the stored one is older than ``resolution`` seconds, to avoid writes in every command
+        """
+        query = f'UPDATE {self.table_name} SET {self.columns.lru} = ? ' \
+                f'WHERE {self.columns.reference} = ? AND {self.columns.rrev} = ? ' \
+                f'AND ({self.columns.lru} IS NULL OR {self.columns.lru} < ?)'
+        with self.db_connection() as conn:
+            conn.executemany(query, [(lru, str(ref), ref.revision, lru - resolution)
+                                     for ref in refs])
+
+    def lru_references(self):
+        """ all the recipe revisions, with their path and last usage, least recently used first
+        """
+        query = f'SELECT * FROM {self.table_name} ' \
+                f'ORDER BY {self.columns.lru}'
+        with self.db_connection() as conn:
+            r = conn.execute(query)
+            result = []
+            for row in r.fetchall():
+                row = self.row(row)
+                d = self._as_dict(row)
+                d["lru"] = row.lru
+                result.append(d)
+        return result
 
     def remove(self, ref: RecipeReference):
-        where_clause = self._where_clause(ref)
+        where_clause, params = self._where_clause(ref)
         query = f"DELETE FROM {self.table_name} " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, params)
 
     # returns all different conan references (name/version@user/channel)
-    def all_references(self):
+    def all_references(self, name=None, name_prefix=False):
+        """
+        :param name: Only the references with this name (case insensitive), using the index
+        :param name_prefix: ``name`` is just the prefix of the matching names
+        """
+        params = []
+        where = ''
+        if name is not None:
+            if name_prefix:
+                escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                where = f"WHERE {self.columns.name} LIKE ? ESCAPE '\\' "
+                params.append(escaped + "%")
+            else:
+                where = f'WHERE {self.columns.name} = ? COLLATE NOCASE '
+                params.append(name)
         query = f'SELECT DISTINCT {self.columns.reference}, ' \
-                    f'{self.columns.rrev}, ' \
-                    f'{self.columns.path} ,' \
-                    f'{self.columns.timestamp} ' \
-                    f'FROM {self.table_name} ' \
-                    f'ORDER BY {self.columns.timestamp} DESC'
+                f'{self.columns.rrev}, ' \
+                f'{self.columns.path} ,' \
+                f'{self.columns.timestamp} ' \
+                f'FROM {self.table_name} ' \
+                f'{where}' \
+                f'ORDER BY {self.columns.timestamp} DESC'
         with self.db_connection() as conn:
-            r = conn.execute(query)
-            result = [self._as_dict(self.row_type(*row)) for row in r.fetchall()]
+            r = conn.execute(query, params)
+            result = [self._as_dict(self.row(row)) for row in r.fetchall()]
         return result
 
+    def state(self):
+        """ summary of the stored recipe revisions, that changes whenever any of them is added,
+        removed or has its timestamp updated
+        """
+        query = f'SELECT COUNT(*), MAX({self.columns.timestamp}), ' \
+                f'TOTAL({self.columns.timestamp}) FROM {self.table_name}'
+        with self.db_connection() as conn:
+            r = conn.execute(query)
+            return tuple(r.fetchone())
+
     def get_recipe_revisions_references(self, ref: RecipeReference, only_latest_rrev=False):
         # FIXME: This is very fragile, we should disambiguate the function and check that revision
         #        is always None if we want to check the revisions. Do another function to get the
         #        time or check existence if needed
-        check_rrev = f'AND {self.columns.rrev} = "{ref.revision}" ' if ref.revision else ''
+        check_rrev = f'AND {self.columns.rrev} = ? ' if ref.revision else ''
+        params = [str(ref), ref.revision] if ref.revision else [str(ref)]
         if only_latest_rrev:
             query = f'SELECT {self.columns.reference}, ' \
                     f'{self.columns.rrev}, ' \
                     f'{self.columns.path}, ' \
                     f'MAX({self.columns.timestamp}) ' \
                     f'FROM {self.table_name} ' \
-                    f'WHERE {self.columns.reference}="{str(ref)}" ' \
+                    f'WHERE {self.columns.reference} = ? ' \
                     f'{check_rrev} '\
                     f'GROUP BY {self.columns.reference} '  # OTHERWISE IT FAILS THE MAX()
         else:
             query = f'SELECT * FROM {self.table_name} ' \
-                    f'WHERE {self.columns.reference} = "{str(ref)}" ' \
+                    f'WHERE {self.columns.reference} = ? ' \
                     f'{check_rrev} ' \
                     f'ORDER BY {self.columns.timestamp} DESC'
 
         with self.db_connection() as conn:
-            r = conn.execute(query)
-            ret = [self._as_dict(self.row_type(*row)) for row in r.fetchall()]
+            r = conn.execute(query, params)
+            ret = [self._as_dict(self.row(row)) for row in r.fetchall()]
         return ret
+
+    def get_latest_recipe_references(self, refs):
+        """ bulk version of get_recipe_revisions_references(ref, only_latest_rrev=True) for many
+        references without revision, returning {str(ref): latest_ref_dict} for the found ones
+        """
+        result = {}
+        with self.db_connection() as conn:
+            for chunk in self.chunks(refs):
+                placeholders = ', '.join(['?' for _ in range(len(chunk))])
+                query = f'SELECT {self.columns.reference}, ' \
+                        f'{self.columns.rrev}, ' \
+                        f'{self.columns.path}, ' \
+                        f'MAX({self.columns.timestamp}) ' \
+                        f'FROM {self.table_name} ' \
+                        f'WHERE {self.columns.reference} IN ({placeholders}) ' \
+                        f'GROUP BY {self.columns.reference} '
+                r = conn.execute(query, [str(ref) for ref in chunk])
+                for row in r.fetchall():
+                    row = self.row(row)
+                    result[row.reference] = self._as_dict(row)
+        return result
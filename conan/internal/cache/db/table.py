@@ -1,8 +1,8 @@
-import sqlite3
 from collections import namedtuple
-from contextlib import contextmanager
 from typing import Tuple, List, Optional
 
+MAX_QUERY_PARAMETERS = 900
+
 
 class BaseDbTable:
     table_name: str = None
@@ -10,22 +10,21 @@ class BaseDbTable:
     row_type: namedtuple = None
     columns: namedtuple = None
     unique_together: tuple = None
+    indexes: List[tuple] = None
 
-    def __init__(self, filename):
-        self.filename = filename
+    def __init__(self, connection_manager):
+        self._connection_manager = connection_manager
         column_names: List[str] = [it[0] for it in self.columns_description]
         self.row_type = namedtuple('_', column_names)
         self.columns = self.row_type(*column_names)
         self.create_table()
 
-    @contextmanager
+    @property
+    def filename(self):
+        return self._connection_manager.filename
+
     def db_connection(self):
-        try:
-            connection = sqlite3.connect(self.filename, isolation_level=None,
-                                        timeout=1, check_same_thread=False)
-            yield connection
-        finally:
-            connection.close()
+        return self._connection_manager.connection()
 
     def create_table(self):
         def field(name, typename, nullable=False, check_constraints: Optional[List] = None,
@@ -57,6 +56,47 @@ class BaseDbTable:
         table_checks = f", UNIQUE({', '.join(self.unique_together)})" if self.unique_together else ''
         with self.db_connection() as conn:
             conn.execute(f"CREATE TABLE {guard} {self.table_name} ({fields} {table_checks});")
+        # Tables created by previous Conan versions might lack the latest (nullable) columns
+        if self._missing_columns():
+            with self._connection_manager.transaction() as conn:
+                added = self._missing_columns()  # Other process could have added them meanwhile
+                for it in added:
+                    conn.execute(f"ALTER TABLE {self.table_name} ADD COLUMN {field(*it)};")
+                if added:
+                    self.migrate_columns(conn, [it[0] for it in added])
+        with self.db_connection() as conn:
+            for index in self.indexes or []:
+                # index entries can define a collation too, like "name COLLATE NOCASE"
+                index_name = "_".join([self.table_name] + [c.split()[0] for c in index] + ["idx"])
+                conn.execute(f"CREATE INDEX {guard} {index_name} "
+                             f"ON {self.table_name} ({', '.join(index)});")
+
+    def _missing_columns(self):
+        with self.db_connection() as conn:
+            r = conn.execute(f"PRAGMA table_info({self.table_name});")
+            existing = [row[1] for row in r.fetchall()]
+        return [it for it in self.columns_description if it[0] not in existing]
+
+    def migrate_columns(self, conn, columns):
+        """ to be implemented by tables that need to fill the values of the new columns added
+        to an already existing table
+        """
+        pass
+
+    def row(self, values):
+        """ the row_type of the result of a query, which might select only the first columns of
+        the table, the rest of columns being None. The extra columns that a later Conan version
+        could have added to the table are ignored """
+        values = tuple(values)[:len(self.columns)]
+        return self.row_type(*values, *[None] * (len(self.columns) - len(values)))
+
+    @staticmethod
+    def chunks(items, size=MAX_QUERY_PARAMETERS):
+        """ split the items of a bulk query, so the number of parameters of each query doesn't
+        exceed the sqlite limit (SQLITE_MAX_VARIABLE_NUMBER=999 in old versions) """
+        items = list(items)
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
 
     def dump(self):
         print(f"********* BEGINTABLE {self.table_name}*************")
@@ -0,0 +1,148 @@
+import os
+import shutil
+import stat
+import uuid
+
+from conan.api.output import ConanOutput
+from conans.errors import ConanException
+from conans.model.manifest import FileTreeManifest
+from conans.util.copy_tree import reflink, UNSUPPORTED_ERRORS
+from conans.util.files import md5sum, mkdir
+
+OBJECTS_FOLDER = ".objects"
+DEDUPLICATE_MODES = ("hardlink", "reflink")
+_WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ObjectStore:
+    """ Content addressed storage of the files of the packages in the cache, so the identical
+    files of different packages (the headers of different package_ids, the unchanged files of
+    different package revisions...) use the disk space only once.
+
+    The objects are indexed by the md5 of the package conanmanifest.txt (checked when an object
+    is stored, and again before it is linked) and by the file permissions, and the package files
+    are replaced with hardlinks or reflinks (copy-on-write clones) of them. The hardlinked files
+    are shared, so they are made read-only, a modification in one package would modify the others.
+    """
+
+    def __init__(self, store_folder, mode):
+        if mode not in DEDUPLICATE_MODES:
+            raise ConanException(f"Unknown value '{mode}' for 'core.cache:deduplicate', "
+                                 f"use one of {', '.join(DEDUPLICATE_MODES)}")
+        self._folder = os.path.join(store_folder, OBJECTS_FOLDER)
+        self._mode = mode
+        self._unsupported = False
+
+    def _object_mode(self, file_stat):
+        mode = stat.S_IMODE(file_stat.st_mode)
+        return mode & ~_WRITE_BITS if self._mode == "hardlink" else mode
+
+    def _object_path(self, file_md5, mode):
+        name = "{}-{:o}".format(file_md5, mode)
+        return os.path.join(self._folder, file_md5[:2], name)
+
+    def _link(self, src, dst):
+        if self._mode == "hardlink":
+            os.link(src, dst)
+        else:
+            reflink(src, dst)
+
+    def deduplicate(self, folder):
+        """ replaces the files of the package ``folder`` by links to the stored objects, and
+        stores the ones that are not there yet.
+        :return: the number of bytes saved
+        """
+        if self._unsupported:
+            return 0
+        try:
+            manifest = FileTreeManifest.load(folder)
+        except (OSError, ValueError):
+            return 0
+        saved = 0
+        for name, file_md5 in manifest.file_sums.items():
+            path = os.path.join(folder, name)
+            try:
+                file_stat = os.lstat(path)
+                if not stat.S_ISREG(file_stat.st_mode) or not file_stat.st_size:
+                    continue
+                saved += self._deduplicate_file(path, file_stat, file_md5)
+            except OSError as e:
+                # Too many links, removed by other process... the file is just not deduplicated
+                if self._mode == "reflink" and e.errno in UNSUPPORTED_ERRORS:
+                    self._unsupported = True
+                    ConanOutput().warning("core.cache:deduplicate=reflink is not supported by "
+                                          "the cache filesystem, the package files are not "
+                                          "deduplicated")
+                    break
+        return saved
+
+    def _deduplicate_file(self, path, file_stat, file_md5):
+        mode = self._object_mode(file_stat)
+        obj = self._object_path(file_md5, mode)
+        try:
+            obj_stat = os.stat(obj)
+        except FileNotFoundError:
+            # The first occurrence is stored, if it really has the content of the manifest
+            if md5sum(path) == file_md5:
+                mkdir(os.path.dirname(obj))
+                tmp = "{}.{}.tmp".format(obj, uuid.uuid4().hex)
+                try:
+                    self._link(path, tmp)
+                    if mode != stat.S_IMODE(file_stat.st_mode):
+                        os.chmod(tmp, mode)  # The same file of the package, now shared
+                    os.replace(tmp, obj)
+                finally:
+                    _remove(tmp)
+            return 0
+        if (obj_stat.st_dev, obj_stat.st_ino) == (file_stat.st_dev, file_stat.st_ino):
+            return 0
+        if obj_stat.st_size != file_stat.st_size or md5sum(obj) != file_md5:
+            # Corrupted (or a hardlinked file modified in a package), the next one replaces it
+            _remove(obj)
+            return 0
+        tmp = "{}.{}.dedup".format(path, uuid.uuid4().hex)
+        try:
+            self._link(obj, tmp)
+            if self._mode == "reflink":
+                shutil.copystat(path, tmp)
+            os.replace(tmp, path)
+        finally:
+            _remove(tmp)
+        return file_stat.st_size
+
+    def clean(self, folders):
+        """ removes the objects not used by the packages in the given folders
+        :return: the number of removed objects
+        """
+        try:
+            objects = [os.path.join(self._folder, d, f) for d in os.listdir(self._folder)
+                       for f in os.listdir(os.path.join(self._folder, d))]
+        except OSError:
+            return 0
+        # Listed before reading the manifests, the new objects of running processes are kept
+        used = set()
+        for folder in folders:
+            try:
+                used.update(FileTreeManifest.load(folder).file_sums.values())
+            except (OSError, ValueError):
+                pass
+        removed = 0
+        for obj in objects:
+            file_md5 = os.path.basename(obj).split("-", 1)[0]
+            if file_md5 in used:
+                # A hardlink object not linked by any package is not used either
+                try:
+                    if self._mode == "reflink" or os.stat(obj).st_nlink > 1:
+                        continue
+                except OSError:
+                    continue
+            _remove(obj)
+            removed += 1
+        return removed
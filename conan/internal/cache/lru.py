@@ -0,0 +1,158 @@
+import atexit
+import json
+import os
+import platform
+import socket
+import threading
+import uuid
+
+from conans.util.dates import revision_timestamp_now
+from conans.util.files import load, save
+
+# The last usage time is only written if the stored one is older, so most commands don't write
+LRU_RESOLUTION = 60
+IN_USE_FOLDER = ".in_use"
+# The processes of other machines sharing the cache can't be checked, their marks expire
+IN_USE_EXPIRATION = 24 * 3600
+
+_registered = {}  # {(store, pid): (marker file, marker data)} of the current process
+_lock = threading.Lock()
+
+
+def _reset_lock():
+    # The lock could be held by another thread of the parent process when it forked
+    global _lock
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):  # Python >= 3.7
+    os.register_at_fork(after_in_child=_reset_lock)
+
+
+def _write_marker(marker, data):
+    # Written in a temporary file and moved, so other processes never read a partial marker
+    tmp = "{}.{}.tmp".format(marker, uuid.uuid4().hex)
+    try:
+        save(tmp, json.dumps(data))
+        os.replace(tmp, marker)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def register_user(store):
+    """ marks that the current process can use any recipe or package of the cache from now on,
+    so the ones it resolves or installs are not evicted by other process, even if their last
+    usage time, written when the process started to use them, becomes old for a long build
+    """
+    key = store, os.getpid()
+    if key in _registered:
+        return
+    with _lock:
+        if key in _registered:
+            return
+        marker = os.path.join(store, IN_USE_FOLDER, "{}-{}".format(os.getpid(), uuid.uuid4().hex))
+        data = {"host": socket.gethostname(), "pid": os.getpid(), "time": revision_timestamp_now(),
+                "items": []}
+        try:
+            _write_marker(marker, data)
+        except OSError:  # A read-only cache can't be evicted either
+            marker = None
+        if not _registered:
+            atexit.register(_unregister_all)
+        _registered[key] = marker, data
+
+
+def protect_items(store, items):
+    """ adds to the marker of the current process the recipe and package revisions it has
+    resolved, so they are not evicted while it runs, whatever their last usage time. The
+    packages of the protected recipe revisions are not evicted either
+    """
+    register_user(store)
+    with _lock:
+        marker, data = _registered[store, os.getpid()]
+        new_items = {item.repr_notime() for item in items}.difference(data["items"])
+        if marker is None or not new_items:
+            return
+        data["items"] = sorted(new_items.union(data["items"]))
+        try:
+            _write_marker(marker, data)
+        except OSError:
+            pass
+
+
+def _unregister_all():
+    for (_, pid), (marker, _) in _registered.items():
+        if marker is not None and pid == os.getpid():
+            try:
+                os.remove(marker)
+            except OSError:
+                pass
+
+
+def _process_alive(pid):
+    if platform.system() == "Windows":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # It exists, but belongs to other user
+        return True
+    return True
+
+
+def in_use(store):
+    """ the time since the other running processes are using the cache (or None), and the
+    recipe and package revisions they have resolved. The marks of the finished (or killed)
+    processes are removed
+    """
+    folder = os.path.join(store, IN_USE_FOLDER)
+    try:
+        markers = os.listdir(folder)
+    except OSError:
+        return None, set()
+    host = socket.gethostname()
+    now = revision_timestamp_now()
+    since = None
+    items = set()
+    for marker in markers:
+        path = os.path.join(folder, marker)
+        if path.endswith(".tmp"):
+            continue
+        try:
+            data = json.loads(load(path))
+            pid, started = data["pid"], data["time"]
+        except Exception:  # Broken
+            try:
+                started = os.path.getmtime(path)
+            except OSError:
+                continue
+            data, pid = {"host": None}, None
+        if data["host"] is None:
+            alive = now - started < LRU_RESOLUTION
+        elif data["host"] == host:
+            if pid == os.getpid():
+                continue
+            alive = _process_alive(pid)
+        else:
+            alive = now - started < IN_USE_EXPIRATION
+        if not alive:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        since = started if since is None else min(since, started)
+        items.update(data.get("items", []))
+    return since, items
@@ -1,7 +1,9 @@
 import os
 
 from conan.api.output import ConanOutput
-from conans.client.cache.cache import ClientCache
+from conans.client.cache.cache import ClientCache, EXTENSIONS_FOLDER, HOOKS_EXTENSION_FOLDER, \
+    PLUGINS_FOLDER
+from conans.client.cache.editable import EDITABLE_PACKAGES_FILE
 from conans.client.graph.proxy import ConanProxy
 from conans.client.graph.python_requires import PyRequireLoader
 from conans.client.graph.range_resolver import RangeResolver
@@ -10,6 +12,7 @@ from conans.client.loader import ConanFileLoader, load_python_file
 from conans.client.remote_manager import RemoteManager
 from conans.client.rest.auth_manager import ConanApiAuthManager
 from conans.client.rest.conan_requester import ConanRequester
+from conans.client.rest.metadata_cache import RemoteMetadataCache
 from conans.client.rest.rest_client import RestApiClientFactory
 
 
@@ -36,10 +39,40 @@ class ConanFileHelpers:
         self.cache = cache
 
 
-class ConanApp(object):
-    def __init__(self, cache_folder):
+def _loaded_files(cache_folder):
+    """ the files of the Conan home whose contents a ConanSession loads only once """
+    files = [os.path.join(cache_folder, "global.conf"),
+             os.path.join(cache_folder, EDITABLE_PACKAGES_FILE),
+             os.path.join(cache_folder, "source_credentials.json"),
+             os.path.join(cache_folder, EXTENSIONS_FOLDER, PLUGINS_FOLDER, "cmd_wrapper.py")]
+    hooks_folder = os.path.join(cache_folder, EXTENSIONS_FOLDER, HOOKS_EXTENSION_FOLDER)
+    for root, _, hooks in os.walk(hooks_folder):
+        files.extend(os.path.join(root, f) for f in hooks if f.endswith(".py"))
+    return files
+
 
+def _files_state(files):
+    state = []
+    for f in files:
+        try:
+            st = os.stat(f)
+            state.append((f, st.st_mtime_ns, st.st_size))
+        except OSError:
+            state.append((f, None, None))
+    return state
+
+
+class ConanSession(object):
+    """ The long lived part of the application, that can be shared by many ConanApp: the cache
+    with its rendered global.conf, the editables, the hooks, and the requester and remotes
+    connections, so the HTTP keep-alive connections, servers capabilities... are reused between
+    API calls. It is outdated when the files it loaded change, and it must be discarded
+    (ConanAPI.reinit()) when the API modifies the configuration.
+    """
+    def __init__(self, cache_folder):
         self.cache_folder = cache_folder
+        # Before loading them, so the modifications made meanwhile are not missed
+        self._files_state = _files_state(_loaded_files(cache_folder))
         self.cache = ClientCache(self.cache_folder)
 
         self.hook_manager = HookManager(self.cache.hooks_path)
@@ -47,17 +80,39 @@ class ConanApp(object):
         global_conf = self.cache.new_config
         ConanOutput.define_silence_warnings(global_conf.get("core:skip_warnings", check_type=list))
         self.requester = ConanRequester(global_conf, cache_folder)
+        # Persistent responses of the remotes queries
+        ttl = global_conf.get("core.net.http:metadata_cache_ttl", check_type=int)
+        self.metadata_cache = RemoteMetadataCache(cache_folder, ttl)
         # To handle remote connections
-        rest_client_factory = RestApiClientFactory(self.requester, global_conf)
+        rest_client_factory = RestApiClientFactory(self.requester, global_conf,
+                                                   self.metadata_cache)
         # Wraps RestApiClient to add authentication support (same interface)
         auth_manager = ConanApiAuthManager(rest_client_factory, self.cache)
         # Handle remote connections
         self.remote_manager = RemoteManager(self.cache, auth_manager)
+        self.cmd_wrapper = CmdWrapper(self.cache)
+
+    def outdated(self):
+        """ some of the files loaded by the session have been modified, added or removed """
+        return _files_state(_loaded_files(self.cache_folder)) != self._files_state
+
+
+class ConanApp(object):
+    def __init__(self, cache_folder, session=None):
+
+        self.cache_folder = cache_folder
+        session = session or ConanSession(cache_folder)
+        self.cache = session.cache
+        self.hook_manager = session.hook_manager
+        self.requester = session.requester
+        self.remote_manager = session.remote_manager
 
+        # The resolution caches are only valid for one operation, they don't see the changes in
+        # the recipes files, nor in the cache or the servers after the graph was resolved
         self.proxy = ConanProxy(self)
         self.range_resolver = RangeResolver(self)
 
         self.pyreq_loader = PyRequireLoader(self.proxy, self.range_resolver)
-        cmd_wrap = CmdWrapper(self.cache)
-        conanfile_helpers = ConanFileHelpers(self.requester, cmd_wrap, global_conf, self.cache)
+        conanfile_helpers = ConanFileHelpers(self.requester, session.cmd_wrapper,
+                                             self.cache.new_config, self.cache)
         self.loader = ConanFileLoader(self.pyreq_loader, conanfile_helpers)
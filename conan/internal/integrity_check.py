@@ -1,7 +1,13 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from conan.api.output import ConanOutput
+from conan.internal.cache.conan_reference_layout import RecipeLayout
 from conans.errors import ConanException
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
+from conans.util.files import save
 
 
 class IntegrityChecker:
@@ -17,40 +23,95 @@ class IntegrityChecker:
     """
     def __init__(self, app):
         self._app = app
+        config = app.cache.new_config
+        self._hash_cache = config.get("core.cache:hash_cache", check_type=bool)
+        self._parallel = config.get("core.cache:check_integrity_parallel", default=4,
+                                    check_type=int)
 
-    def check(self, upload_data):
-        corrupted = False
+    def check(self, upload_data, report=None, corrupted=None):
+        """
+        :param upload_data: the package list of recipes and packages to check
+        :param report: optional path of a json file to write the corrupted recipes and packages
+        :param corrupted: "remove" or "quarantine" the corrupted recipes and packages, or None
+        """
+        layouts = []
         for ref, recipe_bundle in upload_data.refs():
-            corrupted = self._recipe_corrupted(ref) or corrupted
+            layouts.append(self._app.cache.ref_layout(ref))
             for pref, prev_bundle in upload_data.prefs(ref, recipe_bundle):
-                corrupted = self._package_corrupted(pref) or corrupted
-        if corrupted:
-            raise ConanException("There are corrupted artifacts, check the error logs")
+                layouts.append(self._app.cache.pkg_layout(pref))
+        layouts = _io_order(layouts)
 
-    def _recipe_corrupted(self, ref: RecipeReference):
-        layout = self._app.cache.ref_layout(ref)
         output = ConanOutput()
-        read_manifest, expected_manifest = layout.recipe_manifests()
-
-        if read_manifest != expected_manifest:
-            output.error(f"{ref}: Manifest mismatch")
-            output.error(f"Folder: {layout.export()}")
-            diff = read_manifest.difference(expected_manifest)
-            for fname, (h1, h2) in diff.items():
-                output.error(f"    '{fname}' (manifest: {h1}, file: {h2})")
-            return True
-        output.info(f"{ref}: Integrity checked: ok")
-
-    def _package_corrupted(self, ref: PkgReference):
-        layout = self._app.cache.pkg_layout(ref)
+        refs = []  # The corrupted references
+        result = {}  # {reference: report of the corruption}
+        with ThreadPoolExecutor(max(1, self._parallel),
+                                thread_name_prefix="conan_integrity") as pool:
+            futures = [pool.submit(self._check, layout) for layout in layouts]
+            # Reported in submission order, so the output is always the same
+            for i, future in enumerate(futures, 1):
+                layout, folder, diff = future.result()
+                progress = f"({i} of {len(layouts)})"
+                ref = layout.reference
+                if not diff:
+                    output.info(f"{ref}: Integrity checked: ok {progress}")
+                    continue
+                output.error(f"{ref}: Manifest mismatch {progress}")
+                output.error(f"Folder: {folder}")
+                for fname, (h1, h2) in diff.items():
+                    output.error(f"    '{fname}' (manifest: {h1}, file: {h2})")
+                refs.append(ref)
+                result[ref.repr_notime()] = {"folder": folder,
+                                             "files": {fname: {"manifest": h1, "file": h2}
+                                                       for fname, (h1, h2) in diff.items()}}
+
+        if refs and corrupted is not None:
+            self._discard(refs, result, quarantine=corrupted == "quarantine")
+        if report is not None:
+            save(report, json.dumps({"checked": len(layouts), "corrupted": result}, indent=4))
+        if result:
+            raise ConanException("There are corrupted artifacts, check the error logs")
+
+    def _check(self, layout):
+        if isinstance(layout, RecipeLayout):
+            read_manifest, expected_manifest = layout.recipe_manifests(self._hash_cache)
+            folder = layout.export()
+        else:
+            read_manifest, expected_manifest = layout.package_manifests(self._hash_cache)
+            folder = layout.package()
+        diff = read_manifest.difference(expected_manifest) \
+            if read_manifest != expected_manifest else None
+        return layout, folder, diff
+
+    def _discard(self, corrupted, result, quarantine):
+        # The packages of a discarded recipe are discarded with it
+        refs = [r for r in corrupted if isinstance(r, RecipeReference)]
+        prefs = [r for r in corrupted if isinstance(r, PkgReference)]
+        discarded = self._app.cache.discard(refs, prefs, quarantine)
         output = ConanOutput()
-        read_manifest, expected_manifest = layout.package_manifests()
-
-        if read_manifest != expected_manifest:
-            output.error(f"{ref}: Manifest mismatch")
-            output.error(f"Folder: {layout.package()}")
-            diff = read_manifest.difference(expected_manifest)
-            for fname, (h1, h2) in diff.items():
-                output.error(f"    '{fname}' (manifest: {h1}, file: {h2})")
-            return True
-        output.info(f"{ref}: Integrity checked: ok")
+        for ref, destination in discarded:
+            entry = result.setdefault(ref.repr_notime(), {"folder": None, "files": {}})
+            if destination is None:
+                entry["action"] = "removed"
+                output.warning(f"{ref}: Removed corrupted artifact")
+            else:
+                entry["action"] = "quarantined"
+                entry["quarantine"] = destination
+                output.warning(f"{ref}: Moved corrupted artifact to {destination}")
+
+
+def _io_order(layouts):
+    """ the layouts sorted by their folders, so the reads of every disk are as sequential as
+    possible, alternating the different disks, so all of them are busy at the same time
+    """
+    devices = {}
+    for layout in sorted(layouts, key=lambda lay: lay.base_folder):
+        try:
+            device = os.stat(layout.base_folder).st_dev
+        except OSError:
+            device = None
+        devices.setdefault(device, []).append(layout)
+    queues = list(devices.values())
+    result = []
+    for i in range(max((len(q) for q in queues), default=0)):
+        result.extend(q[i] for q in queues if i < len(q))
+    return result
@@ -1,7 +1,10 @@
 import jinja2
-from jinja2 import Template
 
 from conans.errors import ConanException
+from conans.util.templates import TemplatesCache
+
+# The same templates are rendered for every dependency and configuration
+_templates = TemplatesCache(trim_blocks=True, lstrip_blocks=True, undefined=jinja2.StrictUndefined)
 
 
 class CMakeDepsFileTemplate(object):
@@ -44,8 +47,7 @@ class CMakeDepsFileTemplate(object):
             raise ConanException("error generating context for '{}': {}".format(self.conanfile, e))
         if context is None:
             return
-        return Template(self.template, trim_blocks=True, lstrip_blocks=True,
-                        undefined=jinja2.StrictUndefined).render(context)
+        return _templates.render(self.template, context)
 
     def context(self):
         raise NotImplementedError()
@@ -3,8 +3,6 @@ import re
 import textwrap
 from collections import OrderedDict
 
-from jinja2 import Template
-
 from conan.tools.apple.apple import get_apple_sdk_fullname
 from conan.tools.android.utils import android_abi
 from conan.tools.apple.apple import is_apple_os, to_apple_arch
@@ -17,6 +15,19 @@ from conan.tools.microsoft.visual import msvc_version_to_toolset_version
 from conans.client.subsystems import deduce_subsystem, WINDOWS
 from conans.errors import ConanException
 from conans.util.files import load
+from conans.util.templates import TemplatesCache
+
+
+def _cmake_value(value):
+    if isinstance(value, bool):
+        return "ON" if value else "OFF"
+    else:
+        return '"{}"'.format(value)
+
+
+# Shared by the blocks and the toolchain, so their templates are compiled once per process
+toolchain_templates = TemplatesCache(trim_blocks=True, lstrip_blocks=True)
+toolchain_templates.environment.filters["cmake_value"] = _cmake_value
 
 
 class Block(object):
@@ -39,16 +50,7 @@ class Block(object):
         context = self.values
         if context is None:
             return
-
-        def cmake_value(value):
-            if isinstance(value, bool):
-                return "ON" if value else "OFF"
-            else:
-                return '"{}"'.format(value)
-
-        template = Template(self.template, trim_blocks=True, lstrip_blocks=True)
-        template.environment.filters["cmake_value"] = cmake_value
-        return template.render(**context)
+        return toolchain_templates.render(self.template, **context)
 
     def context(self):
         return {}
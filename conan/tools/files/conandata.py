@@ -1,7 +1,5 @@
 import os
 
-import yaml
-
 from conans.errors import ConanException
 from conans.util.files import load, save
 
@@ -19,6 +17,7 @@ def update_conandata(conanfile, data):
     :param data: (Required) A dictionary (can be nested), of values to update
     """
 
+    import yaml
     if not hasattr(conanfile, "export_folder") or conanfile.export_folder is None:
         raise ConanException("The 'update_conandata()' can only be used in the 'export()' method")
     path = os.path.join(conanfile.export_folder, "conandata.yml")
@@ -1,5 +1,6 @@
 CHECKSUM_DEPLOY = "checksum_deploy"  # Only when v2
 REVISIONS = "revisions"  # Only when enabled in config, not by default look at server_launcher.py
 OAUTH_TOKEN = "oauth_token"
+PACKAGES_LATEST = "packages_latest"  # Latest revisions of many packages in one request
 
 __version__ = '2.0.4'
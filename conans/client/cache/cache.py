@@ -1,11 +1,10 @@
+import hashlib
+import marshal
 import os
 import platform
 import textwrap
 from typing import List
 
-import yaml
-from jinja2 import FileSystemLoader, Environment
-
 from conan import conan_version
 from conan.api.output import ConanOutput
 from conan.internal.cache.cache import DataCache, RecipeLayout, PackageLayout
@@ -31,6 +30,47 @@ HOOKS_EXTENSION_FOLDER = "hooks"
 PLUGINS_FOLDER = "plugins"
 
 
+# The parsed settings.yml and settings_user.yml, marshalled (yaml parsing dominates the time of
+# short commands), they can contain None keys, that json cannot represent
+COMPILED_SETTINGS = ".settings.compiled"
+
+# {hash of the settings files: Settings definition} shared by all the ClientCache of the process
+_settings_definitions = {}
+
+
+def _parse_settings(contents):
+    """ the merged definition of the settings.yml and the optional settings_user.yml contents """
+    import yaml
+
+    def _load_settings(text):
+        try:
+            return yaml.safe_load(text) or {}
+        except yaml.YAMLError as ye:
+            raise ConanException("Invalid settings.yml format: {}".format(ye))
+
+    settings = _load_settings(contents[0])
+    if len(contents) > 1:
+        settings_user = _load_settings(contents[1])
+
+        def appending_recursive_dict_update(d, u):
+            # Not the same behavior as conandata_update, because this append lists
+            for k, v in u.items():
+                if isinstance(v, list):
+                    current = d.get(k) or []
+                    d[k] = current + [value for value in v if value not in current]
+                elif isinstance(v, dict):
+                    current = d.get(k) or {}
+                    if isinstance(current, list):  # convert to dict lists
+                        current = {k: None for k in current}
+                    d[k] = appending_recursive_dict_update(current, v)
+                else:
+                    d[k] = v
+            return d
+
+        appending_recursive_dict_update(settings, settings_user)
+    return settings
+
+
 # TODO: Rename this to ClientHome
 class ClientCache(object):
     """ Class to represent/store/compute all the paths involved in the execution
@@ -49,7 +89,8 @@ class ClientCache(object):
 
         mkdir(self._store_folder)
         db_filename = os.path.join(self._store_folder, 'cache.sqlite3')
-        self._data_cache = DataCache(self._store_folder, db_filename)
+        deduplicate = self.new_config.get("core.cache:deduplicate", check_type=str)
+        self._data_cache = DataCache(self._store_folder, db_filename, deduplicate)
 
     @property
     def temp_folder(self):
@@ -99,8 +140,42 @@ class ClientCache(object):
         that would affect its order in our cache """
         return self._data_cache.update_recipe_timestamp(ref)
 
-    def all_refs(self):
-        return self._data_cache.list_references()
+    def register_lru_user(self):
+        """ the recipes and packages used by this process from now on can't be evicted """
+        self._data_cache.register_user()
+
+    def protect_lru_items(self, items):
+        """ the recipe and package revisions just resolved by this process can't be evicted """
+        self._data_cache.protect(items)
+
+    def update_recipes_lru(self, refs):
+        """ the recipe revisions have just been used, writes are batched and skipped if they
+        were recently used """
+        self._data_cache.update_recipes_lru(refs)
+
+    def update_packages_lru(self, prefs):
+        self._data_cache.update_packages_lru(prefs)
+
+    def evict(self, max_size=None, max_age=None, threads=8):
+        return self._data_cache.evict(max_size, max_age, threads)
+
+    def discard(self, refs, prefs, quarantine=False):
+        """ removes the recipe revisions (with all their packages) and the package revisions
+        in bulk, or moves them to the quarantine folder """
+        return self._data_cache.discard(refs, prefs, quarantine)
+
+    def deduplicate(self, layout):
+        """ links the files of the package that other packages of the cache also have, if
+        core.cache:deduplicate is defined """
+        return self._data_cache.deduplicate(layout)
+
+    def clean_objects(self):
+        return self._data_cache.clean_objects()
+
+    def all_refs(self, name=None, name_prefix=False):
+        """ all the recipe revisions in the cache, optionally only those with the given name
+        (case insensitive), or whose name starts with it if ``name_prefix`` """
+        return self._data_cache.list_references(name, name_prefix)
 
     def exists_rrev(self, ref):
         # Used just by inspect to check before calling get_recipe()
@@ -130,6 +205,23 @@ class ClientCache(object):
     def get_latest_package_reference(self, pref):
         return self._data_cache.get_latest_package_reference(pref)
 
+    def get_latest_recipe_references(self, refs):
+        """ {ref: latest_ref or None} for many references without revision, in one DB query """
+        return self._data_cache.get_latest_recipe_references(refs)
+
+    def get_latest_package_references(self, prefs):
+        """ {pref: latest_pref or None} for many package references without revision, in one DB
+        query """
+        return self._data_cache.get_latest_package_references(prefs)
+
+    def recipes_state(self):
+        """ (count, max timestamp, total timestamp) of the recipe revisions in the cache """
+        return self._data_cache.recipes_state()
+
+    def packages_state(self):
+        """ (count, max timestamp, total timestamp) of the package revisions in the cache """
+        return self._data_cache.packages_state()
+
     @property
     def store(self):
         return self._store_folder
@@ -159,14 +251,18 @@ class ClientCache(object):
         if self._new_config is None:
             self._new_config = ConfDefinition()
             if os.path.exists(self.new_config_path):
-                text = load(self.new_config_path)
-                distro = None
-                if platform.system() in ["Linux", "FreeBSD"]:
-                    import distro
-                template = Environment(loader=FileSystemLoader(self.cache_folder)).from_string(text)
-                content = template.render({"platform": platform, "os": os, "distro": distro,
-                                           "conan_version": conan_version,
-                                           "conan_home_folder": self.cache_folder})
+                content = load(self.new_config_path)
+                # Jinja is only imported when the global.conf is a template
+                if any(token in content for token in ("{{", "{%", "{#")):
+                    from jinja2 import FileSystemLoader, Environment
+                    distro = None
+                    if platform.system() in ["Linux", "FreeBSD"]:
+                        import distro
+                    env = Environment(loader=FileSystemLoader(self.cache_folder))
+                    template = env.from_string(content)
+                    content = template.render({"platform": platform, "os": os, "distro": distro,
+                                               "conan_version": conan_version,
+                                               "conan_home_folder": self.cache_folder})
                 self._new_config.loads(content)
             else:  # creation of a blank global.conf file for user convenience
                 default_global_conf = textwrap.dedent("""\
@@ -225,38 +321,43 @@ class ClientCache(object):
     @property
     def settings(self):
         """Returns {setting: [value, ...]} defining all the possible
-           settings without values"""
+           settings without values. The definition is shared by all the ClientCache with the same
+           settings files, it must not be modified, copy() it to assign values"""
         self.initialize_settings()
 
-        def _load_settings(path):
-            try:
-                return yaml.safe_load(load(path)) or {}
-            except yaml.YAMLError as ye:
-                raise ConanException("Invalid settings.yml format: {}".format(ye))
-
-        settings = _load_settings(self.settings_path)
+        contents = [load(self.settings_path)]
         user_settings_file = os.path.join(self.cache_folder, "settings_user.yml")
         if os.path.exists(user_settings_file):
-            settings_user = _load_settings(user_settings_file)
-
-            def appending_recursive_dict_update(d, u):
-                # Not the same behavior as conandata_update, because this append lists
-                for k, v in u.items():
-                    if isinstance(v, list):
-                        current = d.get(k) or []
-                        d[k] = current + [value for value in v if value not in current]
-                    elif isinstance(v, dict):
-                        current = d.get(k) or {}
-                        if isinstance(current, list):  # convert to dict lists
-                            current = {k: None for k in current}
-                        d[k] = appending_recursive_dict_update(current, v)
-                    else:
-                        d[k] = v
-                return d
-
-            appending_recursive_dict_update(settings, settings_user)
-
-        return Settings(settings)
+            contents.append(load(user_settings_file))
+        key = hashlib.sha1("\0".join([str(conan_version)] + contents).encode()).hexdigest()
+        settings = _settings_definitions.get(key)
+        if settings is None:
+            definition = self._load_compiled_settings(key)
+            if definition is None:
+                definition = _parse_settings(contents)
+                self._save_compiled_settings(key, definition)
+            settings = Settings(definition)
+            _settings_definitions[key] = settings
+        return settings
+
+    def _load_compiled_settings(self, key):
+        try:
+            with open(os.path.join(self.cache_folder, COMPILED_SETTINGS), "rb") as f:
+                compiled_key, definition = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):  # Missing, or other Python version
+            return None
+        return definition if compiled_key == key else None
+
+    def _save_compiled_settings(self, key, definition):
+        path = os.path.join(self.cache_folder, COMPILED_SETTINGS)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(tmp, "wb") as f:
+                marshal.dump((key, definition), f)
+            os.replace(tmp, path)  # Atomic, for concurrent conan processes
+        except (OSError, ValueError):  # Read-only home, or not marshallable yaml types
+            if os.path.exists(tmp):
+                os.remove(tmp)
 
     def initialize_settings(self):
         # TODO: This is called by ConfigAPI.init(), maybe move everything there?
@@ -1,11 +1,13 @@
 import os
 import shutil
 import time
+from multiprocessing.pool import ThreadPool
 
 from conan.internal.conan_app import ConanApp
 from conan.api.output import ConanOutput
 from conans.client.source import retrieve_exports_sources
-from conans.errors import ConanException, NotFoundException
+from conans.errors import ConanException, NotFoundException, AuthenticationException, \
+    ForbiddenException
 from conans.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
                           EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
 from conans.util.files import (clean_dirty, is_dirty, gather_files,
@@ -80,6 +82,7 @@ class PackagePreparator:
 
     def prepare(self, upload_bundle, enabled_remotes):
         self._output.info("Preparing artifacts to upload")
+        packages = []
         for ref, bundle in upload_bundle.refs():
             layout = self._app.cache.ref_layout(ref)
             conanfile_path = layout.conanfile()
@@ -89,7 +92,20 @@ class PackagePreparator:
                 self._prepare_recipe(ref, bundle, conanfile, enabled_remotes)
             for pref, prev_bundle in upload_bundle.prefs(ref, bundle):
                 if prev_bundle.get("upload"):
-                    self._prepare_package(pref, prev_bundle)
+                    packages.append((pref, prev_bundle))
+
+        parallel = self._app.cache.new_config.get("core.upload:parallel", check_type=int)
+        if parallel is not None and parallel > 1 and len(packages) > 1:
+            # Compressing the packages is the most expensive part, do it concurrently
+            thread_pool = ThreadPool(parallel)
+            try:
+                thread_pool.starmap(self._prepare_package, packages)
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+        else:
+            for pref, prev_bundle in packages:
+                self._prepare_package(pref, prev_bundle)
 
     def _prepare_recipe(self, ref, ref_bundle, conanfile, remotes):
         """ do a bunch of things that are necessary before actually executing the upload:
@@ -147,8 +163,9 @@ class PackagePreparator:
                     self._output.info(msg)
                 compresslevel = self._app.cache.new_config.get("core.gzip:compresslevel",
                                                                check_type=int)
+                threads = self._app.cache.new_config.get("core.gzip:threads", check_type=int)
                 tgz = compress_files(tgz_files, tgz_name, download_export_folder,
-                                     compresslevel=compresslevel)
+                                     compresslevel=compresslevel, threads=threads)
                 result[tgz_name] = tgz
 
         add_tgz(EXPORT_TGZ_NAME, files, "Compressing recipe...")
@@ -196,8 +213,9 @@ class PackagePreparator:
                 self._output.info("Compressing package...")
             tgz_files = {f: path for f, path in files.items()}
             compresslevel = self._app.cache.new_config.get("core.gzip:compresslevel", check_type=int)
+            threads = self._app.cache.new_config.get("core.gzip:threads", check_type=int)
             tgz_path = compress_files(tgz_files, PACKAGE_TGZ_NAME, download_pkg_folder,
-                                      compresslevel=compresslevel)
+                                      compresslevel=compresslevel, threads=threads)
             assert tgz_path == package_tgz
             assert os.path.exists(package_tgz)
 
@@ -217,6 +235,10 @@ class UploadExecutor:
 
     def upload(self, upload_data, remote):
         self._output.info("Uploading artifacts")
+        parallel = self._app.cache.new_config.get("core.upload:parallel", check_type=int)
+        if parallel is not None and parallel > 1:
+            self._upload_parallel(upload_data, remote, parallel)
+            return
         for ref, bundle in upload_data.refs():
             if bundle.get("upload"):
                 self.upload_recipe(ref, bundle, remote)
@@ -224,6 +246,64 @@ class UploadExecutor:
                 if prev_bundle.get("upload"):
                     self.upload_package(pref, prev_bundle, remote)
 
+    def _upload_parallel(self, upload_data, remote, parallel):
+        """ uploads the recipe and package bundles concurrently, the files of every bundle are
+        still uploaded sequentially, with the conanmanifest.txt as the last one. The packages of
+        a recipe are not uploaded until the recipe has been uploaded successfully. Failures do not
+        stop the other uploads, they are reported together at the end
+        """
+        self._output.info(f"Uploading recipes and packages in {parallel} parallel threads")
+        thread_pool = ThreadPool(parallel)
+        try:
+            recipes = []
+            for ref, bundle in upload_data.refs():
+                recipe_upload = None
+                if bundle.get("upload"):
+                    recipe_upload = thread_pool.apply_async(self.upload_recipe,
+                                                            (ref, bundle, remote))
+                recipes.append((ref, bundle, recipe_upload))
+
+            failures = []
+            packages = []
+            for ref, bundle, recipe_upload in recipes:
+                if recipe_upload is not None:
+                    error = self._upload_error(recipe_upload)
+                    if error is not None:
+                        failures.append((ref.repr_notime(), error))
+                        continue
+                for pref, prev_bundle in upload_data.prefs(ref, bundle):
+                    if prev_bundle.get("upload"):
+                        package_upload = thread_pool.apply_async(self.upload_package,
+                                                                 (pref, prev_bundle, remote))
+                        packages.append((pref, package_upload))
+
+            for pref, package_upload in packages:
+                error = self._upload_error(package_upload)
+                if error is not None:
+                    failures.append((pref.repr_notime(), error))
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+
+        if failures:
+            msg = "\n".join(f"{reference}: {error}" for reference, error in failures)
+            raise ConanException(f"There were errors uploading to '{remote.name}', execute upload "
+                                 f"again to retry the failed ones:\n{msg}")
+
+    @staticmethod
+    def _upload_error(async_result):
+        """ the exception of a failed upload, authentication errors are raised, as no other
+        upload will succeed
+        """
+        try:
+            async_result.get()
+        except (AuthenticationException, ForbiddenException):
+            raise
+        except ConanException as e:
+            return e
+        except Exception as e:  # Like an OSError reading a file, the others are still uploaded
+            return ConanException(f"{type(e).__name__}: {e}")
+
     def upload_recipe(self, ref, bundle, remote):
         self._output.info(f"Uploading recipe '{ref.repr_notime()}'")
         t1 = time.time()
@@ -247,7 +327,7 @@ class UploadExecutor:
         self._output.debug(f"Upload {pref} in {duration} time")
 
 
-def compress_files(files, name, dest_dir, compresslevel=None, ref=None):
+def compress_files(files, name, dest_dir, compresslevel=None, ref=None, threads=None):
     t1 = time.time()
     # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
@@ -256,7 +336,7 @@ def compress_files(files, name, dest_dir, compresslevel=None, ref=None):
         ConanOutput().info(f"Compressing {ref_name}{name}")
     with set_dirty_context_manager(tgz_path), open(tgz_path, "wb") as tgz_handle:
         tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle,
-                                        compresslevel=compresslevel)
+                                        compresslevel=compresslevel, threads=threads)
         for filename, abs_path in sorted(files.items()):
             # recursive is False in case it is a symlink to a folder
             tgz.add(abs_path, filename, recursive=False)
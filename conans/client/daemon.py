@@ -0,0 +1,129 @@
+""" Thin client of the Conan daemon (conan daemon start). This module is imported by the conan
+entry point before anything else, so it must only use the standard library, and be fast.
+
+Protocol, over a Unix domain socket in the Conan home: the client sends a length prefixed JSON
+request with the command arguments, current folder and environment, together with its stdin,
+stdout and stderr file descriptors (SCM_RIGHTS), so the command output goes directly to them.
+A Ctrl+C in the client is forwarded as a single byte, and the daemon answers with the exit code.
+"""
+import array
+import json
+import os
+import signal
+import socket
+import struct
+
+DAEMON_SOCKET = ".conan_daemon.sock"
+CTRL_C = b"\x03"
+_HEADER = struct.Struct("!I")
+_EXIT_CODE = struct.Struct("!i")
+_ERROR_UNEXPECTED = 7  # conan.cli.exit_codes, not imported to keep this module light
+
+
+def daemon_supported():
+    return hasattr(socket, "AF_UNIX") and hasattr(socket.socket, "sendmsg")
+
+
+def daemon_socket_path(home):
+    return os.path.join(home, DAEMON_SOCKET)
+
+
+def send_request(sock, request, fds=()):
+    data = json.dumps(request).encode("utf-8")
+    data = _HEADER.pack(len(data)) + data
+    ancillary = [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))] if fds else []
+    sent = sock.sendmsg([data], ancillary)
+    if sent < len(data):
+        sock.sendall(data[sent:])
+
+
+def _recv_exactly(sock, size, data=b""):
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def receive_request(sock, max_fds=3):
+    """ the request dict and the received file descriptors, or (None, []) if the client closed
+    the connection before sending the whole request """
+    fds = array.array("i")
+    data, ancillary, _, _ = sock.recvmsg(4096, socket.CMSG_LEN(max_fds * fds.itemsize))
+    for level, kind, fds_data in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(fds_data[:len(fds_data) - (len(fds_data) % fds.itemsize)])
+    header = _recv_exactly(sock, _HEADER.size, data[:_HEADER.size])
+    if header is None:
+        return None, list(fds)
+    size, = _HEADER.unpack(header)
+    body = _recv_exactly(sock, size, data[_HEADER.size:])
+    if body is None:
+        return None, list(fds)
+    return json.loads(body.decode("utf-8")), list(fds)
+
+
+def send_exit_code(sock, exit_code):
+    sock.sendall(_EXIT_CODE.pack(exit_code))
+
+
+def _connect(home):
+    if not daemon_supported():
+        return None
+    path = daemon_socket_path(home)
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:  # Stale socket file, the daemon is not running
+        sock.close()
+        return None
+    return sock
+
+
+def daemon_running(home):
+    sock = _connect(home)
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def run_in_daemon(args, home):
+    """ runs the command in the daemon serving the Conan home, streaming its output to the
+    stdout and stderr of this process. Returns its exit code, or None if there is no daemon
+    """
+    sock = _connect(home)
+    if sock is None:
+        return None
+    with sock:
+        request = {"args": args, "cwd": os.getcwd(), "env": dict(os.environ)}
+        send_request(sock, request, fds=[0, 1, 2])
+
+        def forward_ctrl_c(_, __):
+            sock.send(CTRL_C)
+
+        previous = signal.signal(signal.SIGINT, forward_ctrl_c)
+        try:
+            data = _recv_exactly(sock, _EXIT_CODE.size)
+        finally:
+            signal.signal(signal.SIGINT, previous)
+    if data is None:  # The command process died without an answer
+        return _ERROR_UNEXPECTED
+    return _EXIT_CODE.unpack(data)[0]
+
+
+def stop_daemon(home):
+    """ asks the daemon serving the Conan home to finish. Returns False if there is no daemon """
+    sock = _connect(home)
+    if sock is None:
+        return False
+    with sock:
+        try:
+            send_request(sock, {"stop": True})
+            sock.recv(1)  # Wait until the daemon closes the connection
+        except OSError:  # The daemon already closed it
+            pass
+    return True
@@ -8,6 +8,7 @@ from conans.client.downloaders.file_downloader import FileDownloader
 from conans.client.downloaders.download_cache import DownloadCache
 from conans.errors import NotFoundException, ConanException, AuthenticationException, \
     ForbiddenException
+from conans.util.copy_tree import reflink_or_copy
 from conans.util.files import mkdir, set_dirty_context_manager, remove_if_dirty
 
 
@@ -152,6 +153,7 @@ class ConanInternalCacheDownloader:
         self._download_cache = config.get("core.download:download_cache")
         if self._download_cache and not os.path.isabs(self._download_cache):
             raise ConanException("core.download:download_cache must be an absolute path")
+        self._deduplicate = config.get("core.cache:deduplicate", check_type=str)
         self._file_downloader = FileDownloader(requester)
 
     def download(self, url, file_path, auth, verify_ssl, retry, retry_wait):
@@ -172,4 +174,8 @@ class ConanInternalCacheDownloader:
                                                    auth=auth, overwrite=False)
             # Everything good, file in the cache, just copy it to final destination
             mkdir(os.path.dirname(file_path))
-            shutil.copy2(cached_path, file_path)
+            if self._deduplicate:
+                # Never hardlinked, the files of the download folders can be rewritten
+                reflink_or_copy(cached_path, file_path)
+            else:
+                shutil.copy2(cached_path, file_path)
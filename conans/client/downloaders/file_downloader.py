@@ -1,12 +1,15 @@
+import hashlib
 import os
 import re
 import time
 
+from requests.exceptions import RequestException
 
 from conan.api.output import ConanOutput
 from conans.client.rest import response_to_str
 from conans.errors import ConanException, NotFoundException, AuthenticationException, \
     ForbiddenException, ConanConnectionError, RequestErrorException
+from conans.util.files import tar_extract
 from conans.util.sha import check_with_algorithm_sum
 
 
@@ -62,14 +65,7 @@ class FileDownloader:
         if sha256 is not None:
             check_with_algorithm_sum("sha256", file_path, sha256)
 
-    def _download_file(self, url, auth, headers, file_path, verify_ssl, try_resume=False):
-        if try_resume and os.path.exists(file_path):
-            range_start = os.path.getsize(file_path)
-            headers = headers.copy() if headers else {}
-            headers["range"] = "bytes={}-".format(range_start)
-        else:
-            range_start = 0
-
+    def _get_response(self, url, auth, headers, verify_ssl):
         try:
             response = self._requester.get(url, stream=True, verify=verify_ssl, auth=auth,
                                            headers=headers)
@@ -87,6 +83,57 @@ class FileDownloader:
             elif response.status_code == 401:
                 raise AuthenticationException()
             raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        return response
+
+    def download_extract(self, url, dest_folder, verify_ssl=True, auth=None, headers=None):
+        """ downloads the .tgz file in ``url`` and extracts it in ``dest_folder`` at the same
+        time the data is received, without writing the compressed file to disk. The sha1 of the
+        received data is checked if the server reports it (X-Checksum-Sha1 header).
+        A ConanConnectionError is raised if the transfer is interrupted, as the extraction cannot
+        be resumed, the caller should fall back to a regular download
+        """
+        response = self._get_response(url, auth, headers, verify_ssl)
+        total_length = response.headers.get("Content-Length")
+        total_length = int(total_length) if total_length is not None else None
+        if total_length is None or total_length > 100000:
+            self._output.info("Downloading and extracting {}".format(os.path.basename(url)))
+
+        stream = _ResponseStream(response)
+        try:
+            try:
+                tar_extract(stream, dest_folder, stream=True)
+                stream.read()  # The tar end-of-archive padding, to complete the checksum
+            except ConanConnectionError:
+                raise
+            except Exception as e:
+                if total_length is not None and stream.size < total_length:
+                    raise ConanConnectionError("Transfer interrupted before complete: %s < %s"
+                                               % (stream.size, total_length))
+                raise ConanException("Error while extracting downloaded file '%s' to %s\n%s"
+                                     % (url, dest_folder, str(e)))
+        finally:
+            response.close()
+
+        gzip = (response.headers.get("content-encoding") == "gzip")
+        if total_length is not None and stream.size != total_length and not gzip:
+            raise ConanConnectionError("Transfer interrupted before complete: %s < %s"
+                                       % (stream.size, total_length))
+        sha1 = response.headers.get("X-Checksum-Sha1")
+        if sha1 is not None and stream.sha1.hexdigest() != sha1.lower():
+            raise ConanException("%s: sha1 signature failed for '%s' file. \n"
+                                 " Provided signature: %s  \n"
+                                 " Computed signature: %s" % (url, os.path.basename(url), sha1,
+                                                              stream.sha1.hexdigest()))
+
+    def _download_file(self, url, auth, headers, file_path, verify_ssl, try_resume=False):
+        if try_resume and os.path.exists(file_path):
+            range_start = os.path.getsize(file_path)
+            headers = headers.copy() if headers else {}
+            headers["range"] = "bytes={}-".format(range_start)
+        else:
+            range_start = 0
+
+        response = self._get_response(url, auth, headers, verify_ssl)
 
         def get_total_length():
             if range_start:
@@ -129,3 +176,33 @@ class FileDownloader:
             # If this part failed, it means problems with the connection to server
             raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
                                        % str(e))
+
+
+class _ResponseStream:
+    """ read-only file object over a streamed response, to be consumed while it is received,
+    computing the sha1 and the size of the data read so far
+    """
+
+    def __init__(self, response, chunk_size=1024 * 100):
+        self._chunks = iter(response.iter_content(chunk_size))
+        self._buffer = bytearray()
+        self.sha1 = hashlib.sha1()
+        self.size = 0
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                chunk = next(self._chunks, None)
+            except RequestException as e:  # Any network error while streaming
+                raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
+                                           % str(e))
+            if not chunk:
+                break
+            self.sha1.update(chunk)
+            self.size += len(chunk)
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
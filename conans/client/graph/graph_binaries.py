@@ -1,3 +1,5 @@
+from functools import partial
+
 from conan.api.output import ConanOutput
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.compatibility import BinaryCompatibility
@@ -9,6 +11,7 @@ from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLO
                                        BINARY_SYSTEM_TOOL)
 from conans.errors import NoRemoteAvailable, NotFoundException, \
     PackageNotFoundException, conanfile_exception_formatter
+from conans.model.package_ref import PkgReference
 
 
 class GraphBinariesAnalyzer(object):
@@ -18,6 +21,11 @@ class GraphBinariesAnalyzer(object):
         self._remote_manager = conan_app.remote_manager
         # These are the nodes with pref (not including PREV) that have been evaluated
         self._evaluated = {}  # {pref: [nodes]}
+        self._cache_latest_prevs = {}  # {pref: latest_pref or None} bulk-loaded per graph level
+        # {(pref, remote_name): latest_pref or None} bulk-loaded from the remotes when necessary
+        self._remote_latest_prevs = {}
+        self._pending_remote_prefs = {}  # {pref: info} to be requested to the remotes in bulk
+        self._remote_bulk_prefs = set()  # The ones already requested in bulk
         self._compatibility = BinaryCompatibility(self._cache)
 
     @staticmethod
@@ -51,10 +59,18 @@ class GraphBinariesAnalyzer(object):
     def _get_package_from_remotes(self, node):
         results = []
         pref = node.pref
-        for r in self._selected_remotes:
+        if pref in self._pending_remote_prefs:
+            self._preload_remote_latest_prevs()
+        get_latest_prev = partial(self._get_remote_latest_prev, node)
+        if pref in self._remote_bulk_prefs:
+            # Already requested in bulk (the next remotes were not if found in a previous one)
+            remotes_results = ((r, partial(get_latest_prev, r)) for r in self._selected_remotes)
+        else:
+            remotes_results = self._remote_manager.probe_remotes(self._selected_remotes,
+                                                                 get_latest_prev, self._update)
+        for r, result in remotes_results:
             try:
-                info = node.conanfile.info
-                latest_pref = self._remote_manager.get_latest_package_reference(pref, r, info)
+                latest_pref = result()
                 results.append({'pref': latest_pref, 'remote': r})
                 if len(results) > 0 and not self._update:
                     break
@@ -75,6 +91,46 @@ class GraphBinariesAnalyzer(object):
             node.prev = None
             raise PackageNotFoundException(pref)
 
+    def _get_remote_latest_prev(self, node, remote):
+        pref = node.pref
+        try:
+            latest_pref = self._remote_latest_prevs[(pref, remote.name)]
+        except KeyError:  # Not preloaded, or the remote doesn't support bulk requests
+            info = node.conanfile.info
+            return self._remote_manager.get_latest_package_reference(pref, remote, info)
+        if latest_pref is None:
+            raise PackageNotFoundException(pref)
+        return latest_pref
+
+    def _preload_remote_latest_prevs(self):
+        """ get in one single request per remote the latest package revisions of all the pending
+        prefs (the binaries of the same graph level, or the compatible binaries of a node), the
+        first time one of them has to be looked for in the remotes, instead of one request per
+        pref and remote
+        """
+        prefs = self._pending_remote_prefs
+        self._pending_remote_prefs = {}
+        if self._update:  # All the remotes are checked for all of them, concurrently
+            get_latest_prefs = partial(self._remote_manager.get_latest_package_references, prefs)
+            for r, result in self._remote_manager.probe_remotes(self._selected_remotes,
+                                                                get_latest_prefs, parallel=True):
+                latest_prefs = result() or {}  # None: not supported, one request per pref
+                self._remote_latest_prevs.update({(pref, r.name): latest_pref
+                                                  for pref, latest_pref in latest_prefs.items()})
+                self._remote_bulk_prefs.update(latest_prefs)
+            return
+        for r in self._selected_remotes:
+            if not prefs:
+                break
+            latest_prefs = self._remote_manager.get_latest_package_references(prefs, r)
+            if latest_prefs is None:  # The server doesn't support it, one request per pref
+                continue
+            self._remote_latest_prevs.update({(pref, r.name): latest_pref
+                                              for pref, latest_pref in latest_prefs.items()})
+            self._remote_bulk_prefs.update(latest_prefs)
+            # The first remote with the binary is used, the next ones don't need to check it
+            prefs = {pref: info for pref, info in prefs.items() if latest_prefs[pref] is None}
+
     def _evaluate_is_cached(self, node):
         """ Each pref has to be evaluated just once, and the action for all of them should be
         exactly the same
@@ -95,6 +151,32 @@ class GraphBinariesAnalyzer(object):
             return True
         self._evaluated[pref] = [node]
 
+    def _preload_cache_latest_prevs(self, nodes):
+        """ get in one single DB query the latest package revisions in the cache of all the
+        nodes of the same graph level, instead of one query per node
+        """
+        prefs = {node.pref: node.conanfile.info for node in nodes
+                 if node.recipe not in (RECIPE_CONSUMER, RECIPE_VIRTUAL, RECIPE_EDITABLE,
+                                        RECIPE_SYSTEM_TOOL)}
+        self._preload_cache_latest_prevs_prefs(prefs)
+
+    def _preload_cache_latest_prevs_prefs(self, prefs):
+        """ :param prefs: {pref: info} """
+        if prefs:
+            latest_prefs = self._cache.get_latest_package_references(list(prefs))
+            self._cache_latest_prevs.update(latest_prefs)
+            # The ones not in the cache (all if updating) will be requested to the remotes in bulk
+            self._pending_remote_prefs.update({pref: prefs[pref]
+                                               for pref, latest_pref in latest_prefs.items()
+                                               if latest_pref is None or self._update})
+
+    def _get_cache_latest_prev(self, pref):
+        # The preloaded value can be used just once, as a dirty package can be removed after it
+        try:
+            return self._cache_latest_prevs.pop(pref)
+        except KeyError:
+            return self._cache.get_latest_package_reference(pref)
+
     def _process_compatible_packages(self, node):
         conanfile = node.conanfile
         original_binary = node.binary
@@ -108,6 +190,9 @@ class GraphBinariesAnalyzer(object):
 
         if compatibles:
             conanfile.output.info(f"Checking {len(compatibles)} compatible configurations:")
+            prefs = {PkgReference(node.ref, package_id): compatible_package
+                     for package_id, compatible_package in compatibles.items()}
+            self._preload_cache_latest_prevs_prefs(prefs)
         for package_id, compatible_package in compatibles.items():
             conanfile.output.info(f"'{package_id}': "
                                   f"{conanfile.info.dump_diff(compatible_package)}")
@@ -176,7 +261,7 @@ class GraphBinariesAnalyzer(object):
 
         # Obtain the cache_latest valid one, cleaning things if dirty
         while True:
-            cache_latest_prev = self._cache.get_latest_package_reference(node.pref)
+            cache_latest_prev = self._get_cache_latest_prev(node.pref)
             if cache_latest_prev is None:
                 break
             package_layout = self._cache.pkg_layout(cache_latest_prev)
@@ -218,7 +303,7 @@ class GraphBinariesAnalyzer(object):
 
         # Obtain the cache_latest valid one, cleaning things if dirty
         while True:
-            cache_latest_prev = self._cache.get_latest_package_reference(node.pref)
+            cache_latest_prev = self._get_cache_latest_prev(node.pref)
             if cache_latest_prev is None:
                 break
             package_layout = self._cache.pkg_layout(cache_latest_prev)
@@ -304,7 +389,8 @@ class GraphBinariesAnalyzer(object):
             with conanfile_exception_formatter(conanfile, "layout"):
                 conanfile.layout()
 
-    def evaluate_graph(self, deps_graph, build_mode, lockfile, remotes, update):
+    def evaluate_graph(self, deps_graph, build_mode, lockfile, remotes, update,
+                       binaries_cache=None):
         self._selected_remotes = remotes or []  # TODO: A bit dirty interfaz, pass as arg instead
         self._update = update  # TODO: Dirty, fix it
         test_package = deps_graph.root.conanfile.tested_reference_str is not None
@@ -317,27 +403,49 @@ class GraphBinariesAnalyzer(object):
             ConanOutput().warning("Using build-mode 'cascade' is generally inefficient and it "
                                   "shouldn't be used. Use 'package_id' and 'package_id_modes' for"
                                   "more efficient re-builds")
-        for node in deps_graph.ordered_iterate():
-            build_mode = test_mode if node.test_package else main_mode
-            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
-                if node.path is not None and node.path.endswith(".py"):
-                    # For .py we keep evaluating the package_id, validate(), etc
+        for level in deps_graph.by_levels():
+            # Nodes in the same level are independent, their package_id can be computed together
+            for node in level:
+                if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                    if node.path is not None and node.path.endswith(".py"):
+                        # For .py we keep evaluating the package_id, validate(), etc
+                        self._evaluate_package_id(node)
+                    elif node.path is not None and node.path.endswith(".txt"):
+                        # To support the ``[layout]`` in conanfile.txt
+                        # TODO: Refactorize this a bit, the call to ``layout()``
+                        if hasattr(node.conanfile, "layout"):
+                            with conanfile_exception_formatter(node.conanfile, "layout"):
+                                node.conanfile.layout()
+                else:
                     self._evaluate_package_id(node)
-                elif node.path is not None and node.path.endswith(".txt"):
-                    # To support the ``[layout]`` in conanfile.txt
-                    # TODO: Refactorize this a bit, the call to ``layout()``
-                    if hasattr(node.conanfile, "layout"):
-                        with conanfile_exception_formatter(node.conanfile, "layout"):
-                            node.conanfile.layout()
-            else:
-                self._evaluate_package_id(node)
+
+            self._preload_cache_latest_prevs(level)
+            for node in level:
+                if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                    continue
+                build_mode = test_mode if node.test_package else main_mode
                 if lockfile:
                     locked_prev = lockfile.resolve_prev(node)
                     if locked_prev:
                         self._process_locked_node(node, build_mode, locked_prev)
                         continue
-                self._evaluate_node(node, build_mode)
-
+                if binaries_cache is None:
+                    self._evaluate_node(node, build_mode)
+                    continue
+                key, package_id = binaries_cache.node_key(node), node.package_id
+                if not binaries_cache.get(key, node):
+                    self._evaluate_node(node, build_mode)
+                    binaries_cache.add(key, node, package_id)
+            # Its last usage time is written by the installer, other process can't evict it
+            self._cache.protect_lru_items([node.pref for node in level
+                                           if node.binary == BINARY_CACHE])
+            self._cache_latest_prevs.clear()
+            self._remote_latest_prevs.clear()
+            self._pending_remote_prefs = {}
+            self._remote_bulk_prefs.clear()
+
+        if binaries_cache is not None:
+            binaries_cache.save()
         self._skip_binaries(deps_graph)
 
     @staticmethod
@@ -1,5 +1,6 @@
 import copy
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from conans.client.conanfile.configure import run_configure_method
 from conans.client.graph.graph import DepsGraph, Node, CONTEXT_HOST, \
@@ -27,6 +28,8 @@ class DepsGraphBuilder(object):
         self._update = update
         self._check_update = check_update
         self._resolve_prereleases = self._cache.new_config.get('core.version_ranges:resolve_prereleases')
+        self._prefetch_pool = None
+        self._system_tools = set()
 
     def load_graph(self, root_node, profile_host, profile_build, graph_lock=None):
         assert profile_host is not None
@@ -37,30 +40,55 @@ class DepsGraphBuilder(object):
         dep_graph = DepsGraph()
 
         self._prepare_node(root_node, profile_host, profile_build, Options())
-        self._initialize_requires(root_node, dep_graph, graph_lock)
-        dep_graph.add_node(root_node)
-
-        open_requires = deque((r, root_node) for r in root_node.conanfile.requires.values())
+        self._start_prefetch(profile_host, profile_build, graph_lock)
         try:
-            while open_requires:
-                # Fetch the first waiting to be expanded (depth-first)
-                (require, node) = open_requires.popleft()
-                if require.override:
-                    continue
-                new_node = self._expand_require(require, node, dep_graph, profile_host,
-                                                profile_build, graph_lock)
-                if new_node:
-                    self._initialize_requires(new_node, dep_graph, graph_lock)
-                    open_requires.extendleft((r, new_node)
-                                             for r in reversed(new_node.conanfile.requires.values()))
-            self._remove_overrides(dep_graph)
-            check_graph_provides(dep_graph)
-            self._compute_test_package_deps(dep_graph)
-        except GraphError as e:
-            dep_graph.error = e
+            self._initialize_requires(root_node, dep_graph, graph_lock)
+            dep_graph.add_node(root_node)
+
+            open_requires = deque((r, root_node) for r in root_node.conanfile.requires.values())
+            try:
+                while open_requires:
+                    # Fetch the first waiting to be expanded (depth-first)
+                    (require, node) = open_requires.popleft()
+                    if require.override:
+                        continue
+                    new_node = self._expand_require(require, node, dep_graph, profile_host,
+                                                    profile_build, graph_lock)
+                    if new_node:
+                        self._initialize_requires(new_node, dep_graph, graph_lock)
+                        new_requires = reversed(new_node.conanfile.requires.values())
+                        open_requires.extendleft((r, new_node) for r in new_requires)
+                self._remove_overrides(dep_graph)
+                check_graph_provides(dep_graph)
+                self._compute_test_package_deps(dep_graph)
+            except GraphError as e:
+                dep_graph.error = e
+        finally:
+            self._stop_prefetch()
+            self._proxy.update_lru()
         dep_graph.resolved_ranges = self._resolver.resolved_ranges
         return dep_graph
 
+    def _start_prefetch(self, profile_host, profile_build, graph_lock):
+        """ The recipes of the requirements, as soon as they are known, can be retrieved from the
+        remotes in background threads, while the graph expansion continues in its deterministic
+        order. Not used with lockfiles, as the locked revisions are defined later
+        """
+        parallel = self._cache.new_config.get("core.graph:prefetch_recipes", check_type=int)
+        if parallel and graph_lock is None:
+            self._prefetch_pool = ThreadPoolExecutor(parallel, thread_name_prefix="conan_prefetch")
+            # These requirements will be resolved by the system, not retrieved from remotes
+            self._system_tools = {t.name for t in profile_host.system_tools +
+                                  profile_build.system_tools}
+
+    def _stop_prefetch(self):
+        if self._prefetch_pool is not None:
+            # Recipes prefetched but not finally required (a conflict, an error...) are cancelled
+            # if not started yet
+            self._proxy.cancel_prefetch()
+            self._prefetch_pool.shutdown(wait=True)
+            self._prefetch_pool = None
+
     def _expand_require(self, require, node, graph, profile_host, profile_build, graph_lock):
         # Handle a requirement of a node. There are 2 possibilities
         #    node -(require)-> new_node (creates a new node in the graph)
@@ -168,6 +196,18 @@ class DepsGraphBuilder(object):
                 if not resolved:
                     self._resolve_alias(node, require, alias, graph)
             node.transitive_deps[require] = TransitiveRequirement(require, node=None)
+        # The fixed versions requirements will most likely be resolved by the proxy
+        refs = [r.ref for r in node.conanfile.requires.values()
+                if not r.override and not r.version_range]
+        self._proxy.preload(refs)
+        if self._prefetch_pool is not None:
+            # Not the ones that a downstream requirement overrides or that close a diamond
+            refs = [r.ref for r in node.conanfile.requires.values()
+                    if not r.override and not r.version_range
+                    and r.ref.name not in self._system_tools
+                    and node.check_downstream_exists(r) is None]
+            self._proxy.prefetch(refs, self._remotes, self._update, self._check_update,
+                                 self._prefetch_pool)
 
     def _resolve_alias(self, node, require, alias, graph):
         # First try cached
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+
+from conan import conan_version
+from conans.client.graph.graph import BINARY_CACHE, BINARY_EDITABLE, BINARY_EDITABLE_BUILD, \
+    BINARY_SYSTEM_TOOL
+from conans.model.recipe_ref import RecipeReference
+from conans.util.files import load, mkdir
+
+GRAPH_CACHE_FOLDER = ".graphs"
+GRAPH_CACHE_MAX_ENTRIES = 50
+
+
+def _key(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _load_entry(folder, name):
+    path = os.path.join(folder, name + ".json")
+    data = json.loads(load(path))
+    try:
+        os.utime(path)  # Keep the used entries, the oldest ones are removed
+    except OSError:
+        pass
+    return data
+
+
+def _save_entry(folder, name, data):
+    path = os.path.join(folder, name + ".json")
+    try:
+        mkdir(folder)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp, "w") as f:
+            f.write(json.dumps(data))
+        os.replace(tmp, path)
+        _prune(folder)
+    except OSError:  # A read-only cache can still compute graphs
+        pass
+
+
+def _prune(folder):
+    entries = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".json")]
+    if len(entries) <= GRAPH_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=os.path.getmtime)
+    for entry in entries[:len(entries) - GRAPH_CACHE_MAX_ENTRIES]:
+        os.remove(entry)
+
+
+class GraphCache:
+    """ Persistent cache of graph resolutions, enabled with the ``core.graph:cache`` conf.
+
+    The version ranges resolved by a successful graph expansion are stored, keyed by everything
+    that can change their resolution: the root recipe, the profiles, the input lockfile, the
+    remotes, the global configuration, the editables and the recipes stored in the cache. A later
+    identical computation takes the same resolution for the very same version ranges, so they are
+    not resolved again and the remotes are not checked. Any other version range (because some
+    input not tracked here, like a file read by a recipe, changed it) is still resolved normally.
+
+    The entries live in the storage folder, besides the database they depend on.
+    """
+
+    def __init__(self, cache, root_node, profile_host, profile_build, lockfile, remotes):
+        """ the inputs are captured before the graph expansion, that modifies them """
+        self._cache = cache
+        self._folder = os.path.join(cache.store, GRAPH_CACHE_FOLDER)
+        conanfile = root_node.conanfile
+        root = [root_node.recipe, root_node.context, repr(root_node.ref),
+                getattr(conanfile, "tested_reference_str", None)]
+        if root_node.path is not None:
+            folder = os.path.dirname(root_node.path)
+            root.append(root_node.path)
+            for f in (os.path.basename(root_node.path), "conandata.yml"):
+                try:
+                    root.append(load(os.path.join(folder, f)))
+                except (OSError, UnicodeDecodeError):
+                    root.append(None)
+        else:
+            root.append([(repr(r.ref), r.build) for r in conanfile.requires.values()])
+        try:
+            root.append([repr(r) for r in conanfile.python_requires.all_refs()])
+        except AttributeError:
+            pass
+        editables = {str(ref): d for ref, d in cache.editable_packages.edited_refs.items()}
+        self._inputs = {"version": str(conan_version),
+                        "root": root,
+                        "profile_host": profile_host.dumps(),
+                        "profile_build": profile_build.dumps(),
+                        "lockfile": lockfile.dumps() if lockfile is not None else None,
+                        "partial": lockfile.partial if lockfile is not None else None,
+                        "remotes": [(r.name, r.url, r.verify_ssl) for r in remotes],
+                        "global_conf": cache.new_config.dumps(),
+                        "editables": editables}
+
+    def key(self):
+        """ the inputs plus the current state of the recipes in the cache """
+        return _key(dict(self._inputs, recipes=self._cache.recipes_state()))
+
+    def get(self, key):
+        """ the {version range reference: resolved reference} of a previous resolution, or None
+        """
+        try:
+            data = _load_entry(self._folder, key)
+            return {RecipeReference.loads(k): RecipeReference.loads(v)
+                    for k, v in data["resolved_ranges"]}
+        except Exception:  # Missing, or broken or from other version, will be stored again
+            return None
+
+    def save(self, key, resolved_ranges):
+        data = {"resolved_ranges": [(repr(k), repr(v)) for k, v in resolved_ranges.items()]}
+        _save_entry(self._folder, key, data)
+
+
+class BinariesCache:
+    """ Persistent cache of the binaries analysis, enabled with the ``core.graph:cache`` conf.
+
+    The binary decided for every package reference (recipe revision and package_id) is stored,
+    keyed by everything else that can change it: the build mode, the lockfile, the remotes, the
+    global configuration, the editables and the recipes and packages stored in the cache. The
+    package_ids are still computed, as the installation needs them, but an identical analysis
+    doesn't look for the binaries in the cache database again.
+
+    Only the binaries that don't depend on the contents of the remotes (the ones already in the
+    cache, the editables and the system tools) are stored. Compatible packages are not stored
+    either, they are looked for again.
+    """
+    _STORED = (BINARY_CACHE, BINARY_EDITABLE, BINARY_EDITABLE_BUILD, BINARY_SYSTEM_TOOL)
+
+    def __init__(self, cache, build_mode, lockfile, remotes):
+        self._folder = os.path.join(cache.store, GRAPH_CACHE_FOLDER)
+        editables = {str(ref): d for ref, d in cache.editable_packages.edited_refs.items()}
+        self._key = "binaries-" + _key({"version": str(conan_version),
+                                        "build_mode": build_mode,
+                                        "lockfile": lockfile.dumps() if lockfile else None,
+                                        "remotes": [(r.name, r.url) for r in remotes or []],
+                                        "global_conf": cache.new_config.dumps(),
+                                        "editables": editables,
+                                        "recipes": cache.recipes_state(),
+                                        "packages": cache.packages_state()})
+        try:
+            self._binaries = _load_entry(self._folder, self._key)
+        except Exception:  # Missing, or broken, will be stored again
+            self._binaries = {}
+        self._changed = False
+
+    @staticmethod
+    def node_key(node):
+        """ the key of the node binary, computed before evaluating it """
+        return "{}:{}:{}:{}".format(node.pref.repr_notime(), node.context, node.recipe,
+                                    node.test_package)
+
+    def get(self, key, node):
+        """ applies the stored binary to the node, returns False if there isn't any """
+        binary = self._binaries.get(key)
+        # validate() can fail for inputs that don't change the package_id
+        if binary is None or node.conanfile.info.invalid:
+            return False
+        node.binary, node.prev = binary
+        node.binary_remote = None
+        return True
+
+    def add(self, key, node, package_id):
+        """ stores the binary of the node, if it is still the computed ``package_id`` """
+        if node.binary in self._STORED and node.package_id == package_id:
+            self._binaries[key] = node.binary, node.prev
+            self._changed = True
+
+    def save(self):
+        if self._changed:
+            _save_entry(self._folder, self._key, self._binaries)
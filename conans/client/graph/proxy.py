@@ -1,7 +1,8 @@
-from conan.api.output import ConanOutput
+from conan.api.output import ConanOutput, capture_output
 from conans.client.graph.graph import (RECIPE_DOWNLOADED, RECIPE_INCACHE, RECIPE_NEWER,
                                        RECIPE_NOT_IN_REMOTE, RECIPE_UPDATED, RECIPE_EDITABLE,
                                        RECIPE_INCACHE_DATE_UPDATED, RECIPE_UPDATEABLE)
+from conans.client.rest.auth_manager import non_interactive_auth
 from conans.errors import ConanException, NotFoundException
 
 
@@ -11,6 +12,45 @@ class ConanProxy:
         self._cache = conan_app.cache
         self._remote_manager = conan_app.remote_manager
         self._resolved = {}  # Cache of the requested recipes to optimize calls
+        self._cache_latest = {}  # {ref: latest_ref} in the cache, bulk-loaded with preload()
+        self._prefetched = {}  # {str(ref): Future} of the recipes retrieved in background
+        self._used = []  # The recipe revisions used, their last usage time written in one batch
+
+    def preload(self, refs):
+        """ Loads in one single cache DB query the latest cache revisions of references that
+        are going to be requested, instead of one query per reference later
+        """
+        refs = [r for r in refs if r.revision is None and r not in self._resolved]
+        if refs:
+            self._cache.register_lru_user()
+            latest = self._cache.get_latest_recipe_references(refs)
+            # Only the found ones, a missing recipe might be downloaded later
+            self._cache_latest.update({r: v for r, v in latest.items() if v is not None})
+
+    def prefetch(self, refs, remotes, update, check_update, executor):
+        """ Retrieves in background threads the recipes that will be requested soon, so the
+        network latency of the remotes overlaps with the caller work. get_recipe() waits
+        for them and gets the same result as if it was not prefetched
+        """
+        for ref in refs:
+            if ref.revision is None and ref not in self._resolved \
+                    and str(ref) not in self._prefetched:
+                self._prefetched[str(ref)] = executor.submit(self._prefetch_recipe, ref, remotes,
+                                                             update, check_update)
+
+    def _prefetch_recipe(self, ref, remotes, update, check_update):
+        # Its output is written by get_recipe(), and if the user has to log in to a remote,
+        # it fails, and get_recipe() retrieves it again
+        with capture_output() as output, non_interactive_auth():
+            resolved = self._get_recipe(ref, remotes, update, check_update)
+        return resolved, output.getvalue()
+
+    def cancel_prefetch(self):
+        """ The prefetches not started yet are cancelled, the running ones still finish
+        """
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
 
     def get_recipe(self, ref, remotes, update, check_update):
         """
@@ -20,10 +60,34 @@ class ConanProxy:
         # with layout.conanfile_write_lock(self._out):
         resolved = self._resolved.get(ref)
         if resolved is None:
-            resolved = self._get_recipe(ref, remotes, update, check_update)
+            self._cache.register_lru_user()
+            prefetched = self._prefetched.pop(str(ref), None)
+            if prefetched is not None:
+                # Always wait, so the same recipe is never retrieved concurrently
+                try:
+                    prefetched_recipe, output = prefetched.result()
+                except Exception:
+                    pass  # Retrieved again, reporting the error or asking to log in from here
+                else:
+                    if ref.revision is None:
+                        resolved = prefetched_recipe
+                        ConanOutput().stream.write(output)
+            if resolved is None:
+                resolved = self._get_recipe(ref, remotes, update, check_update)
             self._resolved[ref] = resolved
+            if resolved[1] != RECIPE_EDITABLE:
+                # Its last usage time is written later, other process can't evict it meanwhile
+                self._cache.protect_lru_items([resolved[3]])
+                self._used.append(resolved[3])
         return resolved
 
+    def update_lru(self):
+        """ writes in one batch the last usage time of the recipes used since the previous call
+        """
+        used, self._used = self._used, []
+        if used:
+            self._cache.update_recipes_lru(used)
+
     # return the remote where the recipe was found or None if the recipe was not found
     def _get_recipe(self, reference, remotes, update, check_update):
         output = ConanOutput(scope=str(reference))
@@ -33,7 +97,9 @@ class ConanProxy:
             return conanfile_path, RECIPE_EDITABLE, None, reference
 
         # check if it there's any revision of this recipe in the local cache
-        ref = self._cache.get_latest_recipe_reference(reference)
+        ref = self._cache_latest.pop(reference, None) if reference.revision is None else None
+        if ref is None:
+            ref = self._cache.get_latest_recipe_reference(reference)
 
         # NOT in disk, must be retrieved from remotes
         if not ref:
@@ -97,14 +163,17 @@ class ConanProxy:
     def _find_newest_recipe_in_remotes(self, reference, remotes, update, check_update):
         output = ConanOutput(scope=str(reference))
 
+        def get_remote_ref(remote):
+            if not reference.revision:
+                return self._remote_manager.get_latest_recipe_reference(reference, remote)
+            return self._remote_manager.get_recipe_revision_reference(reference, remote)
+
         results = []
-        for remote in remotes:
+        for remote, result in self._remote_manager.probe_remotes(remotes, get_remote_ref,
+                                                                  update or check_update):
             output.info(f"Checking remote: {remote.name}")
             try:
-                if not reference.revision:
-                    ref = self._remote_manager.get_latest_recipe_reference(reference, remote)
-                else:
-                    ref = self._remote_manager.get_recipe_revision_reference(reference, remote)
+                ref = result()
                 if not update and not check_update:
                     return remote, ref
                 results.append({'remote': remote, 'ref': ref})
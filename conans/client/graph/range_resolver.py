@@ -1,3 +1,5 @@
+from functools import partial
+
 from conans.errors import ConanException
 from conans.model.recipe_ref import RecipeReference
 from conans.model.version_range import VersionRange
@@ -72,8 +74,9 @@ class RangeResolver:
 
     def _resolve_remote(self, search_ref, version_range, remotes, update):
         update_candidates = []
-        for remote in remotes:
-            remote_results = self._search_remote_recipes(remote, search_ref)
+        search = partial(self._search_remote_recipes, search_ref=search_ref)
+        for remote, result in self._remote_manager.probe_remotes(remotes, search, update):
+            remote_results = result()
             resolved_version = self._resolve_version(version_range, remote_results,
                                                      self._resolve_prereleases)
             if resolved_version:
@@ -1,5 +1,9 @@
+import multiprocessing
 import os
-import shutil
+import pickle
+import sys
+import tempfile
+from multiprocessing.connection import wait
 from multiprocessing.pool import ThreadPool
 
 from conan.api.output import ConanOutput
@@ -15,6 +19,7 @@ from conans.errors import (ConanException, ConanExceptionInUserConanfileMethod,
 from conans.model.build_info import CppInfo, MockInfoProperty
 from conans.model.package_ref import PkgReference
 from conans.paths import CONANINFO
+from conans.util.copy_tree import copy_tree, COPY_STRATEGIES
 from conans.util.files import clean_dirty, is_dirty, mkdir, rmdir, save, set_dirty, chdir
 
 
@@ -73,14 +78,19 @@ class _PackageBuilder(object):
 
         return build_folder, skip_build
 
-    @staticmethod
-    def _copy_sources(conanfile, source_folder, build_folder):
+    def _copy_sources(self, conanfile, source_folder, build_folder):
         # Copies the sources to the build-folder, unless no_copy_source is defined
         rmdir(build_folder)
         if not getattr(conanfile, 'no_copy_source', False):
+            config = self._cache.new_config
+            strategy = config.get("core.build:sources_copy", default="copy", check_type=str)
+            if strategy not in COPY_STRATEGIES:
+                raise ConanException(f"Unknown value '{strategy}' for 'core.build:sources_copy', "
+                                     f"use one of {', '.join(COPY_STRATEGIES)}")
+            threads = config.get("core.build:sources_copy_threads", default=8, check_type=int)
             conanfile.output.info('Copying sources to build folder')
             try:
-                shutil.copytree(source_folder, build_folder, symlinks=True)
+                copy_tree(source_folder, build_folder, strategy, threads)
             except Exception as e:
                 msg = str(e)
                 if "206" in msg:  # System error shutil.Error 206: Filename or extension too long
@@ -242,15 +252,27 @@ class BinaryInstaller:
         package_count = sum([sum(len(install_reference.packages.values())
                                  for level in install_order
                                  for install_reference in level)])
-        handled_count = 1
+        # The binaries already in the cache are used now, the new ones are created as used
+        self._cache.update_packages_lru([PkgReference(install_reference.ref, package.package_id,
+                                                      package.prev)
+                                         for level in install_order
+                                         for install_reference in level
+                                         for package in install_reference.packages.values()
+                                         if package.binary == BINARY_CACHE])
 
         self._download_bulk(install_order)
-        for level in install_order:
-            for install_reference in level:
-                for package in install_reference.packages.values():
-                    self._install_source(package.nodes[0], remotes)
-                    self._handle_package(package, install_reference, None, handled_count, package_count)
-                    handled_count += 1
+        parallel_jobs = self._cache.new_config.get("core.build:parallel_jobs", check_type=int)
+        if parallel_jobs is not None and parallel_jobs > 1 and hasattr(os, "fork"):
+            _ParallelBuilder(self, remotes, parallel_jobs).install(install_order, package_count)
+        else:
+            handled_count = 1
+            for level in install_order:
+                for install_reference in level:
+                    for package in install_reference.packages.values():
+                        self._install_source(package.nodes[0], remotes)
+                        self._handle_package(package, install_reference, None, handled_count,
+                                             package_count)
+                        handled_count += 1
 
         MockInfoProperty.message()
 
@@ -295,6 +317,13 @@ class BinaryInstaller:
             self._handle_node_editable(package)
             return
 
+        pref, package_layout = self._install_package(package, install_reference, handled_count,
+                                                     total_count)
+        self._handle_package_info(package, pref, package_layout)
+
+    def _install_package(self, package, install_reference, handled_count, total_count):
+        """ builds the package if necessary, returns its final reference and layout in the cache
+        """
         assert package.binary in (BINARY_CACHE, BINARY_BUILD, BINARY_DOWNLOAD, BINARY_UPDATE)
         assert install_reference.ref.revision is not None, "Installer should receive RREV always"
 
@@ -323,7 +352,9 @@ class BinaryInstaller:
             pref = node.pref
             assert node.prev, "PREV for %s is None" % str(pref)
             node.conanfile.output.success(f'Already installed! ({handled_count} of {total_count})')
+        return pref, package_layout
 
+    def _handle_package_info(self, package, pref, package_layout):
         # Make sure that all nodes with same pref compute package_info()
         pkg_folder = package_layout.package()
         assert os.path.isdir(pkg_folder), "Pkg '%s' folder must exist: %s" % (str(pref), pkg_folder)
@@ -447,3 +478,179 @@ class BinaryInstaller:
                 self._hook_manager.execute("post_package_info", conanfile=conanfile)
 
         conanfile.cpp_info.check_component_requires(conanfile)
+
+
+class _BuildJob:
+    """ A recipe reference whose packages are being built in a forked process, writing its output
+    to a temporary file and sending back the results through a pipe
+    """
+
+    def __init__(self, install_reference, pid, connection, output):
+        self.install_reference = install_reference
+        self.pid = pid
+        self.connection = connection
+        self.output = output
+
+    def finish(self):
+        """ waits for the process to finish, dumps its output and returns its (result, error)
+        """
+        try:
+            result, error = self.connection.recv()
+        except EOFError:
+            result, error = None, None
+        _, status = os.waitpid(self.pid, 0)
+        if result is None and error is None:
+            error = ConanException(f"{self.install_reference.ref}: The build process finished "
+                                   f"unexpectedly with status {status}")
+        self.connection.close()
+        self.output.seek(0)
+        output = self.output.read().decode("utf-8", errors="ignore")
+        self.output.close()
+        stream = ConanOutput().stream
+        stream.write(output)
+        stream.flush()
+        return result, error
+
+
+class _ParallelBuilder:
+    """ Installs the install order, building up to ``jobs`` recipe references at the same time.
+
+    The install order is processed as a DAG, instead of level by level: every reference is ready
+    as soon as all its dependencies have been installed. References with nothing to build are
+    installed immediately in this process. References with packages to build from sources are
+    launched in forked processes, because the build of a package changes the current directory
+    and the environment, so it cannot run in a thread. The output of every job is buffered and
+    printed when it finishes, so the output of different packages is never interleaved. Finally,
+    the package_info() of the built packages is evaluated in this process, the one that forks its
+    consumers later.
+
+    The forked processes inherit the state of this one, but not its threads: they open their own
+    network connections, and the module level thread pools and locks are re-created in them
+    (os.register_at_fork()).
+    """
+
+    def __init__(self, installer, remotes, jobs):
+        self._installer = installer
+        self._cache = installer._cache
+        self._remotes = remotes
+        self._jobs = jobs
+
+    def install(self, install_order, total_count):
+        ConanOutput().info(f"Building packages in {self._jobs} parallel jobs")
+        handled_counts = {}  # Same numbering as the sequential install
+        handled_count = 1
+        for level in install_order:
+            for install_reference in level:
+                handled_counts[install_reference.ref] = handled_count
+                handled_count += len(install_reference.packages)
+
+        pending = {r.ref: r for level in install_order for r in level}
+        running = {}  # {connection: _BuildJob}
+        error = None
+        try:
+            while pending or running:
+                if error is None:
+                    unfinished = set(pending)
+                    unfinished.update(job.install_reference.ref for job in running.values())
+                    ready = [r for r in pending.values()
+                             if not any(d in unfinished for d in r.depends)]
+                    local = [r for r in ready if not self._needs_build(r)]
+                    if local:
+                        for install_reference in local:
+                            pending.pop(install_reference.ref)
+                            self._install(install_reference, handled_counts[install_reference.ref],
+                                          total_count)
+                        continue  # Their consumers might be ready now
+                    for install_reference in ready[:self._jobs - len(running)]:
+                        pending.pop(install_reference.ref)
+                        job = self._launch(install_reference,
+                                           handled_counts[install_reference.ref], total_count)
+                        running[job.connection] = job
+                    assert running, "There are no ready packages to build"
+                elif not running:
+                    break
+                # After a failure, the running jobs are allowed to finish, but no new ones start
+                for connection in wait(list(running)):
+                    job = running.pop(connection)
+                    result, job_error = job.finish()
+                    if job_error is not None:
+                        error = error or job_error
+                    elif error is None:
+                        self._package_info(job.install_reference, result)
+        finally:
+            for job in running.values():
+                job.finish()
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _needs_build(install_reference):
+        return any(p.binary == BINARY_BUILD for p in install_reference.packages.values())
+
+    def _install(self, install_reference, handled_count, total_count):
+        for package in install_reference.packages.values():
+            self._installer._install_source(package.nodes[0], self._remotes)
+            self._installer._handle_package(package, install_reference, None, handled_count,
+                                            total_count)
+            handled_count += 1
+
+    def _launch(self, install_reference, handled_count, total_count):
+        ConanOutput(scope=str(install_reference.ref))\
+            .info("Building in a parallel job, its output will be displayed when finished")
+        output = tempfile.TemporaryFile()
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        pid = os.fork()
+        if pid == 0:  # The child never returns, nor runs the cleanup of the parent process
+            exit_code = 1
+            try:
+                receiver.close()
+                # The network connections of this process can't be shared with the parent one
+                self._installer._app.requester.reset_connections()
+                self._build(install_reference, sender, output, handled_count, total_count)
+                exit_code = 0
+            finally:
+                os._exit(exit_code)
+        sender.close()
+        return _BuildJob(install_reference, pid, receiver, output)
+
+    def _build(self, install_reference, connection, output, handled_count, total_count):
+        """ runs in the forked process, builds the packages of the reference, but doesn't call
+        their package_info(), it wouldn't have effect in this process
+        """
+        # Also redirect the file descriptors, so the output of the subprocesses is captured too
+        os.dup2(output.fileno(), 1)
+        os.dup2(output.fileno(), 2)
+        sys.stdout = sys.stderr = open(2, "w", buffering=1, encoding="utf-8", closefd=False)
+        result, error = [], None
+        try:
+            for package in install_reference.packages.values():
+                self._installer._install_source(package.nodes[0], self._remotes)
+                if package.binary not in (BINARY_SYSTEM_TOOL, BINARY_EDITABLE,
+                                          BINARY_EDITABLE_BUILD):
+                    self._installer._install_package(package, install_reference, handled_count,
+                                                     total_count)
+                result.append((package.package_id, package.prev, package.binary))
+                handled_count += 1
+        except Exception as e:
+            error = e
+            try:
+                pickle.loads(pickle.dumps(error))
+            except Exception:  # Not every exception can be sent back to the main process
+                error = ConanException(str(e))
+        sys.stderr.flush()
+        connection.send((result, error))
+        connection.close()
+
+    def _package_info(self, install_reference, result):
+        """ updates the built packages with the results of the job, and calls their package_info()
+        """
+        for package, (package_id, prev, binary) in zip(install_reference.packages.values(),
+                                                       result):
+            if package.binary in (BINARY_SYSTEM_TOOL, BINARY_EDITABLE, BINARY_EDITABLE_BUILD):
+                self._installer._handle_package(package, install_reference, None, 0, 0)
+                continue
+            package.package_id, package.prev, package.binary = package_id, prev, binary
+            node = package.nodes[0]
+            node.prev, node.binary = prev, binary
+            pref = PkgReference(install_reference.ref, package_id, prev)
+            self._installer._handle_package_info(package, pref, self._cache.pkg_layout(pref))
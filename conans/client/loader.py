@@ -1,24 +1,21 @@
 from importlib import invalidate_caches, util as imp_util
 import inspect
+import marshal
 import os
 import re
 import sys
 import types
 import uuid
 
-import yaml
-
 from pathlib import Path
 
-from conan.tools.cmake import cmake_layout
-from conan.tools.google import bazel_layout
-from conan.tools.microsoft import vs_layout
 from conans.client.conf.required_version import validate_conan_version
 from conans.client.loader_txt import ConanFileTextLoader
 from conans.errors import ConanException, NotFoundException, conanfile_exception_formatter
 from conans.model.conan_file import ConanFile
 from conans.model.options import Options
 from conans.model.recipe_ref import RecipeReference
+from conan.internal.cache.conan_reference_layout import EXPORT_FOLDER
 from conans.paths import DATA_YML
 from conans.util.files import load, chdir, load_user_encoded
 
@@ -52,7 +49,8 @@ class ConanFileLoader:
             return conanfile, cached[1]
 
         try:
-            module, conanfile = parse_conanfile(conanfile_path)
+            compiled = self._compiled_recipe(conanfile_path)
+            module, conanfile = parse_conanfile(conanfile_path, compiled)
             if tested_python_requires:
                 conanfile.python_requires = tested_python_requires
 
@@ -64,7 +62,11 @@ class ConanFileLoader:
             conanfile.recipe_path = Path(conanfile.recipe_folder)
 
             # Load and populate dynamic fields from the data file
-            conan_data = self._load_data(conanfile_path)
+            if compiled is not None:
+                conan_data = compiled.conandata(self._load_data)
+                compiled.save()
+            else:
+                conan_data = self._load_data(conanfile_path)
             conanfile.conan_data = conan_data
 
             self._cached_conanfile_classes[conanfile_path] = (conanfile, module)
@@ -78,12 +80,22 @@ class ConanFileLoader:
         except ConanException as e:
             raise ConanException("Error loading conanfile at '{}': {}".format(conanfile_path, e))
 
+    def _compiled_recipe(self, conanfile_path):
+        """ only the recipes in the cache can be compiled, the user ones can change anytime """
+        cache = self._conanfile_helpers.cache if self._conanfile_helpers else None
+        if cache is None or not conanfile_path.startswith(os.path.join(cache.store, "")):
+            return None
+        if os.path.basename(os.path.dirname(conanfile_path)) != EXPORT_FOLDER:
+            return None
+        return CompiledRecipe(conanfile_path)
+
     @staticmethod
     def _load_data(conanfile_path):
         data_path = os.path.join(os.path.dirname(conanfile_path), DATA_YML)
         if not os.path.exists(data_path):
             return None
 
+        import yaml
         try:
             data = yaml.safe_load(load(data_path))
         except Exception as e:
@@ -222,6 +234,10 @@ class ConanFileLoader:
             conanfile.requires.test_require(ref)
 
         if parser.layout:
+            # The generators are only imported when a conanfile.txt declares a layout
+            from conan.tools.cmake import cmake_layout
+            from conan.tools.google import bazel_layout
+            from conan.tools.microsoft import vs_layout
             layout_method = {"cmake_layout": cmake_layout,
                              "vs_layout": vs_layout,
                              "bazel_layout": bazel_layout}.get(parser.layout)
@@ -284,8 +300,8 @@ def _parse_module(conanfile_module, module_id):
     return result
 
 
-def parse_conanfile(conanfile_path):
-    module, filename = load_python_file(conanfile_path)
+def parse_conanfile(conanfile_path, compiled=None):
+    module, filename = load_python_file(conanfile_path, compiled)
     try:
         conanfile = _parse_module(module, filename)
         return module, conanfile
@@ -293,8 +309,9 @@ def parse_conanfile(conanfile_path):
         raise ConanException("%s: %s" % (conanfile_path, str(e)))
 
 
-def load_python_file(conan_file_path):
-    """ From a given path, obtain the in memory python import module
+def load_python_file(conan_file_path, compiled=None):
+    """ From a given path, obtain the in memory python import module. If a CompiledRecipe is
+    given, its code object is executed instead of compiling the file
     """
 
     if not os.path.exists(conan_file_path):
@@ -311,7 +328,10 @@ def load_python_file(conan_file_path):
                 sys.dont_write_bytecode = True
                 spec = imp_util.spec_from_file_location(module_id, conan_file_path)
                 loaded = imp_util.module_from_spec(spec)
-                spec.loader.exec_module(loaded)
+                if compiled is not None:
+                    exec(compiled.code(), loaded.__dict__)
+                else:
+                    spec.loader.exec_module(loaded)
                 sys.dont_write_bytecode = old_dont_write_bytecode
             except ImportError:
                 version_txt = _get_required_conan_version_without_loading(conan_file_path)
@@ -371,3 +391,75 @@ def _get_required_conan_version_without_loading(conan_file_path):
         pass
 
     return txt_version
+
+
+COMPILED_RECIPE = "conanfile.compiled"
+
+
+class CompiledRecipe:
+    """ The compiled code of a conanfile.py of the cache, and its parsed conandata.yml, stored
+    (marshalled) in the recipe layout folder, besides the export folder, so the manifest of the
+    recipe doesn't change. As the recipe revisions are immutable, they are compiled and parsed
+    once, not in every conan process. The stat of the files is checked anyway, in case they are
+    modified by hand.
+    """
+
+    def __init__(self, conanfile_path):
+        self._conanfile_path = conanfile_path
+        self._data_path = os.path.join(os.path.dirname(conanfile_path), DATA_YML)
+        self._path = os.path.join(os.path.dirname(os.path.dirname(conanfile_path)),
+                                  COMPILED_RECIPE)
+        # The code is compiled with its path, for the tracebacks and the __file__ of the recipe
+        self._key = (imp_util.MAGIC_NUMBER, conanfile_path, self._stat(conanfile_path),
+                     self._stat(self._data_path))
+        self._changed = False
+        try:
+            with open(self._path, "rb") as f:
+                entry = marshal.load(f)
+            self._entry = entry if entry["key"] == self._key else {}
+        except (OSError, EOFError, ValueError, TypeError, KeyError):  # Missing or other Python
+            self._entry = {}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def code(self):
+        code = self._entry.get("code")
+        if code is None:
+            with open(self._conanfile_path, "rb") as f:
+                source = f.read()
+            code = compile(source, self._conanfile_path, "exec", dont_inherit=True)
+            self._entry["code"] = code
+            self._changed = True
+        return code
+
+    def conandata(self, load_data):
+        if "conandata" in self._entry:
+            return self._entry["conandata"]
+        data = load_data(self._conanfile_path)
+        try:
+            marshal.dumps(data)
+        except ValueError:  # Types that marshal doesn't support, like dates, parsed every time
+            return data
+        self._entry["conandata"] = data
+        self._changed = True
+        return data
+
+    def save(self):
+        if not self._changed:
+            return
+        self._entry["key"] = self._key
+        tmp = "{}.{}.tmp".format(self._path, os.getpid())
+        try:
+            with open(tmp, "wb") as f:
+                marshal.dump(self._entry, f)
+            os.replace(tmp, self._path)  # Atomic, for concurrent conan processes
+        except OSError:  # Read-only cache, it will be compiled every time
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._changed = False
@@ -17,6 +17,10 @@ class PkgSignaturesPlugin:
         else:
             self._plugin_sign_function = self._plugin_verify_function = None
 
+    @property
+    def verifies(self):
+        return self._plugin_verify_function is not None
+
     def sign(self, upload_data):
         if self._plugin_sign_function is None:
             return
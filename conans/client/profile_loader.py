@@ -2,8 +2,6 @@ import os
 import platform
 from collections import OrderedDict, defaultdict
 
-from jinja2 import Environment, FileSystemLoader
-
 from conan import conan_version
 from conan.tools.env.environment import ProfileEnvironment
 from conans.client.loader import load_python_file
@@ -164,6 +162,7 @@ class ProfileLoader:
                    "profile_dir": base_path,
                    "profile_name": file_path,
                    "conan_version": conan_version}
+        from jinja2 import Environment, FileSystemLoader
         rtemplate = Environment(loader=FileSystemLoader(base_path)).from_string(text)
         text = rtemplate.render(context)
 
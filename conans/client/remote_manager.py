@@ -1,15 +1,19 @@
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List
 
 from requests.exceptions import ConnectionError
 
-from conan.api.output import ConanOutput
+from conan.api.output import ConanOutput, capture_output
 from conan.internal.cache.conan_reference_layout import METADATA
 from conans.client.cache.remote_registry import Remote
 from conans.client.pkg_sign import PkgSignaturesPlugin
+from conans.client.rest.auth_manager import non_interactive_auth
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
-    PackageNotFoundException
+    PackageNotFoundException, AuthenticationException
 from conans.model.info import load_binary_info
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
@@ -18,6 +22,33 @@ from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_N
 from conans.util.files import mkdir, tar_extract
 
 
+_remotes_executors = {}  # {(pid, max_workers): ThreadPoolExecutor} shared by all the lookups
+_remotes_executors_lock = threading.Lock()
+
+
+def _reset_remotes_executors():
+    # The threads don't survive a fork, and the lock could be held by one of them
+    global _remotes_executors_lock
+    _remotes_executors_lock = threading.Lock()
+    _remotes_executors.clear()
+
+
+if hasattr(os, "register_at_fork"):  # Python >= 3.7
+    os.register_at_fork(after_in_child=_reset_remotes_executors)
+
+
+def _remotes_executor(max_workers):
+    # The threads don't survive a fork, the forked process needs its own executor
+    key = os.getpid(), max_workers
+    with _remotes_executors_lock:
+        executor = _remotes_executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers,
+                                          thread_name_prefix="conan_remotes")
+            _remotes_executors[key] = executor
+        return executor
+
+
 class RemoteManager(object):
     """ Will handle the remotes to get recipes, packages etc """
 
@@ -26,6 +57,52 @@ class RemoteManager(object):
         self._auth_manager = auth_manager
         self._signer = PkgSignaturesPlugin(cache)
 
+    def probe_remotes(self, remotes, func, parallel):
+        """ Yields (remote, result) in the remotes order, where result() returns or raises what
+        func(remote) did, so the caller processes them exactly as if they were called one after
+        another: the first remote in order still wins, and the errors of a remote after the one
+        used are never raised.
+
+        With ``parallel`` (all the remotes are going to be checked, as with --update), func(remote)
+        runs for all the remotes concurrently. These background calls never ask the user to log
+        in, and their output is written by result(). A call that needs the user to log in is
+        repeated by result(), in the caller thread. Stopping the iteration cancels the calls not
+        started yet.
+        """
+        max_workers = self._cache.new_config.get("core.net.http:remotes_parallel",
+                                                  check_type=int, default=8)
+        if not parallel or max_workers <= 1 or len(remotes) <= 1:
+            for remote in remotes:
+                yield remote, partial(func, remote)
+            return
+        executor = _remotes_executor(max_workers)
+        futures = [executor.submit(self._probe_remote, func, remote) for remote in remotes]
+        try:
+            for remote, future in zip(remotes, futures):
+                yield remote, partial(self._probe_result, func, remote, future)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    @staticmethod
+    def _probe_remote(func, remote):
+        with capture_output() as output, non_interactive_auth():
+            try:
+                result = func(remote)
+            except Exception as e:
+                return output.getvalue(), None, e
+            return output.getvalue(), result, None
+
+    @staticmethod
+    def _probe_result(func, remote, future):
+        output, result, error = future.result()
+        if isinstance(error, AuthenticationException):
+            return func(remote)  # The user can log in from this thread
+        ConanOutput().stream.write(output)
+        if error is not None:
+            raise error
+        return result
+
     def check_credentials(self, remote):
         self._call_remote(remote, "check_credentials")
 
@@ -112,8 +189,12 @@ class RemoteManager(object):
             assert pref.revision is not None
 
             download_pkg_folder = layout.download_package()
-            # Download files to the pkg_tgz folder, not to the final one
-            zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder)
+            package_folder = layout.package()
+            # Download files to the pkg_tgz folder, not to the final one. The conan_package.tgz
+            # can be extracted to the final one while downloading, unless it has to be verified
+            extract_folder = None if self._signer.verifies else package_folder
+            zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder,
+                                             extract_folder)
             zipped_files = {k: v for k, v in zipped_files.items() if not k.startswith(METADATA)}
             # quick server package integrity check:
             for f in ("conaninfo.txt", "conanmanifest.txt", "conan_package.tgz"):
@@ -122,11 +203,12 @@ class RemoteManager(object):
             self._signer.verify(pref, download_pkg_folder)
 
             tgz_file = zipped_files.pop(PACKAGE_TGZ_NAME, None)
-            package_folder = layout.package()
-            uncompress_file(tgz_file, package_folder)
+            if tgz_file is not None:  # Otherwise, it was already extracted while downloading
+                uncompress_file(tgz_file, package_folder)
             mkdir(package_folder)  # Just in case it doesn't exist, because uncompress did nothing
             for file_name, file_path in zipped_files.items():  # copy CONANINFO and CONANMANIFEST
                 shutil.move(file_path, os.path.join(package_folder, file_name))
+            self._cache.deduplicate(layout)
 
             scoped_output.success('Package installed %s' % pref.package_id)
             scoped_output.info("Downloaded package revision %s" % pref.revision)
@@ -175,19 +257,17 @@ class RemoteManager(object):
 
     def get_latest_package_reference(self, pref, remote, info=None) -> PkgReference:
         assert pref.revision is None, "get_latest_package_reference of a reference with revision"
-        # These headers are useful to know what configurations are being requested in the server
-        headers = None
-        if info:
-            headers = {}
-            settings = [f'{k}={v}' for k, v in info.settings.items()]
-            if settings:
-                headers['Conan-PkgID-Settings'] = ';'.join(settings)
-            options = [f'{k}={v}' for k, v in info.options.serialize().items()
-                       if k in ("shared", "fPIC", "header_only")]
-            if options:
-                headers['Conan-PkgID-Options'] = ';'.join(options)
+        headers = _package_info_headers(info) if info else None
         return self._call_remote(remote, "get_latest_package_reference", pref, headers=headers)
 
+    def get_latest_package_references(self, prefs, remote):
+        """ {pref: latest_pref or None} of {pref: info} in a single request, or None if the
+        remote doesn't support it, and get_latest_package_reference() has to be used instead
+        """
+        assert all(pref.revision is None for pref in prefs)
+        prefs = {pref: _package_info_headers(info) if info else {} for pref, info in prefs.items()}
+        return self._call_remote(remote, "get_latest_package_references", prefs)
+
     def get_recipe_revision_reference(self, ref, remote) -> bool:
         assert ref.revision is not None, "recipe_exists needs a revision"
         return self._call_remote(remote, "get_recipe_revision_reference", ref)
@@ -216,6 +296,19 @@ class RemoteManager(object):
             raise ConanException(exc, remote=remote)
 
 
+def _package_info_headers(info):
+    # These headers are useful to know what configurations are being requested in the server
+    headers = {}
+    settings = [f'{k}={v}' for k, v in info.settings.items()]
+    if settings:
+        headers['Conan-PkgID-Settings'] = ';'.join(settings)
+    options = [f'{k}={v}' for k, v in info.options.serialize().items()
+               if k in ("shared", "fPIC", "header_only")]
+    if options:
+        headers['Conan-PkgID-Options'] = ';'.join(options)
+    return headers
+
+
 def uncompress_file(src_path, dest_folder):
     try:
         ConanOutput().info("Decompressing %s" % os.path.basename(src_path))
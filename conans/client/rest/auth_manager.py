@@ -12,6 +12,8 @@ Flow:
 """
 
 import hashlib
+import threading
+from contextlib import contextmanager
 from uuid import getnode as get_mac
 
 from conan.api.output import ConanOutput
@@ -21,6 +23,22 @@ from conans.errors import AuthenticationException, ConanException, ForbiddenExce
 
 LOGIN_RETRIES = 3
 
+_background = threading.local()
+
+
+@contextmanager
+def non_interactive_auth():
+    """ The remote calls of the current thread never ask the user to log in, they raise the
+    AuthenticationException instead, so a background thread never prompts the user, and the main
+    thread can repeat the call if it needs its result
+    """
+    previous = getattr(_background, "non_interactive", False)
+    _background.non_interactive = True
+    try:
+        yield
+    finally:
+        _background.non_interactive = previous
+
 
 class ConanApiAuthManager(object):
 
@@ -45,6 +63,8 @@ class ConanApiAuthManager(object):
         except AuthenticationException:
             # User valid but not enough permissions
             if user is None or token is None:
+                if getattr(_background, "non_interactive", False):
+                    raise
                 # token is None when you change user with user command
                 # Anonymous is not enough, ask for a user
                 ConanOutput().info('Please log in to "%s" to perform this action. '
@@ -100,6 +100,10 @@ class ClientV2Router:
         assert pref.ref.revision is not None, "Cannot get the latest package without RREV"
         return self.base_url + _format_pref(self.routes.package_revision_latest, pref)
 
+    def packages_latest(self):
+        """Get the latest of many packages"""
+        return self.base_url + self.routes.common_packages_latest
+
     def recipe_latest(self, ref):
         """Get the latest of a recipe"""
         assert ref.revision is None, "for_recipe_latest shouldn't receive RREV"
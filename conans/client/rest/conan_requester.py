@@ -6,7 +6,6 @@ import platform
 
 import requests
 import urllib3
-from jinja2 import Template
 from requests.adapters import HTTPAdapter
 
 from conans import __version__ as client_version
@@ -32,6 +31,7 @@ class URLCredentials:
         creds_path = os.path.join(cache_folder, "source_credentials.json")
         if not os.path.exists(creds_path):
             return
+        from jinja2 import Template
         template = Template(load(creds_path))
         content = template.render({"platform": platform, "os": os})
         content = json.loads(content)
@@ -77,10 +77,8 @@ class ConanRequester(object):
         #  even if it doesn't use it
         # FIXME: Trick for testing when requests is mocked
         if hasattr(requests, "Session"):
-            self._http_requester = requests.Session()
-            adapter = HTTPAdapter(max_retries=self._get_retries(config))
-            self._http_requester.mount("http://", adapter)
-            self._http_requester.mount("https://", adapter)
+            self._max_retries = self._get_retries(config)
+            self._http_requester = self._new_session()
 
         self._url_creds = URLCredentials(cache_folder)
         self._timeout = config.get("core.net.http:timeout", default=DEFAULT_TIMEOUT)
@@ -92,6 +90,21 @@ class ConanRequester(object):
         self._clean_system_proxy = config.get("core.net.http:clean_system_proxy", default=False,
                                               check_type=bool)
 
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=self._max_retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def reset_connections(self):
+        """ To be called by a forked process: the keep-alive connections (and their locks) are
+        inherited from the parent process, that can keep using them concurrently, so the child
+        must open its own ones
+        """
+        if hasattr(requests, "Session"):
+            self._http_requester = self._new_session()
+
     @staticmethod
     def _get_retries(config):
         retry = config.get("core.net.http:max_retries", default=2, check_type=int)
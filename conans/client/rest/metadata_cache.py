@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from conans.util.files import load, mkdir, rmdir
+
+METADATA_CACHE_FOLDER = ".remotes_metadata"
+
+
+class RemoteMetadataCache:
+    """ Persistent cache of the json responses of the remotes to the GET queries (searches, latest
+    and listed revisions, files of a revision), enabled with ``core.net.http:metadata_cache_ttl``
+
+    A stored response is revalidated with its ETag (``If-None-Match``), so an unchanged server
+    answers "304 Not Modified" instead of the full response. While resolving the dependency graph
+    without ``--update`` (``reuse_fresh()``), the responses younger than the TTL are used without
+    contacting the remote at all. The uploads and removals to a remote drop all its responses.
+    """
+
+    def __init__(self, cache_folder, ttl):
+        self._folder = os.path.join(cache_folder, METADATA_CACHE_FOLDER)
+        self._ttl = ttl
+        self._reuse_fresh = False
+
+    @property
+    def enabled(self):
+        return self._ttl is not None
+
+    @contextmanager
+    def reuse_fresh(self, reuse=True):
+        """ the responses younger than the TTL are returned without revalidating them """
+        previous = self._reuse_fresh
+        self._reuse_fresh = reuse
+        try:
+            yield
+        finally:
+            self._reuse_fresh = previous
+
+    def _remote_folder(self, remote_url):
+        return os.path.join(self._folder, hashlib.sha1(remote_url.encode()).hexdigest())
+
+    def _path(self, remote_url, url, auth, headers):
+        # The responses depend on the user (permissions) and on the request headers
+        key = json.dumps([url, auth, sorted(headers.items())])
+        return os.path.join(self._remote_folder(remote_url),
+                            hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def get(self, remote_url, url, auth, headers):
+        """ (data, etag, fresh) of the stored response, or None """
+        if not self.enabled:
+            return None
+        try:
+            entry = json.loads(load(self._path(remote_url, url, auth, headers)))
+        except Exception:  # Missing or broken, it will be requested again
+            return None
+        fresh = self._reuse_fresh and time.time() - entry["time"] < self._ttl
+        return entry["data"], entry["etag"], fresh
+
+    def save(self, remote_url, url, auth, headers, data, etag):
+        if not self.enabled:
+            return
+        path = self._path(remote_url, url, auth, headers)
+        entry = {"time": time.time(), "etag": etag, "data": data}
+        try:
+            mkdir(os.path.dirname(path))
+            # The remotes are requested concurrently, by different threads and processes
+            tmp = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+            with open(tmp, "w") as f:
+                f.write(json.dumps(entry))
+            os.replace(tmp, path)
+        except OSError:  # A read-only home can still query the remotes
+            pass
+
+    def invalidate(self, remote_url):
+        if not self.enabled:
+            return
+        try:
+            rmdir(self._remote_folder(remote_url))
+        except OSError:
+            pass
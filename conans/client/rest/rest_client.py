@@ -1,19 +1,20 @@
-from conans import CHECKSUM_DEPLOY, REVISIONS, OAUTH_TOKEN
+from conans import CHECKSUM_DEPLOY, REVISIONS, OAUTH_TOKEN, PACKAGES_LATEST
 from conans.client.rest.rest_client_v2 import RestV2Methods
 from conans.errors import AuthenticationException, ConanException
 
 
 class RestApiClientFactory(object):
 
-    def __init__(self, requester, config):
+    def __init__(self, requester, config, metadata_cache=None):
         self._requester = requester
         self._config = config
         self._cached_capabilities = {}
+        self._metadata_cache = metadata_cache
 
     def new(self, remote, token, refresh_token, custom_headers):
         tmp = RestApiClient(remote, token, refresh_token, custom_headers,
                             self._requester, self._config,
-                            self._cached_capabilities)
+                            self._cached_capabilities, self._metadata_cache)
         return tmp
 
 
@@ -23,7 +24,7 @@ class RestApiClient(object):
     """
 
     def __init__(self, remote, token, refresh_token, custom_headers, requester,
-                 config, cached_capabilities):
+                 config, cached_capabilities, metadata_cache=None):
 
         # Set to instance
         self._token = token
@@ -37,6 +38,7 @@ class RestApiClient(object):
 
         # This dict is shared for all the instances of RestApiClient
         self._cached_capabilities = cached_capabilities
+        self._metadata_cache = metadata_cache
 
     def _capable(self, capability, user=None, password=None):
         capabilities = self._cached_capabilities.get(self._remote_url)
@@ -58,7 +60,12 @@ class RestApiClient(object):
         checksum_deploy = self._capable(CHECKSUM_DEPLOY)
         return RestV2Methods(self._remote_url, self._token, self._custom_headers,
                              self._requester, self._config, self._verify_ssl,
-                             checksum_deploy)
+                             checksum_deploy, self._metadata_cache)
+
+    def _invalidate_metadata(self):
+        """ the stored responses of this remote are outdated after modifying it """
+        if self._metadata_cache is not None:
+            self._metadata_cache.invalidate(self._remote_url)
 
     def get_recipe(self, ref, dest_folder):
         return self._get_api().get_recipe(ref, dest_folder)
@@ -66,14 +73,20 @@ class RestApiClient(object):
     def get_recipe_sources(self, ref, dest_folder):
         return self._get_api().get_recipe_sources(ref, dest_folder)
 
-    def get_package(self, pref, dest_folder):
-        return self._get_api().get_package(pref, dest_folder)
+    def get_package(self, pref, dest_folder, extract_folder=None):
+        return self._get_api().get_package(pref, dest_folder, extract_folder)
 
     def upload_recipe(self, ref, files_to_upload):
-        return self._get_api().upload_recipe(ref, files_to_upload)
+        try:
+            return self._get_api().upload_recipe(ref, files_to_upload)
+        finally:
+            self._invalidate_metadata()
 
     def upload_package(self, pref, files_to_upload):
-        return self._get_api().upload_package(pref, files_to_upload)
+        try:
+            return self._get_api().upload_package(pref, files_to_upload)
+        finally:
+            self._invalidate_metadata()
 
     def authenticate(self, user, password):
         api_v2 = RestV2Methods(self._remote_url, self._token, self._custom_headers,
@@ -107,13 +120,22 @@ class RestApiClient(object):
         return self._get_api().search_packages(reference)
 
     def remove_recipe(self, ref):
-        return self._get_api().remove_recipe(ref)
+        try:
+            return self._get_api().remove_recipe(ref)
+        finally:
+            self._invalidate_metadata()
 
     def remove_all_packages(self, ref):
-        return self._get_api().remove_all_packages(ref)
+        try:
+            return self._get_api().remove_all_packages(ref)
+        finally:
+            self._invalidate_metadata()
 
     def remove_packages(self, prefs):
-        return self._get_api().remove_packages(prefs)
+        try:
+            return self._get_api().remove_packages(prefs)
+        finally:
+            self._invalidate_metadata()
 
     def server_capabilities(self):
         return self._get_api().server_capabilities()
@@ -130,6 +152,12 @@ class RestApiClient(object):
     def get_latest_package_reference(self, pref, headers):
         return self._get_api().get_latest_package_reference(pref, headers=headers)
 
+    def get_latest_package_references(self, prefs):
+        """ None if the server can't return many package references in one request """
+        if not self._capable(PACKAGES_LATEST):
+            return None
+        return self._get_api().get_latest_package_references(prefs)
+
     def get_recipe_revision_reference(self, ref):
         return self._get_api().get_recipe_revision_reference(ref)
 
@@ -59,13 +59,15 @@ def handle_return_deserializer():
 
 class RestCommonMethods(object):
 
-    def __init__(self, remote_url, token, custom_headers, requester, config, verify_ssl):
+    def __init__(self, remote_url, token, custom_headers, requester, config, verify_ssl,
+                 metadata_cache=None):
         self.token = token
         self.remote_url = remote_url
         self.custom_headers = custom_headers
         self.requester = requester
         self._config = config
         self.verify_ssl = verify_ssl
+        self._metadata_cache = metadata_cache
 
     @property
     def auth(self):
@@ -180,10 +182,24 @@ class RestCommonMethods(object):
                                            stream=True,
                                            data=json.dumps(data))
         else:
+            cached = None
+            if self._metadata_cache is not None:
+                # The requester adds its own headers to the request ones
+                cache_key = self.remote_url, url, self.token, req_headers.copy()
+                cached = self._metadata_cache.get(*cache_key)
+            if cached is not None:
+                cached_data, etag, fresh = cached
+                if fresh:
+                    return cached_data
+                if etag:
+                    req_headers["If-None-Match"] = etag
             # logger.debug("REST: get: %s" % url)
             response = self.requester.get(url, auth=self.auth, headers=req_headers,
                                           verify=self.verify_ssl,
                                           stream=True)
+            if response.status_code == 304 and cached is not None:  # Not modified
+                self._metadata_cache.save(*cache_key, cached_data, etag)
+                return cached_data
 
         if response.status_code != 200:  # Error message is text
             response.charset = "utf-8"  # To be able to access ret.text (ret.content are bytes)
@@ -201,6 +217,8 @@ class RestCommonMethods(object):
             raise ConanException("Remote responded with broken json: %s" % content)
         if not isinstance(result, dict):
             raise ConanException("Unexpected server response %s" % result)
+        if not data and self._metadata_cache is not None:
+            self._metadata_cache.save(*cache_key, result, response.headers.get("ETag"))
         return result
 
     def upload_recipe(self, ref, files_to_upload):
@@ -4,24 +4,29 @@ import os
 from conan.api.output import ConanOutput
 
 from conans.client.downloaders.caching_file_downloader import ConanInternalCacheDownloader
+from conans.client.downloaders.file_downloader import FileDownloader
 from conans.client.rest.client_routes import ClientV2Router
 from conans.client.rest.file_uploader import FileUploader
 from conans.client.rest.rest_client_common import RestCommonMethods, get_exception_from_error
 from conans.errors import ConanException, NotFoundException, PackageNotFoundException, \
-    RecipeNotFoundException, AuthenticationException, ForbiddenException
+    RecipeNotFoundException, AuthenticationException, ForbiddenException, ConanConnectionError
 from conans.model.package_ref import PkgReference
-from conans.paths import EXPORT_SOURCES_TGZ_NAME
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, PACKAGE_TGZ_NAME
 from conans.util.dates import from_iso8601_to_timestamp
+from conans.util.files import rmdir
 from conans.util.thread import ExceptionThread
 
+# Package references per request, so the request body is never too large for the server
+LATEST_PACKAGES_CHUNK = 100
+
 
 class RestV2Methods(RestCommonMethods):
 
     def __init__(self, remote_url, token, custom_headers, requester, config, verify_ssl,
-                 checksum_deploy=False):
+                 checksum_deploy=False, metadata_cache=None):
 
         super(RestV2Methods, self).__init__(remote_url, token, custom_headers, requester,
-                                            config, verify_ssl)
+                                            config, verify_ssl, metadata_cache)
         self._checksum_deploy = checksum_deploy
 
     @property
@@ -65,7 +70,10 @@ class RestV2Methods(RestCommonMethods):
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
-    def get_package(self, pref, dest_folder):
+    def get_package(self, pref, dest_folder, extract_folder=None):
+        """ if ``extract_folder`` is defined, the conan_package.tgz is extracted there while it is
+        downloaded, and its returned path is None
+        """
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
         files = data["files"]
@@ -74,10 +82,38 @@ class RestV2Methods(RestCommonMethods):
         files = [f for f in files if any(f.startswith(m) for m in accepted_files)]
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.package_file(pref, fn) for fn in files}
+        # The download cache needs the file, it cannot be streamed
+        stream = (extract_folder is not None and PACKAGE_TGZ_NAME in files
+                  and not self._config.get("core.download:download_cache"))
+        if not stream:
+            self._download_and_save_files(urls, dest_folder, files)
+            ret = {fn: os.path.join(dest_folder, fn) for fn in files}
+            return ret
+
+        files = [f for f in files if f != PACKAGE_TGZ_NAME]
         self._download_and_save_files(urls, dest_folder, files)
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
+        ret[PACKAGE_TGZ_NAME] = self._download_and_extract(urls, dest_folder, extract_folder)
         return ret
 
+    def _download_and_extract(self, urls, dest_folder, extract_folder):
+        """ streams conan_package.tgz into the extract_folder, falling back to a regular download,
+        that can retry and resume, if the transfer is interrupted. Returns the path of the
+        downloaded file in that case, or None if it was already extracted
+        """
+        url = urls[PACKAGE_TGZ_NAME]
+        downloader = FileDownloader(self.requester)
+        try:
+            downloader.download_extract(url, extract_folder, verify_ssl=self.verify_ssl,
+                                        auth=self.auth)
+            return None
+        except ConanConnectionError as e:
+            ConanOutput().warning(f"Interrupted download of {PACKAGE_TGZ_NAME}, "
+                                  f"downloading it again: {e}")
+            rmdir(extract_folder)
+        self._download_and_save_files(urls, dest_folder, [PACKAGE_TGZ_NAME])
+        return os.path.join(dest_folder, PACKAGE_TGZ_NAME)
+
     @staticmethod
     def _is_dir(path, files):
         if path == ".":
@@ -286,6 +322,28 @@ class RestV2Methods(RestCommonMethods):
             raise PackageNotFoundException(pref)
         return remote_prefs
 
+    def get_latest_package_references(self, prefs):
+        """ {pref: latest_pref or None} for many package references without revision, in as
+        few requests as possible. ``prefs`` is {pref: headers}, with the package information
+        headers that get_latest_package_reference() would send for each one
+        """
+        url = self.router.packages_latest()
+        result = {}
+        prefs = list(prefs.items())
+        for i in range(0, len(prefs), LATEST_PACKAGES_CHUNK):
+            chunk = {pref.repr_notime(): (pref, headers)
+                     for pref, headers in prefs[i:i + LATEST_PACKAGES_CHUNK]}
+            references = {key: headers for key, (_, headers) in chunk.items()}
+            data = self.get_json(url, data={"references": references})["references"]
+            for key, (pref, _) in chunk.items():
+                item = data.get(key)
+                if item is None:
+                    result[pref] = None
+                else:
+                    result[pref] = PkgReference(pref.ref, pref.package_id, item.get("revision"),
+                                                from_iso8601_to_timestamp(item.get("time")))
+        return result
+
     def get_latest_package_reference(self, pref: PkgReference, headers):
         url = self.router.package_latest(pref)
         data = self.get_json(url, headers=headers)
@@ -1,10 +1,23 @@
 import sys
 
-from conan.cli.cli import main
-
 
 def run():
-    main(sys.argv[1:])
+    args = sys.argv[1:]
+    if not args or args[0] != "daemon":
+        # If there is a daemon for this Conan home, it runs the command faster. Only light
+        # modules are imported until checking it
+        from conans.client.daemon import run_in_daemon
+        from conans.paths import get_conan_user_home
+        try:
+            home = get_conan_user_home()
+        except Exception:  # Invalid home, the error is reported by the regular execution
+            home = None
+        exit_code = run_in_daemon(args, home) if home is not None else None
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from conan.cli.cli import main
+    main(args)
 
 
 if __name__ == '__main__':
@@ -8,11 +8,14 @@ def run():
     parser = argparse.ArgumentParser(description='Launch the server')
     parser.add_argument('--migrate', default=False, action='store_true',
                         help='Run the pending migrations')
+    parser.add_argument('--build-index', default=False, action='store_true',
+                        help='Build the metadata index from the existing storage files')
     parser.add_argument('--server_dir', '-d', default=None,
                         help='Specify where to store server config and data.')
     args = parser.parse_args()
     launcher = ServerLauncher(force_migration=args.migrate,
-                              server_dir=args.server_dir or get_env("CONAN_SERVER_HOME"))
+                              server_dir=args.server_dir or get_env("CONAN_SERVER_HOME"),
+                              build_index=args.build_index)
     launcher.launch()
 
 
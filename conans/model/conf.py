@@ -18,11 +18,20 @@ BUILT_IN_CONFS = {
     "core.version_ranges:resolve_prereleases": "Whether version ranges can resolve to pre-releases or not",
     "core.upload:retry": "Number of retries in case of failure when uploading to Conan server",
     "core.upload:retry_wait": "Seconds to wait between upload attempts to Conan server",
+    "core.upload:parallel": "Number of concurrent threads to compress and upload recipes and packages",
     "core.download:parallel": "Number of concurrent threads to download packages",
+    "core.build:parallel_jobs": "Number of packages that can be built from sources in parallel, in independent processes (not available in Windows)",
+    "core.build:sources_copy": "How the sources are copied to the build folders: 'copy' (default), 'reflink' (copy-on-write, if the filesystem supports it) or 'hardlink-readonly' (the source files are made read-only and shared)",
+    "core.build:sources_copy_threads": "Number of concurrent threads to copy the sources to the build folders (default=8)",
     "core.download:retry": "Number of retries in case of failure when downloading from Conan server",
     "core.download:retry_wait": "Seconds to wait between download attempts from Conan server",
     "core.download:download_cache": "Define path to a file download cache",
     "core.cache:storage_path": "Absolute path where the packages and database are stored",
+    "core.cache:hash_cache": "Store the hashes of the files of the recipes and packages in the cache, to check their integrity without reading again the files that didn't change",
+    "core.cache:check_integrity_parallel": "Number of recipes and packages checked concurrently by 'conan cache check-integrity' and 'conan upload --check' (default=4)",
+    "core.cache:deduplicate": "Store only once the identical files of the packages in the cache, as 'hardlink' (the package files are made read-only) or 'reflink' (copy-on-write, if the filesystem supports it)",
+    "core.graph:prefetch_recipes": "Number of concurrent threads to download in advance the recipes of the requirements while expanding the graph",
+    "core.graph:cache": "Reuse the version ranges and cached binaries resolved by a previous identical graph computation (same recipe, profiles, lockfile, remotes and cache contents)",
     # Sources backup
     "core.sources:download_cache": "Folder to store the sources backup",
     "core.sources:download_urls": "List of URLs to download backup sources from",
@@ -41,8 +50,11 @@ BUILT_IN_CONFS = {
     "core.net.http:cacert_path": "Path containing a custom Cacert file",
     "core.net.http:client_cert": "Path or tuple of files containing a client cert (and key)",
     "core.net.http:clean_system_proxy": "If defined, the proxies system env-vars will be discarded",
+    "core.net.http:remotes_parallel": "Number of remotes checked concurrently for recipes, versions and binaries with --update (8 by default, 1 to check them one after another)",
+    "core.net.http:metadata_cache_ttl": "Seconds the remotes query responses are reused without contacting the remotes while resolving graphs without --update (disabled by default, 0 to always revalidate them)",
     # Gzip compression
     "core.gzip:compresslevel": "The Gzip compresion level for Conan artifacts (default=9)",
+    "core.gzip:threads": "Number of threads to compress in parallel blocks every Conan artifact",
     # Tools
     "tools.android:ndk_path": "Argument for the CMAKE_ANDROID_NDK",
     "tools.android:cmake_legacy_toolchain": "Define to explicitly pass ANDROID_USE_LEGACY_TOOLCHAIN_FILE in CMake toolchain",
@@ -1,10 +1,58 @@
+import json
 import os
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
 from conans.util.dates import timestamp_now, timestamp_to_str
 from conans.util.files import load, md5, md5sum, save, gather_files
 
+HASH_THREADS = 8
+# The files modified this close to the hashing could be modified again without changing their
+# modification time (coarse filesystem timestamps), their hashes are not stored
+_RACY_MARGIN_NS = 2 * 10 ** 9
+
+
+class _HashesCache:
+    """ the md5 of the files of a folder, persisted in a json file and keyed by their stat
+    (inode, size, modification time), so the files that didn't change are not read again
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._start = time.time_ns()
+        try:
+            self._hashes = json.loads(load(path))
+        except (OSError, ValueError):
+            self._hashes = {}
+        self._updated = {}
+
+    @staticmethod
+    def _key(file_stat):
+        return [file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns]
+
+    def get(self, name, file_stat):
+        entry = self._hashes.get(name)
+        if entry is not None and entry[:-1] == self._key(file_stat):
+            self._updated[name] = entry
+            return entry[-1]
+
+    def set(self, name, file_stat, value):
+        if file_stat.st_mtime_ns < self._start - _RACY_MARGIN_NS:
+            self._updated[name] = self._key(file_stat) + [value]
+
+    def save(self):
+        """ only the hashes of the existing files are kept """
+        if self._updated == self._hashes:
+            return
+        tmp = "{}.{}.tmp".format(self._path, os.getpid())
+        try:
+            save(tmp, json.dumps(self._updated))
+            os.replace(tmp, self._path)
+        except OSError:  # A read-only cache, for example
+            pass
+
 
 class FileTreeManifest(object):
 
@@ -85,32 +133,51 @@ class FileTreeManifest(object):
                 output.info("%s %d '%s' %s%s" % (suffix, len(files), ext, file_or_files, files_str))
 
     @classmethod
-    def create(cls, folder, exports_sources_folder=None):
+    def create(cls, folder, exports_sources_folder=None, threads=HASH_THREADS, hashes_file=None):
         """ Walks a folder and create a FileTreeManifest for it, reading file contents
-        from disk, and capturing current time
+        from disk, and capturing current time. The files are hashed in parallel threads, and
+        if ``hashes_file`` is defined, the hashes of the files that didn't change since they were
+        stored there are not computed again
         """
         files, _ = gather_files(folder)
         # The folders symlinks are discarded for the manifest
         for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
             files.pop(f, None)
 
-        file_dict = {}
-        for name, filepath in files.items():
-            # For a symlink: md5 of the pointing path, no matter if broken, relative or absolute.
-            value = md5(os.readlink(filepath)) if os.path.islink(filepath) else md5sum(filepath)
-            file_dict[name] = value
-
         if exports_sources_folder:
             export_files, _ = gather_files(exports_sources_folder)
             # The folders symlinks are discarded for the manifest
-            for name, filepath in export_files.items():
-                # For a symlink: md5 of the pointing path, no matter if broken, relative or absolute.
-                value = md5(os.readlink(filepath)) if os.path.islink(filepath) else md5sum(filepath)
-                file_dict["export_source/%s" % name] = value
+            files.update(("export_source/%s" % name, filepath)
+                         for name, filepath in export_files.items())
+
+        hashes = _HashesCache(hashes_file) if hashes_file else None
+
+        def _hash(item):
+            name, filepath = item
+            # For a symlink: md5 of the pointing path, no matter if broken, relative or absolute.
+            if os.path.islink(filepath):
+                return md5(os.readlink(filepath))
+            if hashes is None:
+                return md5sum(filepath)
+            file_stat = os.stat(filepath)
+            value = hashes.get(name, file_stat)
+            if value is None:
+                value = md5sum(filepath)
+                hashes.set(name, file_stat, value)
+            return value
+
+        items = sorted(files.items())
+        if threads > 1 and len(items) > 1:
+            with ThreadPoolExecutor(threads, thread_name_prefix="conan_manifest") as pool:
+                values = list(pool.map(_hash, items))
+        else:
+            values = [_hash(item) for item in items]
+        if hashes is not None:
+            hashes.save()
 
         date = timestamp_now()
 
-        return cls(date, file_dict)
+        return cls(date, {name: value for (name, _), value in zip(items, values)})
 
     def __eq__(self, other):
         """ Two manifests are equal if file_sums
@@ -4,6 +4,7 @@ class RestRoutes(object):
     common_authenticate = "users/authenticate"
     oauth_authenticate = "users/token"
     common_check_credentials = "users/check_credentials"
+    common_packages_latest = "conans/packages/latest"
 
     def __init__(self):
         self.base = 'conans'
@@ -1,8 +1,20 @@
-import yaml
+from functools import lru_cache
 
 from conans.errors import ConanException
 
 
+@lru_cache(maxsize=8)
+def _parse_definition(text):
+    """ The parsed yaml definitions are shared by all the Settings loaded from the same text,
+    Settings doesn't modify nor keep its definition, it builds its own SettingsItem
+    """
+    import yaml  # Only needed to load the settings.yml, not imported for every command
+    try:
+        return yaml.safe_load(text) or {}
+    except (yaml.YAMLError, AttributeError) as ye:
+        raise ConanException("Invalid settings.yml format: {}".format(ye))
+
+
 def bad_value_msg(name, value, value_range):
     return ("Invalid setting '%s' is not a valid '%s' value.\nPossible values are %s\n"
             'Read "http://docs.conan.io/2/knowledge/faq.html#error-invalid-setting"'
@@ -241,10 +253,7 @@ class Settings(object):
 
     @staticmethod
     def loads(text):
-        try:
-            return Settings(yaml.safe_load(text) or {})
-        except (yaml.YAMLError, AttributeError) as ye:
-            raise ConanException("Invalid settings.yml format: {}".format(ye))
+        return Settings(_parse_definition(text))
 
     def validate(self):
         for child in self._data.values():
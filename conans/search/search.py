@@ -65,15 +65,32 @@ def _evaluate(prop_name, prop_value, binary_info):
         return compatible_prop(info_options.get(prop_name), prop_value)
 
 
+def _pattern_name(pattern):
+    """ The part of a search pattern that can be looked up in the cache DB name index:
+    returns (name, is_prefix), name being None if any name can match the pattern
+    """
+    wildcard = re.search(r"[*?\[]", pattern)
+    literal = pattern[:wildcard.start()] if wildcard else pattern
+    separator = re.search(r"[/@#]", literal)
+    if separator:  # the name is fully defined, it is before the first separator
+        return literal[:separator.start()], False
+    if not wildcard:  # pattern like "zlib" can only match the name token
+        return literal, False
+    return (literal, True) if literal else (None, False)
+
+
 def search_recipes(cache, pattern=None, ignorecase=True):
     # Conan references in main storage
+    name, name_prefix = None, False
     if pattern:
         if isinstance(pattern, RecipeReference):
             pattern = repr(pattern)
+        # The index lookup by name is case insensitive, the regex below does the exact match
+        name, name_prefix = _pattern_name(pattern)
         pattern = translate(pattern)
         pattern = re.compile(pattern, re.IGNORECASE) if ignorecase else re.compile(pattern)
 
-    refs = cache.all_refs()
+    refs = cache.all_refs(name, name_prefix)
     if pattern:
         _refs = []
         for r in refs:
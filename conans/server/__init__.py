@@ -1,5 +1,6 @@
-from conans import REVISIONS
+from conans import REVISIONS, CHECKSUM_DEPLOY, PACKAGES_LATEST
 
 COMPLEX_SEARCH_CAPABILITY = "complex_search"
 
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS]  # Server is always with revisions
+# Server is always with revisions, and with a content addressed storage for checksum deploys
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS, CHECKSUM_DEPLOY, PACKAGES_LATEST]
@@ -12,6 +12,8 @@ from conans.errors import ConanException
 from conans.paths import conan_expand_user
 from conans.server.conf.default_server_conf import default_server_conf
 from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.server.store.metadata_index import ServerMetadataIndex, build_metadata_index, \
+    remove_metadata_index, METADATA_INDEX_FILE
 from conans.server.store.server_store import ServerStore
 from conans.util.env import get_env
 from conans.util.files import mkdir, save, load
@@ -50,6 +52,8 @@ class ConanServerConfigParser(ConfigParser):
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
                            "custom_authorizer": get_env("CONAN_CUSTOM_AUTHORIZER", None, environment),
+                           "metadata_index": get_env("CONAN_SERVER_METADATA_INDEX", None,
+                                                     environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
 
@@ -168,6 +172,14 @@ class ConanServerConfigParser(ConfigParser):
         except ConanException:
             return None
 
+    @property
+    def metadata_index(self):
+        try:
+            metadata_index = self._get_conf_server_string("metadata_index").lower()
+            return metadata_index == "true" or metadata_index == "1"
+        except ConanException:
+            return False
+
     @property
     def users(self):
         def validate_pass_encoding(password):
@@ -224,7 +236,15 @@ class ConanServerConfigParser(ConfigParser):
         return timedelta(minutes=float(self._get_conf_server_string("jwt_expire_minutes")))
 
 
-def get_server_store(disk_storage_path, public_url):
+def get_server_store(disk_storage_path, public_url, metadata_index=False):
     disk_controller_url = "%s/%s" % (public_url, "files")
     adapter = ServerDiskAdapter(disk_controller_url, disk_storage_path)
-    return ServerStore(adapter)
+    index = None
+    if metadata_index:
+        index_path = os.path.join(disk_storage_path, METADATA_INDEX_FILE)
+        if not os.path.exists(index_path):  # First time enabled, index the existing storage
+            build_metadata_index(disk_storage_path)
+        index = ServerMetadataIndex(index_path)
+    else:
+        remove_metadata_index(disk_storage_path)
+    return ServerStore(adapter, index)
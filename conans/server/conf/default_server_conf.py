@@ -20,6 +20,12 @@ disk_storage_path: ./data
 disk_authorize_timeout: 1800
 updown_secret: {updown_secret}
 
+# Keep the revisions and the packages information in a SQLite index inside the storage, used
+# instead of the revisions.txt files for faster searches and revisions lookups. It is built from
+# the existing storage when enabled, and removed when disabled. "conan_server --build-index"
+# rebuilds it
+# metadata_index: True
+
 
 # Check docs.conan.io to implement a different authenticator plugin for conan_server
 # if custom_authenticator is not specified, [users] section will be used to authenticate
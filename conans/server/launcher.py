@@ -11,15 +11,17 @@ from conans.server.crypto.jwt.jwt_credentials_manager import JWTCredentialsManag
 from conans.server.migrate import migrate_and_get_server_config
 from conans.server.plugin_loader import load_authentication_plugin, load_authorization_plugin
 from conans.server.rest.server import ConanServer
+from conans.server.store.metadata_index import build_metadata_index
 
 from conans.server.service.authorize import BasicAuthorizer, BasicAuthenticator
 
 
 class ServerLauncher(object):
-    def __init__(self, force_migration=False, server_dir=None):
+    def __init__(self, force_migration=False, server_dir=None, build_index=False):
         if sys.version_info.major == 2:
             raise Exception("The conan_server needs Python>=3 for running")
         self.force_migration = force_migration
+        self.build_index = build_index
         if server_dir:
             user_folder = server_folder = server_dir
         else:
@@ -45,7 +47,12 @@ class ServerLauncher(object):
         credentials_manager = JWTCredentialsManager(server_config.jwt_secret,
                                                     server_config.jwt_expire_time)
 
-        server_store = get_server_store(server_config.disk_storage_path, server_config.public_url)
+        if build_index:
+            recipes, packages = build_metadata_index(server_config.disk_storage_path)
+            print("Metadata index built: %s recipe revisions, %s package revisions"
+                  % (recipes, packages))
+        server_store = get_server_store(server_config.disk_storage_path, server_config.public_url,
+                                        server_config.metadata_index)
 
         server_capabilities = SERVER_CAPABILITIES
         server_capabilities.append(REVISIONS)
@@ -53,7 +60,7 @@ class ServerLauncher(object):
         self.server = ConanServer(server_config.port, credentials_manager,
                                   authorizer, authenticator, server_store,
                                   server_capabilities)
-        if not self.force_migration:
+        if not self.force_migration and not self.build_index:
             print("***********************")
             print("Using config: %s" % server_config.config_filename)
             print("Storage: %s" % server_config.disk_storage_path)
@@ -62,5 +69,5 @@ class ServerLauncher(object):
             print("***********************")
 
     def launch(self):
-        if not self.force_migration:
+        if not self.force_migration and not self.build_index:
             self.server.run(host="0.0.0.0")
@@ -1,6 +1,8 @@
+import hashlib
+import json
 import traceback
 
-from bottle import HTTPResponse
+from bottle import HTTPResponse, request, response
 
 from conans.errors import ConanException
 
@@ -30,7 +32,10 @@ class ReturnHandlerPlugin(object):
                 for key, value in kwargs.items():
                     if isinstance(value, str):
                         kwargs[key] = value
-                return callback(*args, **kwargs)  # kwargs has :xxx variables from url
+                result = callback(*args, **kwargs)  # kwargs has :xxx variables from url
+                if isinstance(result, dict) and request.method == "GET":
+                    return _etag_response(result)
+                return result
             except HTTPResponse:
                 raise
             except ConanException as excep:
@@ -43,6 +48,18 @@ class ReturnHandlerPlugin(object):
         return wrapper
 
 
+def _etag_response(result):
+    """ The json responses have an ETag, so the clients that already have them can revalidate
+    them with If-None-Match, and receive a "304 Not Modified" without body if they didn't change
+    """
+    content = json.dumps(result, sort_keys=True).encode()
+    etag = '"{}"'.format(hashlib.sha1(content).hexdigest())
+    if request.headers.get("If-None-Match") == etag:
+        return HTTPResponse(status=304, headers={"ETag": etag})
+    response.set_header("ETag", etag)
+    return result
+
+
 def get_response_from_exception(excep, exception_mapping):
     status = exception_mapping.get(excep.__class__, None)
     if status is None:
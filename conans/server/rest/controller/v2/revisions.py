@@ -1,3 +1,6 @@
+from bottle import request
+
+from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
@@ -53,6 +56,18 @@ class RevisionsController(object):
             pref = conan_service.get_latest_package_reference(package_reference, auth_user)
             return _format_pref_return(pref)
 
+        @app.route(r.common_packages_latest, method="POST")
+        def get_latest_package_references(auth_user):
+            """ Gets a JSON with the latest revisions of the given package references that
+            exist, the missing ones are not returned. Every reference comes with the
+            information headers of the equivalent single package request
+            """
+            prefs = [PkgReference.loads(p) for p in request.json["references"]]
+            conan_service = ConanServiceV2(app.authorizer, app.server_store)
+            latest = conan_service.get_latest_package_references(prefs, auth_user)
+            return {"references": {pref.repr_notime(): _format_pref_return(latest_pref)
+                                   for pref, latest_pref in latest.items()}}
+
 
 def _format_rev_return(rev):
     # FIXME: fix this when RecipeReference
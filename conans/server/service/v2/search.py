@@ -6,7 +6,6 @@ from fnmatch import translate
 from conan.api.output import ConanOutput
 from conans.errors import NotFoundException, ForbiddenException, RecipeNotFoundException
 from conans.model.package_ref import PkgReference
-from conans.model.recipe_ref import RecipeReference
 from conans.paths import CONANINFO
 from conans.search.search import _partial_match
 from conans.server.utils.files import list_folder_subdirs
@@ -22,6 +21,10 @@ def _get_local_infos_min(server_store, ref, look_in_all_rrevs):
         new_ref = copy.copy(ref)
         if rrev:
             new_ref.revision = rrev.revision
+        if server_store.metadata_index is not None:
+            for package_id, content in server_store.metadata_index.package_infos(new_ref).items():
+                result.setdefault(package_id, {"content": content})
+            continue
         subdirs = list_folder_subdirs(server_store.packages(new_ref), level=1)
         for package_id in subdirs:
             if package_id in result:
@@ -83,29 +86,17 @@ class SearchService(object):
         return info
 
     def _search_recipes(self, pattern=None, ignorecase=True):
-        subdirs = list_folder_subdirs(basedir=self._server_store.store, level=5)
-
-        def underscore_to_none(field):
-            return field if field != "_" else None
+        refs = self._server_store.list_references()
 
         if not pattern:
-            ret = []
-            for folder in subdirs:
-                fields_dir = [underscore_to_none(d) for d in folder.split("/")]
-                r = RecipeReference(*fields_dir)
-                r.revision = None
-                ret.append(r)
-            return sorted(ret)
+            return sorted(refs)
         else:
             # Conan references in main storage
             pattern = str(pattern)
             b_pattern = translate(pattern)
             b_pattern = re.compile(b_pattern, re.IGNORECASE) if ignorecase else re.compile(b_pattern)
             ret = set()
-            for subdir in subdirs:
-                fields_dir = [underscore_to_none(d) for d in subdir.split("/")]
-                new_ref = RecipeReference(*fields_dir)
-                new_ref.revision = None
+            for new_ref in refs:
                 if _partial_match(b_pattern, repr(new_ref)):
                     ret.add(new_ref)
 
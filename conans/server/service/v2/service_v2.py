@@ -4,11 +4,10 @@ import os
 from bottle import FileUpload, static_file
 
 from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException
-from conans.paths import CONAN_MANIFEST
+from conans.paths import CONAN_MANIFEST, CONANINFO
 from conans.model.package_ref import PkgReference
 from conans.server.service.mime import get_mime_type
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
 
 
 class ConanServiceV2:
@@ -81,6 +80,18 @@ class ConanServiceV2:
             raise PackageNotFoundException(pref)
         return _pref
 
+    def get_latest_package_references(self, prefs, auth_user):
+        """ {pref: latest_pref} of the given package references (with recipe revision) that
+        exist in the server
+        """
+        result = {}
+        for pref in prefs:
+            self._authorizer.check_read_conan(auth_user, pref.ref)
+            latest = self._server_store.get_last_package_revision(pref)
+            if latest:
+                result[pref] = latest
+        return result
+
     # PACKAGE METHODS
     def get_package_file_list(self, pref, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
@@ -109,18 +120,21 @@ class ConanServiceV2:
         # If the upload was ok, of the manifest, update the pointer to the latest
         if filename == CONAN_MANIFEST:
             self._server_store.update_last_package_revision(pref)
+        elif filename == CONANINFO:
+            self._server_store.index_package_info(pref)
 
     # Misc
-    @staticmethod
-    def _upload_to_path(body, headers, path):
+    def _upload_to_path(self, body, headers, path):
+        if "X-Checksum-Deploy" in headers:
+            # The client only sends the checksum, the file can be deployed if it is already stored
+            sha1 = headers.get("X-Checksum-Sha1")
+            if not sha1 or not self._server_store.link_blob(sha1, path):
+                raise NotFoundException("Checksum not found in the storage")
+            return
         file_saver = FileUpload(body, None,
                                 filename=os.path.basename(path),
                                 headers=headers)
-        if os.path.exists(path):
-            os.unlink(path)
-        if not os.path.exists(os.path.dirname(path)):
-            mkdir(os.path.dirname(path))
-        file_saver.save(os.path.dirname(path))
+        self._server_store.store_file(path, file_saver.save)
 
     # REMOVE
     def remove_recipe(self, ref, auth_user):
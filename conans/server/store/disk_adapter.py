@@ -1,12 +1,31 @@
 import os
+import re
+import shutil
 
 import fasteners
 
 from conans.errors import NotFoundException
 from conans.util.env import no_op
-from conans.util.files import md5sum, rmdir
+from conans.util.files import md5sum, rmdir, sha1sum, mkdir
 from conans.server.utils.files import path_exists, relative_dirs
 
+BLOBS_FOLDER = ".blobs"  # Not a valid recipe name, it can't collide with the revisions folders
+
+
+def _link(src, dst):
+    """ atomically replaces dst with a hard link to src (or a copy if links are not supported)
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return  # Already linked, renaming a link over the same file would be a no-op
+    mkdir(os.path.dirname(dst))
+    tmp = dst + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
 
 
 class ServerDiskAdapter(object):
@@ -42,13 +61,79 @@ class ServerDiskAdapter(object):
         """Delete folder from disk. Path already contains base dir"""
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
+        blobs = self._referenced_blobs(os.path.join(path, f) for f in relative_dirs(path))
         rmdir(path)
+        self._remove_orphan_blobs(blobs)
 
     def delete_file(self, path):
         """Delete files from bucket. Path already contains base dir"""
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
+        blobs = self._referenced_blobs([path])
         os.remove(path)
+        self._remove_orphan_blobs(blobs)
+
+    # Content addressed storage of the files, by their sha1 checksum. The files in the revisions
+    # folders are hard links to the blobs, so identical files are stored only once
+    def _blob_path(self, sha1):
+        return os.path.join(self._store_folder, BLOBS_FOLDER, sha1[:2], sha1)
+
+    def store_file(self, path, save):
+        """ replaces the file at path with the one written by save(folder), and moves its contents
+        to the blobs storage, keeping path as a reference to it. The blob of the replaced file is
+        removed if no other file references it
+        """
+        blobs = self._referenced_blobs([path]) if os.path.isfile(path) else []
+        if os.path.exists(path):
+            os.unlink(path)
+        mkdir(os.path.dirname(path))
+        save(os.path.dirname(path))
+        self._store_blob(path)
+        self._remove_orphan_blobs(blobs)
+
+    def _store_blob(self, path):
+        """ keeps the file at path as a link to its blob, discarding its copy if the blob already
+        existed
+        """
+        blob = self._blob_path(sha1sum(path))
+        mkdir(os.path.dirname(blob))
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            _link(blob, path)
+        except OSError:
+            pass  # Hard links not supported by the file system, the file is not deduplicated
+
+    def link_blob(self, sha1, path):
+        """ creates (or replaces) the file at path as a reference to the blob with that sha1
+        checksum. Returns False if there is no such blob
+        """
+        sha1 = sha1.lower()
+        if not re.fullmatch("[0-9a-f]{40}", sha1):
+            return False
+        blob = self._blob_path(sha1)
+        if not os.path.isfile(blob):
+            return False
+        blobs = self._referenced_blobs([path]) if os.path.isfile(path) else []
+        _link(blob, path)
+        self._remove_orphan_blobs(blobs)
+        return True
+
+    def _referenced_blobs(self, paths):
+        """ the blobs that will be orphan if the files in paths are removed """
+        if not os.path.isdir(os.path.join(self._store_folder, BLOBS_FOLDER)):
+            return []
+        # The blob itself and this file are the only links, it is not worth checking others
+        return [self._blob_path(sha1sum(p)) for p in paths if os.stat(p).st_nlink == 2]
+
+    @staticmethod
+    def _remove_orphan_blobs(blobs):
+        for blob in blobs:
+            try:
+                if os.stat(blob).st_nlink == 1:
+                    os.remove(blob)
+            except FileNotFoundError:
+                pass
 
     def path_exists(self, path):
         return os.path.exists(path)
@@ -0,0 +1,288 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from conans.model.package_ref import PkgReference
+from conans.model.recipe_ref import RecipeReference
+from conans.paths import CONANINFO
+from conans.server.revision_list import RevisionList, _RevisionEntry
+from conans.server.store.server_store import REVISIONS_FILE, SERVER_PACKAGES_FOLDER, \
+    ref_dir_repr
+from conans.server.utils.files import list_folder_subdirs
+from conans.util.dates import revision_timestamp_now
+from conans.util.files import load
+
+METADATA_INDEX_FILE = ".metadata.sqlite3"  # In the storage root, not a valid recipe name
+# The server threads and processes wait for the other writers, instead of failing the request
+BUSY_TIMEOUT_SECONDS = 30
+
+_TABLES = ["""CREATE TABLE IF NOT EXISTS recipe_revisions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                reference TEXT NOT NULL,
+                name TEXT NOT NULL,
+                version TEXT NOT NULL,
+                user TEXT,
+                channel TEXT,
+                rrev TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                UNIQUE (reference, rrev))""",
+           """CREATE TABLE IF NOT EXISTS package_revisions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                reference TEXT NOT NULL,
+                rrev TEXT NOT NULL,
+                package_id TEXT NOT NULL,
+                prev TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                UNIQUE (reference, rrev, package_id, prev))""",
+           """CREATE TABLE IF NOT EXISTS package_infos (
+                reference TEXT NOT NULL,
+                rrev TEXT NOT NULL,
+                package_id TEXT NOT NULL,
+                prev TEXT NOT NULL,
+                content TEXT NOT NULL,
+                PRIMARY KEY (reference, rrev, package_id, prev))""",
+           """CREATE INDEX IF NOT EXISTS package_revisions_package_id
+                ON package_revisions (reference, rrev, package_id)"""]
+
+
+class _IndexConnections:
+    """ The sqlite3 connections to the index file, one per server thread and process. The
+    database uses WAL journaling, so the readers are never blocked, and the writers wait for each
+    other up to the busy timeout.
+    """
+
+    def __init__(self, filename, timeout=BUSY_TIMEOUT_SECONDS):
+        self._filename = filename
+        self._timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self._filename, isolation_level=None, timeout=self._timeout,
+                                   check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL;")
+            except sqlite3.OperationalError:
+                pass  # Not supported by the filesystem, keep the default
+            local.connection, local.pid = conn, os.getpid()
+        return local.connection
+
+    @contextmanager
+    def connection(self):
+        yield self._connection()
+
+    @contextmanager
+    def transaction(self):
+        """ the statements of the block in one write transaction, nested ones join the outermost
+        """
+        conn = self._connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            yield conn
+            conn.execute("COMMIT;")
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK;")
+
+    def close(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local = threading.local()
+
+
+class ServerMetadataIndex:
+    """ SQLite index of the recipes, recipe and package revisions, and the conaninfo.txt of the
+    packages of the server storage. When enabled (``metadata_index`` in server.conf), it is used
+    instead of reading the ``revisions.txt`` files, so revisions lookups don't need to lock and
+    parse files, and searches don't need to walk the storage nor read every conaninfo.txt. The
+    ``revisions.txt`` files are still written, so the index can be disabled at any time.
+
+    As with the revisions.txt files, the latest revision is the last one added, the ``id``
+    autoincrement column keeps that order. Every modification is a single transaction.
+    """
+
+    def __init__(self, filename):
+        self._db = _IndexConnections(filename)
+        with self._db.transaction() as conn:
+            for table in _TABLES:
+                conn.execute(table)
+        self._db.close()  # Every server thread opens its own connection when it is used
+
+    # Recipe revisions
+    def add_recipe_revision(self, ref, timestamp=None):
+        key = ref_dir_repr(ref)
+        with self._db.transaction() as conn:
+            latest = conn.execute("SELECT rrev FROM recipe_revisions WHERE reference=? "
+                                  "ORDER BY id DESC LIMIT 1", (key,)).fetchone()
+            if latest and latest[0] == ref.revision:
+                return  # Each uploaded file calls to update the revision
+            timestamp = timestamp or revision_timestamp_now()
+            # As in the storage folders, the server receives "_" for no user or channel
+            fields = [f if f != "_" else None for f in key.split("/")]
+            conn.execute("INSERT OR REPLACE INTO recipe_revisions (reference, name, version, "
+                         "user, channel, rrev, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (key, *fields, ref.revision, timestamp))
+
+    def recipe_revisions(self, ref):
+        """ the revisions of the reference, the latest first """
+        with self._db.connection() as conn:
+            rows = conn.execute("SELECT rrev, timestamp FROM recipe_revisions WHERE reference=? "
+                                "ORDER BY id DESC", (ref_dir_repr(ref),)).fetchall()
+        return [_RevisionEntry(rrev, timestamp) for rrev, timestamp in rows]
+
+    def recipe_revision_time(self, ref):
+        with self._db.connection() as conn:
+            row = conn.execute("SELECT timestamp FROM recipe_revisions WHERE reference=? AND "
+                               "rrev=?", (ref_dir_repr(ref), ref.revision)).fetchone()
+        return row[0] if row else None
+
+    def remove_recipe(self, ref):
+        """ removes the recipe revision, or all the revisions if ref has no revision, and all
+        their packages """
+        key = ref_dir_repr(ref)
+        condition, args = ("reference=? AND rrev=?", (key, ref.revision)) if ref.revision \
+            else ("reference=?", (key,))
+        with self._db.transaction() as conn:
+            for table in ("recipe_revisions", "package_revisions", "package_infos"):
+                conn.execute(f"DELETE FROM {table} WHERE {condition}", args)
+
+    def references(self):
+        """ all the references with some revision, without revision """
+        with self._db.connection() as conn:
+            rows = conn.execute("SELECT DISTINCT name, version, user, channel "
+                                "FROM recipe_revisions").fetchall()
+        return [RecipeReference(*row) for row in rows]
+
+    # Package revisions
+    def add_package_revision(self, pref, timestamp=None):
+        key = ref_dir_repr(pref.ref)
+        with self._db.transaction() as conn:
+            latest = conn.execute("SELECT prev FROM package_revisions WHERE reference=? AND "
+                                  "rrev=? AND package_id=? ORDER BY id DESC LIMIT 1",
+                                  (key, pref.ref.revision, pref.package_id)).fetchone()
+            if latest and latest[0] == pref.revision:
+                return
+            timestamp = timestamp or revision_timestamp_now()
+            conn.execute("INSERT OR REPLACE INTO package_revisions (reference, rrev, package_id, "
+                         "prev, timestamp) VALUES (?, ?, ?, ?, ?)",
+                         (key, pref.ref.revision, pref.package_id, pref.revision, timestamp))
+
+    def package_revisions(self, pref):
+        """ the revisions of the package, the latest first """
+        with self._db.connection() as conn:
+            rows = conn.execute("SELECT prev, timestamp FROM package_revisions WHERE reference=? "
+                                "AND rrev=? AND package_id=? ORDER BY id DESC",
+                                (ref_dir_repr(pref.ref), pref.ref.revision,
+                                 pref.package_id)).fetchall()
+        return [_RevisionEntry(prev, timestamp) for prev, timestamp in rows]
+
+    def package_revision_time(self, pref):
+        with self._db.connection() as conn:
+            row = conn.execute("SELECT timestamp FROM package_revisions WHERE reference=? AND "
+                               "rrev=? AND package_id=? AND prev=?",
+                               (ref_dir_repr(pref.ref), pref.ref.revision, pref.package_id,
+                                pref.revision)).fetchone()
+        return row[0] if row else None
+
+    def remove_packages(self, ref, package_ids=None):
+        """ removes all the revisions of the given package_ids (all of them if None) """
+        key = ref_dir_repr(ref)
+        with self._db.transaction() as conn:
+            for table in ("package_revisions", "package_infos"):
+                if package_ids is None:
+                    conn.execute(f"DELETE FROM {table} WHERE reference=? AND rrev=?",
+                                 (key, ref.revision))
+                else:
+                    for package_id in package_ids:
+                        conn.execute(f"DELETE FROM {table} WHERE reference=? AND rrev=? AND "
+                                     f"package_id=?", (key, ref.revision, package_id))
+
+    def remove_package_revision(self, pref):
+        args = (ref_dir_repr(pref.ref), pref.ref.revision, pref.package_id, pref.revision)
+        with self._db.transaction() as conn:
+            for table in ("package_revisions", "package_infos"):
+                conn.execute(f"DELETE FROM {table} WHERE reference=? AND rrev=? AND "
+                             f"package_id=? AND prev=?", args)
+
+    # Packages information
+    def set_package_info(self, pref, content):
+        """ the raw conaninfo.txt, the clients parse it to filter the packages """
+        with self._db.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO package_infos (reference, rrev, package_id, "
+                         "prev, content) VALUES (?, ?, ?, ?, ?)",
+                         (ref_dir_repr(pref.ref), pref.ref.revision, pref.package_id,
+                          pref.revision, content))
+
+    def package_infos(self, ref):
+        """ {package_id: conaninfo.txt contents} of the latest revision of every package of the
+        recipe revision """
+        with self._db.connection() as conn:
+            rows = conn.execute("SELECT p.package_id, i.content FROM package_revisions p "
+                                "JOIN package_infos i USING (reference, rrev, package_id, prev) "
+                                "WHERE p.reference=? AND p.rrev=? AND p.id = "
+                                "(SELECT MAX(id) FROM package_revisions WHERE "
+                                "reference=p.reference AND rrev=p.rrev AND "
+                                "package_id=p.package_id)",
+                                (ref_dir_repr(ref), ref.revision)).fetchall()
+        return dict(rows)
+
+    def clear(self):
+        with self._db.transaction() as conn:
+            for table in ("recipe_revisions", "package_revisions", "package_infos"):
+                conn.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        self._db.close()
+
+
+def _load_revisions(revisions_file):
+    """ the revisions in a revisions.txt file, the oldest first """
+    if not os.path.isfile(revisions_file):
+        return []
+    return list(reversed(RevisionList.loads(load(revisions_file)).as_list()))
+
+
+def build_metadata_index(store_folder):
+    """ (re)builds the metadata index from the revisions.txt and conaninfo.txt files of an
+    existing storage. Returns the number of indexed recipe and package revisions
+    """
+    index = ServerMetadataIndex(os.path.join(store_folder, METADATA_INDEX_FILE))
+    recipes = packages = 0
+    # One single transaction, the index is not visible until it is complete
+    with index._db.transaction():
+        index.clear()
+        for folder in list_folder_subdirs(store_folder, level=4):
+            fields = [f if f != "_" else None for f in folder.split("/")]
+            ref_folder = os.path.join(store_folder, *folder.split("/"))
+            for rrev in _load_revisions(os.path.join(ref_folder, REVISIONS_FILE)):
+                ref = RecipeReference(*fields, revision=rrev.revision)
+                index.add_recipe_revision(ref, rrev.time)
+                recipes += 1
+                packages_folder = os.path.join(ref_folder, rrev.revision, SERVER_PACKAGES_FOLDER)
+                for package_id in list_folder_subdirs(packages_folder, level=1):
+                    package_folder = os.path.join(packages_folder, package_id)
+                    for prev in _load_revisions(os.path.join(package_folder, REVISIONS_FILE)):
+                        pref = PkgReference(ref, package_id, prev.revision)
+                        index.add_package_revision(pref, prev.time)
+                        packages += 1
+                        info_path = os.path.join(package_folder, prev.revision, CONANINFO)
+                        if os.path.isfile(info_path):
+                            index.set_package_info(pref, load(info_path))
+    index.close()
+    return recipes, packages
+
+
+def remove_metadata_index(store_folder):
+    """ The revisions uploaded while the index is disabled are not in it, it would be stale if
+    enabled again, so it is removed, and built again from the storage files the next time
+    """
+    index_path = os.path.join(store_folder, METADATA_INDEX_FILE)
+    for path in (index_path, index_path + "-wal", index_path + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
@@ -2,10 +2,12 @@ import os
 from os.path import join, normpath, relpath
 
 from conans.errors import ConanException, PackageNotFoundException, RecipeNotFoundException
-from conans.paths import CONAN_MANIFEST
+from conans.paths import CONAN_MANIFEST, CONANINFO
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.server.revision_list import RevisionList
+from conans.server.utils.files import list_folder_subdirs
+from conans.util.files import load
 
 REVISIONS_FILE = "revisions.txt"
 SERVER_EXPORT_FOLDER = "export"
@@ -18,9 +20,12 @@ def ref_dir_repr(ref):
 
 class ServerStore(object):
 
-    def __init__(self, storage_adapter):
+    def __init__(self, storage_adapter, metadata_index=None):
         self._storage_adapter = storage_adapter
         self._store_folder = storage_adapter._store_folder
+        # Optional ServerMetadataIndex, a cache of the revisions.txt files (that are always
+        # written, so the index can be disabled) used for the lookups and searches
+        self.metadata_index = metadata_index
 
     @property
     def store(self):
@@ -67,6 +72,29 @@ class ServerStore(object):
     def path_exists(self, path):
         return self._storage_adapter.path_exists(path)
 
+    def store_file(self, path, save):
+        self._storage_adapter.store_file(path, save)
+
+    def link_blob(self, sha1, path):
+        return self._storage_adapter.link_blob(sha1, path)
+
+    def index_package_info(self, pref):
+        """ keeps the just uploaded conaninfo.txt of the package in the metadata index """
+        if self.metadata_index is not None:
+            content = load(self.get_package_file_path(pref, CONANINFO))
+            self.metadata_index.set_package_info(pref, content)
+
+    def list_references(self):
+        """ all the references in the store, without revision """
+        if self.metadata_index is not None:
+            return self.metadata_index.references()
+        ret = []
+        # name/version/user/channel/rrev, the revision folder is checked to exist
+        for folder in list_folder_subdirs(basedir=self.store, level=5):
+            fields = [d if d != "_" else None for d in folder.split("/")]
+            ret.append(RecipeReference(*fields[:4]))
+        return ret
+
     # ############ ONLY FILE LIST SNAPSHOTS (APIv2)
     def get_recipe_file_list(self, ref):
         """Returns a  [filepath] """
@@ -111,6 +139,8 @@ class ServerStore(object):
         assert isinstance(ref, RecipeReference)
         if not ref.revision:
             self._storage_adapter.delete_folder(self.conan_revisions_root(ref))
+            if self.metadata_index is not None:
+                self.metadata_index.remove_recipe(ref)
         else:
             self._storage_adapter.delete_folder(self.base_folder(ref))
             self._remove_revision_from_index(ref)
@@ -129,6 +159,8 @@ class ServerStore(object):
                 # Remove all package revisions
                 package_folder = self.package_revisions_root(pref)
                 self._storage_adapter.delete_folder(package_folder)
+        if self.metadata_index is not None:
+            self.metadata_index.remove_packages(ref, package_ids_filter or None)
         self._delete_empty_dirs(ref)
 
     def remove_package(self, pref):
@@ -144,6 +176,8 @@ class ServerStore(object):
         assert isinstance(ref, RecipeReference)
         packages_folder = self.packages(ref)
         self._storage_adapter.delete_folder(packages_folder)
+        if self.metadata_index is not None:
+            self.metadata_index.remove_packages(ref)
 
     def remove_package_files(self, pref, files):
         subpath = self.package(pref)
@@ -190,6 +224,9 @@ class ServerStore(object):
     # Methods to manage revisions
     def get_last_revision(self, ref):
         assert(isinstance(ref, RecipeReference))
+        if self.metadata_index is not None:
+            revs = self.metadata_index.recipe_revisions(ref)
+            return revs[0] if revs else None
         rev_file_path = self._recipe_revisions_file(ref)
         return self._get_latest_revision(rev_file_path)
 
@@ -199,16 +236,23 @@ class ServerStore(object):
             tmp = RevisionList()
             tmp.add_revision(ref.revision)
             return tmp.as_list()
-        rev_file_path = self._recipe_revisions_file(ref)
-        revs = self._get_revisions_list(rev_file_path).as_list()
+        if self.metadata_index is not None:
+            revs = self.metadata_index.recipe_revisions(ref)
+        else:
+            rev_file_path = self._recipe_revisions_file(ref)
+            revs = self._get_revisions_list(rev_file_path).as_list()
         if not revs:
             raise RecipeNotFoundException(ref)
         return revs
 
     def get_last_package_revision(self, pref):
         assert(isinstance(pref, PkgReference))
-        rev_file_path = self._package_revisions_file(pref)
-        rev = self._get_latest_revision(rev_file_path)
+        if self.metadata_index is not None:
+            revs = self.metadata_index.package_revisions(pref)
+            rev = revs[0] if revs else None
+        else:
+            rev_file_path = self._package_revisions_file(pref)
+            rev = self._get_latest_revision(rev_file_path)
         if rev:
             return PkgReference(pref.ref, pref.package_id, rev.revision, rev.time)
         return None
@@ -216,12 +260,16 @@ class ServerStore(object):
     def update_last_revision(self, ref):
         assert(isinstance(ref, RecipeReference))
         rev_file_path = self._recipe_revisions_file(ref)
-        self._update_last_revision(rev_file_path, ref)
+        rev_list = self._update_last_revision(rev_file_path, ref)
+        if self.metadata_index is not None:
+            self.metadata_index.add_recipe_revision(ref, rev_list.get_time(ref.revision))
 
     def update_last_package_revision(self, pref):
         assert(isinstance(pref, PkgReference))
         rev_file_path = self._package_revisions_file(pref)
-        self._update_last_revision(rev_file_path, pref)
+        rev_list = self._update_last_revision(rev_file_path, pref)
+        if self.metadata_index is not None:
+            self.metadata_index.add_package_revision(pref, rev_list.get_time(pref.revision))
 
     def _update_last_revision(self, rev_file_path, ref):
         if self._storage_adapter.path_exists(rev_file_path):
@@ -235,6 +283,7 @@ class ServerStore(object):
         rev_list.add_revision(ref.revision)
         self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
                                          lock_file=rev_file_path + ".lock")
+        return rev_list
 
     def get_package_revisions_references(self, pref):
         """Returns a RevisionList"""
@@ -246,8 +295,11 @@ class ServerStore(object):
             return [PkgReference(pref.ref, pref.package_id, rev.revision, rev.time)
                     for rev in tmp.as_list()]
 
-        tmp = self._package_revisions_file(pref)
-        ret = self._get_revisions_list(tmp).as_list()
+        if self.metadata_index is not None:
+            ret = self.metadata_index.package_revisions(pref)
+        else:
+            tmp = self._package_revisions_file(pref)
+            ret = self._get_revisions_list(tmp).as_list()
         if not ret:
             raise PackageNotFoundException(pref)
         return [PkgReference(pref.ref, pref.package_id, rev.revision, rev.time) for rev in ret]
@@ -278,6 +330,8 @@ class ServerStore(object):
         return join(p_folder, REVISIONS_FILE)
 
     def get_revision_time(self, ref):
+        if self.metadata_index is not None:
+            return self.metadata_index.recipe_revision_time(ref)
         try:
             rev_list = self._load_revision_list(ref)
         except IOError:
@@ -285,6 +339,8 @@ class ServerStore(object):
         return rev_list.get_time(ref.revision)
 
     def get_package_revision_time(self, pref):
+        if self.metadata_index is not None:
+            return self.metadata_index.package_revision_time(pref)
         try:
             rev_list = self._load_package_revision_list(pref)
         except (IOError, OSError):
@@ -296,11 +352,15 @@ class ServerStore(object):
         rev_list = self._load_revision_list(ref)
         rev_list.remove_revision(ref.revision)
         self._save_revision_list(rev_list, ref)
+        if self.metadata_index is not None:
+            self.metadata_index.remove_recipe(ref)
 
     def _remove_package_revision_from_index(self, pref):
         rev_list = self._load_package_revision_list(pref)
         rev_list.remove_revision(pref.revision)
         self._save_package_revision_list(rev_list, pref)
+        if self.metadata_index is not None:
+            self.metadata_index.remove_package_revision(pref)
 
     def _load_revision_list(self, ref):
         path = self._recipe_revisions_file(ref)
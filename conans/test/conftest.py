@@ -337,6 +337,9 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "tool(name, version): mark test to require a tool by name"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: performance measurement, only run with '-m benchmark'"
+    )
 
 
 def pytest_runtest_teardown(item):
@@ -346,6 +349,10 @@ def pytest_runtest_teardown(item):
 
 
 def pytest_runtest_setup(item):
+    if item.get_closest_marker("benchmark") and \
+            "benchmark" not in (item.config.getoption("markexpr") or ""):
+        pytest.skip("Benchmark, run it with '-m benchmark'")
+
     tools_paths = []
     tools_env_vars = dict()
     for mark in item.iter_markers():
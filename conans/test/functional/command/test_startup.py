@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from conans.test.utils.test_files import temp_folder
+from conans.util.env import environment_update
+
+# Runs the "conan" entry point, and reports the heavy modules it imported
+_CONAN = textwrap.dedent("""
+    import json, sys
+    from conans.conan import run
+    sys.argv[0] = "conan"
+    try:
+        run()
+    finally:
+        heavy = ("jinja2", "yaml", "requests", "conan.tools.cmake", "conan.tools.microsoft",
+                 "conan.tools.google")
+        modules = [m for m in sys.modules if m in heavy or m.startswith("conan.cli.commands.")]
+        sys.stderr.write("\\nMODULES: " + json.dumps(sorted(modules)) + "\\n")
+    """)
+
+
+def _conan(*args):
+    """ the heavy modules imported by the command """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))))
+    env = {"PYTHONPATH": os.pathsep.join([root, os.environ.get("PYTHONPATH", "")])}
+    with environment_update(env):
+        result = subprocess.run([sys.executable, "-c", _CONAN] + list(args), check=True,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr = result.stderr.decode()
+    return json.loads(stderr[stderr.index("MODULES: ") + len("MODULES: "):])
+
+
+def test_startup_imports():
+    """ "conan --version" must not need the Conan API, and a command only imports its own
+    module, not the other commands, nor the heavy dependencies it doesn't need
+    """
+    with environment_update({"CONAN_HOME": temp_folder()}):
+        assert _conan("--version") == []
+        _conan("list", "*")  # The first run initializes the home and the commands manifest
+        modules = _conan("list", "*")
+        assert "conan.cli.commands.list" in modules
+        assert not [m for m in modules if m.startswith("conan.cli.commands.") and
+                    m != "conan.cli.commands.list"]
+        for heavy in ("jinja2", "yaml", "conan.tools.cmake"):
+            assert heavy not in modules
+
+
+@pytest.mark.benchmark
+def test_startup_benchmark():
+    """ wall time of "conan --version" and "conan list", the best of several runs, to track
+    startup regressions. Run with "-m benchmark -s" to see the timings
+    """
+    with environment_update({"CONAN_HOME": temp_folder()}):
+        _conan("list", "*")  # The first run initializes the home and the commands manifest
+        timings = {}
+        for command in (["--version"], ["list", "*"]):
+            best = None
+            for _ in range(5):
+                start = time.time()
+                _conan(*command)
+                elapsed = time.time() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[" ".join(command)] = best
+    print(", ".join("conan {}: {:.3f}s".format(c, t) for c, t in timings.items()))
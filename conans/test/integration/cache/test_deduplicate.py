@@ -0,0 +1,122 @@
+import os
+import re
+import stat
+import textwrap
+
+from conan.internal.cache.dedup import OBJECTS_FOLDER
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient
+from conans.util.files import load, save
+
+
+def _client(mode):
+    c = TestClient(default_server_user=True)
+    c.save_home({"global.conf": f"core.cache:deduplicate={mode}"})
+    conanfile = textwrap.dedent("""
+        import os
+        from conan import ConanFile
+        from conan.tools.files import save
+
+        class Pkg(ConanFile):
+            name = "pkg"
+            version = "0.1"
+            settings = "build_type"
+
+            def package(self):
+                save(self, os.path.join(self.package_folder, "include", "pkg.h"), "header" * 100)
+                save(self, os.path.join(self.package_folder, "lib", "pkg.lib"),
+                     str(self.settings.build_type))
+        """)
+    c.save({"conanfile.py": conanfile})
+    c.run("create . -s build_type=Release")
+    c.run("create . -s build_type=Debug")
+    return c
+
+
+def _files(c, name):
+    folders = []
+    for build_type in ("Release", "Debug"):
+        c.run(f"install --requires=pkg/0.1 -s build_type={build_type}")
+        package_id = re.search(r"pkg/0.1#\w+:(\w+)#\w+ - Cache", c.out).group(1)
+        c.run(f"cache path pkg/0.1:{package_id}")
+        folders.append(c.stdout.strip())
+    return [os.path.join(f, name) for f in folders]
+
+
+def _objects(c):
+    folder = os.path.join(c.cache.store, OBJECTS_FOLDER)
+    return [f for d in os.listdir(folder) for f in os.listdir(os.path.join(folder, d))]
+
+
+def test_deduplicate_hardlink():
+    c = _client("hardlink")
+    release, debug = _files(c, "include/pkg.h")
+    assert os.path.samefile(release, debug)
+    assert load(release) == "header" * 100
+    # The shared files can't be modified
+    assert not os.stat(release).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+    release, debug = _files(c, "lib/pkg.lib")
+    assert not os.path.samefile(release, debug)
+    assert load(release) == "Release" and load(debug) == "Debug"
+
+    # The downloaded packages are deduplicated too
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    c.run("install --requires=pkg/0.1 -s build_type=Release")
+    c.run("install --requires=pkg/0.1 -s build_type=Debug")
+    release, debug = _files(c, "include/pkg.h")
+    assert os.path.samefile(release, debug)
+
+    # The objects of the removed packages are removed by "cache clean"
+    c.run("cache clean")
+    assert len(_objects(c)) == 5  # header, 2 libs, 2 conaninfo.txt
+    c.run("remove pkg/0.1:* -c")
+    c.run("cache clean")
+    assert _objects(c) == []
+
+
+def test_deduplicate_corrupted_object():
+    """ an object with the wrong contents is never linked, it is discarded """
+    c = _client("hardlink")
+    release, _ = _files(c, "include/pkg.h")
+    folder = os.path.join(c.cache.store, OBJECTS_FOLDER)
+    obj = next(os.path.join(folder, d, f) for d in os.listdir(folder)
+               for f in os.listdir(os.path.join(folder, d))
+               if os.path.samefile(os.path.join(folder, d, f), release))
+    os.remove(obj)
+    save(obj, "HEADER" * 100)  # Same size, different contents
+
+    c.run("create . -s build_type=Debug")
+    _, debug = _files(c, "include/pkg.h")
+    assert load(debug) == "header" * 100
+    assert not os.path.exists(obj) or load(obj) == "header" * 100
+
+
+def test_deduplicate_reflink():
+    # It works even if the filesystem doesn't support reflinks
+    c = _client("reflink")
+    release, debug = _files(c, "include/pkg.h")
+    assert load(release) == load(debug) == "header" * 100
+    release, debug = _files(c, "lib/pkg.lib")
+    assert load(release) == "Release" and load(debug) == "Debug"
+
+    # The files of the download cache are cloned too
+    download_cache = temp_folder()
+    c.save_home({"global.conf": "core.cache:deduplicate=reflink\n"
+                                f"core.download:download_cache={download_cache}"})
+    c.run("upload * -r=default -c")
+    for _ in range(2):
+        c.run("remove * -c")
+        c.run("install --requires=pkg/0.1 -s build_type=Release")
+        c.run("install --requires=pkg/0.1 -s build_type=Debug")
+    release, debug = _files(c, "include/pkg.h")
+    assert load(release) == load(debug) == "header" * 100
+
+
+def test_deduplicate_error():
+    c = TestClient()
+    c.save_home({"global.conf": "core.cache:deduplicate=symlink"})
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+    c.run("create .", assert_error=True)
+    assert "Unknown value 'symlink' for 'core.cache:deduplicate'" in c.out
@@ -0,0 +1,55 @@
+import os
+import stat
+import textwrap
+
+import pytest
+
+from conans.test.utils.tools import TestClient
+from conans.util.files import load
+
+
+conanfile = textwrap.dedent("""
+    import os
+    from conan import ConanFile
+    from conan.tools.files import save, load
+
+    class Pkg(ConanFile):
+        name = "pkg"
+        version = "0.1"
+        settings = "build_type"
+
+        def source(self):
+            save(self, "main.cpp", "int main() {}")
+
+        def build(self):
+            self.output.info("BUILD: {}".format(load(self, "main.cpp")))
+        """)
+
+
+@pytest.mark.parametrize("strategy", ["copy", "reflink", "hardlink-readonly"])
+def test_sources_copy(strategy):
+    c = TestClient()
+    c.save_home({"global.conf": f"core.build:sources_copy={strategy}"})
+    c.save({"conanfile.py": conanfile})
+    c.run("create . -s build_type=Release")
+    assert "BUILD: int main() {}" in c.out
+    c.run("create . -s build_type=Debug")
+    assert "BUILD: int main() {}" in c.out
+
+    pref = c.created_package_reference("pkg/0.1")
+    source = os.path.join(c.get_latest_ref_layout(pref.ref).source(), "main.cpp")
+    build = os.path.join(c.get_latest_pkg_layout(pref).build(), "main.cpp")
+    assert load(build) == "int main() {}"
+    if strategy == "hardlink-readonly":
+        assert os.path.samefile(source, build)
+        assert not os.stat(build).st_mode & stat.S_IWUSR
+    else:
+        assert not os.path.samefile(source, build)
+
+
+def test_sources_copy_error():
+    c = TestClient()
+    c.save_home({"global.conf": "core.build:sources_copy=overlay"})
+    c.save({"conanfile.py": conanfile})
+    c.run("create .", assert_error=True)
+    assert "Unknown value 'overlay' for 'core.build:sources_copy'" in c.out
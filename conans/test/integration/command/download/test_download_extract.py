@@ -0,0 +1,59 @@
+import os
+
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestRequester
+
+
+def _upload_package(client):
+    client.save({"conanfile.py": GenConanfile("pkg", "0.1").with_package_file("include/hdr.h",
+                                                                              "header!!")})
+    client.run("create .")
+    client.run("upload * -c -r=default")
+    client.run("remove * -c")
+
+
+def test_download_extract_stream():
+    c = TestClient(default_server_user=True)
+    _upload_package(c)
+    c.run("install --requires=pkg/0.1")
+    # The conan_package.tgz is extracted while downloading, not saved to disk first
+    assert "Decompressing conan_package.tgz" not in c.out
+    c.run("cache path pkg/0.1:da39a3ee5e6b4b0d3255bfef95601890afd80709")
+    package_folder = c.out.strip()
+    assert c.load(os.path.join(package_folder, "include", "hdr.h")) == "header!!"
+    assert os.path.isfile(os.path.join(package_folder, "conaninfo.txt"))
+    assert os.path.isfile(os.path.join(package_folder, "conanmanifest.txt"))
+
+
+class _InterruptedRequester(TestRequester):
+    """ the first download of the conan_package.tgz is truncated """
+    interrupted = False
+
+    def get(self, url, **kwargs):
+        response = super(_InterruptedRequester, self).get(url, **kwargs)
+        if url.endswith("conan_package.tgz") and not _InterruptedRequester.interrupted:
+            _InterruptedRequester.interrupted = True
+            content = response.content
+            response.iter_content = lambda chunk_size=1: [content[:len(content) // 2]]
+        return response
+
+
+def test_download_extract_interrupted():
+    c = TestClient(default_server_user=True, requester_class=_InterruptedRequester)
+    _upload_package(c)
+    c.run("install --requires=pkg/0.1")
+    assert "WARN: Interrupted download of conan_package.tgz, downloading it again" in c.out
+    assert "Decompressing conan_package.tgz" in c.out
+    c.run("cache path pkg/0.1:da39a3ee5e6b4b0d3255bfef95601890afd80709")
+    package_folder = c.out.strip()
+    assert c.load(os.path.join(package_folder, "include", "hdr.h")) == "header!!"
+
+
+def test_download_extract_download_cache():
+    # The download cache needs the file, so it is not streamed
+    c = TestClient(default_server_user=True)
+    _upload_package(c)
+    download_cache = os.path.join(c.current_folder, "download_cache")
+    c.save_home({"global.conf": f"core.download:download_cache={download_cache}"})
+    c.run("install --requires=pkg/0.1")
+    assert "Decompressing conan_package.tgz" in c.out
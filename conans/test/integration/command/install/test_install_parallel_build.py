@@ -0,0 +1,91 @@
+import os
+import textwrap
+
+import pytest
+
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Parallel builds require fork()")
+def test_parallel_build():
+    c = TestClient()
+    c.save_home({"global.conf": "core.build:parallel_jobs=3"})
+    dep = textwrap.dedent("""
+        import os
+        from conan import ConanFile
+        from conan.tools.files import save
+
+        class Pkg(ConanFile):
+            version = "0.1"
+
+            def build(self):
+                self.output.info(f"Building in {os.getcwd()}")
+                self.run("echo RUNNING-{}".format(self.name))
+
+            def package(self):
+                save(self, os.path.join(self.package_folder, "data.txt"), self.name)
+
+            def package_info(self):
+                self.cpp_info.defines = [self.name.upper()]
+        """)
+    app = textwrap.dedent("""
+        from conan import ConanFile
+
+        class Pkg(ConanFile):
+            version = "0.1"
+            requires = "liba/0.1", "libb/0.1", "libc/0.1"
+
+            def generate(self):
+                for r, d in self.dependencies.items():
+                    self.output.info(f"DEP {d.ref}: {d.cpp_info.defines}")
+        """)
+    c.save({"dep/conanfile.py": dep,
+            "app/conanfile.py": app})
+    for name in ("liba", "libb", "libc"):
+        c.run(f"export dep --name={name}")
+    c.run("export app --name=app")
+    c.run("install --requires=app/0.1 --build=missing")
+    assert "Building packages in 3 parallel jobs" in c.out
+    for name in ("liba", "libb", "libc", "app"):
+        assert f"{name}/0.1: Building in a parallel job" in c.out
+        assert f"{name}/0.1: Package '" in c.out
+    for name in ("liba", "libb", "libc"):
+        assert f"RUNNING-{name}" in c.out
+        # The output of the job is buffered and displayed in one block
+        job_output = c.out.split(f"Installing package {name}/0.1")[1]
+        assert f"{name}/0.1: Building in" in job_output.split("Installing package")[0]
+        # The package_info() of the built dependencies is available for the consumers
+        assert f"app/0.1: DEP {name}/0.1: ['{name.upper()}']" in c.out
+
+    c.run("install --requires=app/0.1")
+    assert "Building in a parallel job" not in c.out
+    assert "app/0.1: Already installed!" in c.out
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Parallel builds require fork()")
+def test_parallel_build_error():
+    c = TestClient()
+    c.save_home({"global.conf": "core.build:parallel_jobs=2"})
+    fail = textwrap.dedent("""
+        from conan import ConanFile
+
+        class Pkg(ConanFile):
+            name = "libb"
+            version = "0.1"
+
+            def build(self):
+                raise Exception("Build broken")
+        """)
+    c.save({"dep/conanfile.py": GenConanfile("liba", "0.1"),
+            "fail/conanfile.py": fail,
+            "app/conanfile.py": GenConanfile("app", "0.1").with_requires("liba/0.1", "libb/0.1")})
+    c.run("export dep")
+    c.run("export fail")
+    c.run("export app")
+    c.run("install --requires=app/0.1 --build=missing", assert_error=True)
+    assert "libb/0.1: Error in build() method" in c.out
+    assert "Build broken" in c.out
+    # The independent one finished, but the consumer was never launched
+    assert "liba/0.1: Package '" in c.out
+    assert "Installing package app/0.1" not in c.out
@@ -0,0 +1,108 @@
+import os
+import stat
+import time
+from unittest.mock import patch
+
+import pytest
+
+from conan.api.conan_api import ConanAPI
+from conan.cli.daemon import ConanDaemon
+from conans.client.migrations import ClientMigrator
+from conans.client.daemon import daemon_supported, daemon_running, run_in_daemon, stop_daemon
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load
+
+
+@pytest.mark.skipif(not daemon_supported() or not hasattr(os, "fork"),
+                    reason="The daemon requires Unix domain sockets")
+def test_daemon(capfd):
+    home = temp_folder(path_with_spaces=False)
+    work = temp_folder()
+    assert run_in_daemon(["list", "*"], home) is None  # No daemon, the command runs locally
+
+    # The daemon creates the ConanAPI (and migrates the home) only when the home changes
+    migrations = os.path.join(temp_folder(), "migrations.txt")
+    migrate = ClientMigrator.migrate
+
+    def count_migrations(migrator):
+        save(migrations, load(migrations) + "." if os.path.exists(migrations) else ".")
+        migrate(migrator)
+
+    # and it only loads again its configuration when the environment variables it reads change
+    reinits = os.path.join(temp_folder(), "reinits.txt")
+    reinit = ConanAPI.reinit
+
+    def count_reinits(conan_api):
+        save(reinits, load(reinits) + "." if os.path.exists(reinits) else ".")
+        reinit(conan_api)
+
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            with patch.object(ClientMigrator, "migrate", count_migrations), \
+                    patch.object(ConanAPI, "reinit", count_reinits):
+                ConanDaemon(ConanAPI(home)).serve()
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+    try:
+        for _ in range(100):
+            if daemon_running(home):
+                break
+            time.sleep(0.1)
+        assert daemon_running(home)
+        # Only the user running the daemon can connect
+        assert stat.S_IMODE(os.stat(ConanDaemon(ConanAPI(home)).socket_path).st_mode) == 0o600
+
+        current = os.getcwd()
+        os.chdir(work)
+        try:
+            save(os.path.join(work, "conanfile.txt"), "")
+            assert run_in_daemon(["list", "*"], home) == 0
+            assert "There are no matching recipe references" in capfd.readouterr().out
+            assert run_in_daemon(["list", "*", "-r", "foo"], home) == 1
+            assert "Remote 'foo' can't be found" in capfd.readouterr().err
+            assert load(migrations) == "."
+            # Changes in the home are reloaded
+            save(os.path.join(home, "global.conf"), "core:non_interactive=True")
+            assert run_in_daemon(["config", "show", "core:*"], home) == 0
+            assert "core:non_interactive: True" in capfd.readouterr().out
+            assert load(migrations) == ".."
+            # The configuration is loaded with the client environment
+            save(os.path.join(home, "global.conf"),
+                 "core.upload:retry={{os.getenv('MY_DAEMON_RETRY', 1)}}")
+            os.environ["MY_DAEMON_RETRY"] = "7"
+            try:
+                assert run_in_daemon(["config", "show", "core.upload:retry"], home) == 0
+            finally:
+                del os.environ["MY_DAEMON_RETRY"]
+            assert "core.upload:retry: 7" in capfd.readouterr().out
+            assert load(migrations) == "..."  # Only the global.conf change
+            environ = os.environ.copy()
+            assert load(reinits) == "."  # Only the first one, with the daemon environment
+            os.environ.update({"MY_DAEMON_RETRY": "8", "PWD": work, "MY_OTHER_VAR": "1"})
+            try:
+                assert run_in_daemon(["config", "show", "core.upload:retry"], home) == 0
+                assert "core.upload:retry: 8" in capfd.readouterr().out
+                assert load(reinits) == ".."
+                # Other variables, like the current folder of the shell, don't reload anything
+                os.environ.update({"PWD": current, "MY_OTHER_VAR": "2"})
+                assert run_in_daemon(["config", "show", "core.upload:retry"], home) == 0
+                assert "core.upload:retry: 8" in capfd.readouterr().out
+                assert load(reinits) == ".."
+            finally:
+                os.environ.clear()
+                os.environ.update(environ)
+            assert load(migrations) == "..."
+            # The command runs in the client current folder
+            save(os.path.join(home, "profiles", "default"), "")
+            assert run_in_daemon(["graph", "info", "."], home) == 0
+            assert os.path.join(work, "conanfile.txt") in capfd.readouterr().err
+        finally:
+            os.chdir(current)
+    finally:
+        assert stop_daemon(home)
+        os.waitpid(pid, 0)
+    assert not daemon_running(home)
+    assert not stop_daemon(home)
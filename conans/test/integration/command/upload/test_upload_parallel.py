@@ -4,11 +4,11 @@ import pytest
 from mock import patch
 from requests import ConnectionError
 
+from conans.client.remote_manager import RemoteManager
 from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.tools import TestClient, NO_SETTINGS_PACKAGE_ID, TestRequester
 
 
-@pytest.mark.xfail(reason="Upload parallel not migrated yet")
 def test_upload_parallel_error():
     """Cause an error in the parallel transfer and see some message"""
 
@@ -17,38 +17,78 @@ def test_upload_parallel_error():
 
         def put(self, *args, **kwargs):
             if any(ref in args[0] for ref in self.fail_on):
-                raise ConnectionError("Connection fails with lib2 and lib4 references!")
+                raise ConnectionError("Connection fails with lib1 and lib3 references!")
             else:
                 return super(FailOnReferencesUploader, self).put(*args, **kwargs)
 
     client = TestClient(requester_class=FailOnReferencesUploader, default_server_user=True)
+    client.save_home({"global.conf": "core.upload:parallel=2\ncore.upload:retry_wait=0"})
     client.save({"conanfile.py": GenConanfile()})
-    client.run('remote login default admin -p password')
     for index in range(4):
         client.run('create . --name=lib{} --version=1.0 --user=user --channel=channel'.format(index))
-    client.run('upload lib* --parallel -c -r default --retry-wait=0', assert_error=True)
-    assert "Connection fails with lib2 and lib4 references!" in client.out
-    assert "Execute upload again to retry upload the failed files" in client.out
+    client.run('upload lib* -c -r default', assert_error=True)
+    assert "Uploading recipes and packages in 2 parallel threads" in client.out
+    assert "Connection fails with lib1 and lib3 references!" in client.out
+    # All the errors are reported together, the packages of failed recipes are not uploaded
+    assert "ERROR: There were errors uploading to 'default', execute upload again to retry " \
+           "the failed ones:" in client.out
+    assert "lib1/1.0@user/channel#4d670581ccb765839f2239cc8dff8fbd: " \
+           "Execute upload again to retry upload the failed files" in client.out
+    assert "lib3/1.0@user/channel#4d670581ccb765839f2239cc8dff8fbd: " \
+           "Execute upload again to retry upload the failed files" in client.out
+    client.run("list *:* -r default")
+    assert "lib0/1.0@user/channel" in client.out
+    assert "lib2/1.0@user/channel" in client.out
+    assert "lib1/1.0@user/channel" not in client.out
+    assert "lib3/1.0@user/channel" not in client.out
+
+
+def test_upload_parallel_unexpected_error():
+    """ Not only the ConanExceptions are collected, the other uploads continue and the failures
+    are reported together
+    """
+    client = TestClient(default_server_user=True)
+    client.save_home({"global.conf": "core.upload:parallel=2"})
+    client.save({"conanfile.py": GenConanfile()})
+    for index in range(3):
+        client.run(f"create . --name=lib{index} --version=1.0")
+
+    upload_recipe = RemoteManager.upload_recipe
+
+    def _upload_recipe(self, ref, files_to_upload, remote):
+        if ref.name == "lib1":
+            raise OSError("Cannot read file")
+        return upload_recipe(self, ref, files_to_upload, remote)
+
+    with patch.object(RemoteManager, "upload_recipe", _upload_recipe):
+        client.run("upload lib* -c -r default", assert_error=True)
+    assert "ERROR: There were errors uploading to 'default'" in client.out
+    assert "lib1/1.0#4d670581ccb765839f2239cc8dff8fbd: OSError: Cannot read file" in client.out
+    client.run("list *:* -r default")
+    assert "lib0/1.0" in client.out
+    assert "lib2/1.0" in client.out
+    assert "lib1/1.0" not in client.out
 
 
-@pytest.mark.xfail(reason="Upload parallel not migrated yet")
 def test_upload_parallel_success():
     """Upload 2 packages in parallel with success"""
 
     client = TestClient(default_server_user=True)
+    client.save_home({"global.conf": "core.upload:parallel=2"})
     client.save({"conanfile.py": GenConanfile()})
     client.run('create . --name=lib0 --version=1.0 --user=user --channel=channel')
     assert "lib0/1.0@user/channel: Package '{}' created".format(NO_SETTINGS_PACKAGE_ID) in client.out
     client.run('create . --name=lib1 --version=1.0 --user=user --channel=channel')
     assert "lib1/1.0@user/channel: Package '{}' created".format(NO_SETTINGS_PACKAGE_ID) in client.out
-    client.run('remote login default admin -p password')
-    client.run('upload lib* --parallel -c -r default')
-    assert "Uploading lib0/1.0@user/channel to remote 'default'" in client.out
-    assert "Uploading lib1/1.0@user/channel to remote 'default'" in client.out
-    client.run('search lib0/1.0@user/channel -r default')
+    client.run('upload lib* -c -r default')
+    assert "Uploading recipe 'lib0/1.0@user/channel#" in client.out
+    assert "Uploading recipe 'lib1/1.0@user/channel#" in client.out
+    assert "Uploading package 'lib0/1.0@user/channel#" in client.out
+    assert "Uploading package 'lib1/1.0@user/channel#" in client.out
+    client.run('list lib*:* -r default')
     assert "lib0/1.0@user/channel" in client.out
-    client.run('search lib1/1.0@user/channel -r default')
     assert "lib1/1.0@user/channel" in client.out
+    assert NO_SETTINGS_PACKAGE_ID in client.out
 
 
 @pytest.mark.xfail(reason="Upload parallel not migrated yet")
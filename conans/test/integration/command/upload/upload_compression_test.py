@@ -89,3 +89,25 @@ def test_upload_only_tgz_if_needed():
     folder = uncompress_packaged_files(server_paths, pref)
     libraries = os.listdir(os.path.join(folder, "lib"))
     assert len(libraries) == 1
+
+
+def test_upload_parallel_compression():
+    client = TestClient(default_server_user=True)
+    client.save_home({"global.conf": "core.gzip:threads=4\ncore.upload:parallel=2"})
+    client.save({"conanfile.py": GenConanfile().with_exports("*").with_package_file("data.txt",
+                                                                                    "data" * 1000),
+                 "another_export_file.lib": "to compress"})
+    for name in ("pkga", "pkgb", "pkgc"):
+        client.run(f"create . --name={name} --version=0.1")
+    client.run("upload * -c -r default")
+    assert "Compressing recipe" in client.out
+    assert "Compressing package" in client.out
+
+    # The blocks compressed in parallel are a standard gzip stream for other clients
+    client2 = TestClient(servers=client.servers)
+    for name in ("pkga", "pkgb", "pkgc"):
+        client2.run(f"install --requires={name}/0.1")
+        client2.run(f"cache path {name}/0.1:da39a3ee5e6b4b0d3255bfef95601890afd80709")
+        assert client2.load(os.path.join(client2.out.strip(), "data.txt")) == "data" * 1000
+        client2.run(f"cache path {name}/0.1")
+        assert os.path.isfile(os.path.join(client2.out.strip(), "another_export_file.lib"))
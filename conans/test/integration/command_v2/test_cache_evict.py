@@ -0,0 +1,187 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from conan.internal.cache.lru import IN_USE_FOLDER
+from conans.client.installer import BinaryInstaller
+from conans.errors import ConanException
+from conans.test.utils.tools import TestClient
+from conans.util.files import save, load
+
+
+def _client(*names, size=0):
+    c = TestClient()
+    conanfile = textwrap.dedent(f"""
+        import os
+        from conan import ConanFile
+        from conan.tools.files import save
+
+        class Pkg(ConanFile):
+            def package(self):
+                save(self, os.path.join(self.package_folder, "file.bin"), "x" * {size})
+        """)
+    c.save({"conanfile.py": conanfile})
+    for name in names:
+        c.run(f"create . --name={name} --version=0.1")
+    return c
+
+
+def test_cache_evict_age():
+    c = _client("pkga", "pkgb")
+    time.sleep(1.1)
+    # Every usage is recorded, not only once per minute
+    with patch("conan.internal.cache.cache.LRU_RESOLUTION", 0):
+        c.run("install --requires=pkga/0.1")
+    c.run("cache evict --max-age=1s")
+    assert "Removed package pkgb/0.1" in c.out
+    assert "Removed recipe pkgb/0.1" in c.out
+    assert "Removed 1 recipes and 1 packages" in c.out
+    c.run("list *:*")
+    assert "pkga/0.1" in c.out
+    assert "pkgb" not in c.out
+
+    # Builds, exports and downloads are usages too
+    c.run("create . --name=pkgb --version=0.1")
+    c.run("cache evict --max-age=1h")
+    assert "Removed 0 recipes and 0 packages" in c.out
+
+
+def test_cache_evict_size():
+    c = _client("pkga", "pkgb", "pkgc", size=100000)
+    with patch("conan.internal.cache.cache.LRU_RESOLUTION", 0):
+        c.run("install --requires=pkga/0.1")
+    # The packages are 100KB each, the least recently used package goes first
+    c.run("cache evict --max-size=250K")
+    assert "Removed 0 recipes and 1 packages" in c.out
+    assert "Removed package pkgb/0.1" in c.out
+    c.run("list *:*")
+    assert "pkgb/0.1" in c.out  # The recipe is still there
+    c.run("list pkgb/0.1:*")
+    assert "PID" not in c.out
+
+    # Then the recipes without packages
+    c.run("cache evict --max-size=1K")
+    assert "Removed 3 recipes and 2 packages" in c.out
+    c.run("list *")
+    assert "pkg" not in c.out
+
+    c.run("cache evict", assert_error=True)
+    assert "Define at least one of --max-size or --max-age" in c.out
+    c.run("cache evict --max-size=lots", assert_error=True)
+    assert "Incorrect size definition: lots" in c.out
+
+
+def test_cache_evict_in_use():
+    """ the recipes and packages that a running process could be using are kept """
+    c = _client("pkga")
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    try:
+        marker = os.path.join(c.cache.store, IN_USE_FOLDER, "other")
+        save(marker, json.dumps({"host": socket.gethostname(), "pid": proc.pid,
+                                 "time": time.time() - 100}))
+        c.run("cache evict --max-age=0s")
+        assert "Removed 0 recipes and 0 packages" in c.out
+    finally:
+        proc.kill()
+        proc.wait()
+    # Once it finished, its mark is discarded
+    c.run("cache evict --max-age=0s")
+    assert "Removed 1 recipes and 1 packages" in c.out
+    assert not os.path.exists(marker)
+    c.run("list *")
+    assert "pkga" not in c.out
+
+
+def test_cache_evict_in_use_items():
+    """ the recipes and packages whose usage could not be written (the database was locked) are
+    kept while the process that used them is running
+    """
+    c = _client("pkga", "pkgb")
+    time.sleep(1.1)
+    locked = ConanException("database is locked")
+    with patch("conan.internal.cache.db.cache_database.CacheDatabase.update_recipes_lru",
+               side_effect=locked):
+        with patch("conan.internal.cache.db.cache_database.CacheDatabase.update_packages_lru",
+                   side_effect=locked):
+            c.run("install --requires=pkga/0.1")
+    folder = os.path.join(c.cache.store, IN_USE_FOLDER)
+    own = [m for m in os.listdir(folder) if m.startswith(f"{os.getpid()}-")]
+    items = json.loads(load(os.path.join(folder, own[0])))["items"]
+    # The creation of pkgb, by this same test process, resolved it too
+    items = [item for item in items if item.startswith("pkga/0.1#")]
+    assert len(items) == 2
+
+    # The same marker, as if it was written by other running process
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    try:
+        save(os.path.join(folder, "other"), json.dumps({"host": socket.gethostname(),
+                                                        "pid": proc.pid, "time": time.time(),
+                                                        "items": items}))
+        with patch("conan.internal.cache.cache.LRU_RESOLUTION", 0):
+            c.run("cache evict --max-age=0s")
+        assert "Removed 1 recipes and 1 packages" in c.out
+        assert "Removed recipe pkgb/0.1" in c.out
+    finally:
+        proc.kill()
+        proc.wait()
+    c.run("list *")
+    assert "pkga/0.1" in c.out
+
+
+def test_cache_lru_batched():
+    """ the usage of all the recipes of a graph is written at once """
+    c = _client("pkga", "pkgb")
+    with patch("conan.internal.cache.db.cache_database.CacheDatabase.update_recipes_lru") as lru:
+        c.run("install --requires=pkga/0.1 --requires=pkgb/0.1")
+    assert lru.call_count == 1
+    assert sorted(ref.name for ref in lru.call_args[0][0]) == ["pkga", "pkgb"]
+
+
+@contextmanager
+def _old_usage_times():
+    """ the usage times written are older than the processes using the cache """
+    old = time.time() - 1000
+    with patch("conan.internal.cache.cache.revision_timestamp_now", return_value=old), \
+            patch("conan.internal.cache.db.recipes_table.revision_timestamp_now",
+                  return_value=old), \
+            patch("conan.internal.cache.db.packages_table.revision_timestamp_now",
+                  return_value=old):
+        yield
+
+
+def test_cache_evict_resolved():
+    """ the recipes and packages resolved by a running process are kept, even if their last usage
+    time is old because it hasn't been written yet
+    """
+    with _old_usage_times():
+        c = _client("pkga", "pkgb")
+    folder = os.path.join(c.cache.store, IN_USE_FOLDER)
+    install = BinaryInstaller.install
+
+    def evict_and_install(installer, deps_graph, remotes):
+        # Other process evicts everything after the graph is computed, but before installing
+        own = [m for m in os.listdir(folder) if m.startswith(f"{os.getpid()}-")]
+        items = json.loads(load(os.path.join(folder, own[0])))["items"]
+        items = [item for item in items if not item.startswith("pkgb/")]  # Created by this test
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        try:
+            save(os.path.join(folder, "other"), json.dumps({"host": socket.gethostname(),
+                                                            "pid": proc.pid, "time": time.time(),
+                                                            "items": items}))
+            c.cache.evict(max_size=0)
+        finally:
+            proc.kill()
+            proc.wait()
+        return install(installer, deps_graph, remotes)
+
+    with _old_usage_times(), patch.object(BinaryInstaller, "install", evict_and_install):
+        c.run("install --requires=pkga/0.1")
+    c.run("list *:*")
+    assert "pkga/0.1" in c.out
+    assert "pkgb" not in c.out
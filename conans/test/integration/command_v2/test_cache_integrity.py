@@ -1,5 +1,11 @@
+import json
 import os
+import time
 
+import pytest
+
+from conan.internal.cache.cache import QUARANTINE_FOLDER
+from conan.internal.cache.conan_reference_layout import HASHES_FILE
 from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.tools import TestClient
 from conans.util.files import save
@@ -25,4 +31,76 @@ def test_cache_integrity():
     assert "pkg1/1.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Integrity checked: ok" in t.out
     assert "ERROR: pkg2/2.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Manifest mismatch" in t.out
     assert "ERROR: pkg3/3.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Manifest mismatch" in t.out
-    
+    # Always reported in the same order
+    output = str(t.out)
+    assert [output.index(f"({i} of 6)") for i in range(1, 7)] == \
+           sorted(output.index(f"({i} of 6)") for i in range(1, 7))
+    t.run("cache check-integrity *", assert_error=True)
+    assert str(t.out) == output
+
+
+def test_cache_integrity_hash_cache():
+    t = TestClient()
+    t.save_home({"global.conf": "core.cache:hash_cache=True"})
+    t.save({"conanfile.py": GenConanfile().with_package_file("file.h", "header")})
+    t.run("create . --name pkg --version 1.0")
+    pref = t.created_package_reference("pkg/1.0")
+    layout = t.get_latest_pkg_layout(pref)
+    header = os.path.join(layout.package(), "file.h")
+    past = time.time() - 100
+    os.utime(header, (past, past))
+
+    for _ in range(2):
+        t.run("cache check-integrity *")
+        assert f"pkg/1.0:{pref.package_id}: Integrity checked: ok" in t.out
+    assert os.path.exists(os.path.join(layout.base_folder, HASHES_FILE))
+
+    save(header, "modified")
+    t.run("cache check-integrity *", assert_error=True)
+    assert f"ERROR: pkg/1.0:{pref.package_id}: Manifest mismatch" in t.out
+
+
+@pytest.mark.parametrize("action", ["remove", "quarantine"])
+def test_cache_integrity_report_corrupted(action):
+    t = TestClient()
+    t.save({"conanfile.py": GenConanfile()})
+    prefs = {}
+    for name in ("pkg1", "pkg2", "pkg3"):
+        t.run(f"create . --name={name} --version=1.0")
+        prefs[name] = t.created_package_reference(f"{name}/1.0")
+    pref = prefs["pkg3"]
+    save(os.path.join(t.get_latest_pkg_layout(pref).package(), "conaninfo.txt"), "[settings]")
+    pref2 = prefs["pkg2"]
+    layout = t.get_latest_ref_layout(pref2.ref)
+    save(layout.conanfile(), "corrupted")
+
+    t.run(f"cache check-integrity * --report=report.json --corrupted={action}", assert_error=True)
+    assert "pkg1/1.0: Integrity checked: ok" in t.out
+    assert "ERROR: There are corrupted artifacts, check the error logs" in t.out
+    report = json.loads(t.load("report.json"))
+    assert report["checked"] == 6
+    corrupted = report["corrupted"]
+    assert set(corrupted) == {pref.repr_notime(), pref2.ref.repr_notime(), pref2.repr_notime()}
+    assert corrupted[pref2.ref.repr_notime()]["folder"] == layout.export()
+    assert "conanfile.py" in corrupted[pref2.ref.repr_notime()]["files"]
+    assert corrupted[pref.repr_notime()]["files"]["conaninfo.txt"]["manifest"]
+    # The packages of the corrupted recipes are removed too
+    assert corrupted[pref2.repr_notime()]["folder"] is None
+    expected = "removed" if action == "remove" else "quarantined"
+    assert {c["action"] for c in corrupted.values()} == {expected}
+    if action == "quarantine":
+        for c in corrupted.values():
+            assert os.path.isdir(c["quarantine"])
+            assert c["quarantine"].startswith(os.path.join(t.cache.store, QUARANTINE_FOLDER))
+    else:
+        assert not os.path.exists(layout.base_folder)
+
+    t.run("list *:*")
+    assert "pkg1/1.0" in t.out
+    assert "pkg2" not in t.out
+    t.run("list pkg3/1.0:*")
+    assert "pkg3/1.0" in t.out
+    assert pref.package_id not in t.out
+    t.run("cache check-integrity *")
+    assert "pkg3/1.0: Integrity checked: ok" in t.out
+    assert "of 3)" in t.out
@@ -0,0 +1,57 @@
+from conan.api.conan_api import ConanAPI
+from conan.api.model import Remote
+from conans.model.recipe_ref import RecipeReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+
+
+def test_session_reused():
+    c = TestClient()
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+    c.run("create .")
+
+    api = ConanAPI(c.cache_folder)
+    session = api.session
+    ref = RecipeReference.loads("pkg/0.1")
+    latest = api.list.latest_recipe_revision(ref)
+    assert latest is not None
+    assert api.cache.export_path(latest)
+    # The same cache, requester and remotes connections are used by all the calls
+    assert api.session is session
+
+    # The configuration is loaded again when its files are modified
+    c.save_home({"global.conf": "core.upload:retry=7"})
+    assert api.config.get("core.upload:retry") == 7
+    assert api.session is not session
+    session = api.session
+    api.reinit()
+    assert api.session is not session
+
+
+def test_session_config_install():
+    c = TestClient()
+    conf = TestClient()
+    conf.save({"global.conf": "core.upload:retry=7"})
+
+    api = ConanAPI(c.cache_folder)
+    assert api.config.get("core.upload:retry") is None
+    api.config.install(conf.current_folder, verify_ssl=False)
+    assert api.config.get("core.upload:retry") == 7
+
+
+def test_session_editables_remotes():
+    c = TestClient()
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+
+    api = ConanAPI(c.cache_folder)
+    session = api.session
+    api.local.editable_add(".", cwd=c.current_folder)
+    assert api.session is not session
+    assert RecipeReference.loads("pkg/0.1") in api.local.editable_list()
+    session = api.session
+    api.remotes.add(Remote("other", "http://other.url"))
+    assert api.session is not session
+    session = api.session
+    api.local.editable_remove(".", cwd=c.current_folder)
+    assert api.session is not session
+    assert api.local.editable_list() == {}
@@ -0,0 +1,68 @@
+import marshal
+import os
+import shutil
+import textwrap
+from unittest.mock import patch
+
+from conans.client.loader import COMPILED_RECIPE
+from conans.model.recipe_ref import RecipeReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient
+from conans.util.files import save
+
+
+def test_compiled_recipe():
+    c = TestClient()
+    conanfile = textwrap.dedent("""
+        from conan import ConanFile
+        class Pkg(ConanFile):
+            name = "pkg"
+            version = "0.1"
+            def configure(self):
+                self.output.info("VALUE: {}!".format(self.conan_data["value"]))
+        """)
+    c.save({"conanfile.py": conanfile,
+            "conandata.yml": "value: 42"})
+    c.run("export .")
+    c.run("install --requires=pkg/0.1 --build=missing")
+    assert "VALUE: 42!" in c.out
+
+    layout = c.get_latest_ref_layout(RecipeReference.loads("pkg/0.1"))
+    compiled = os.path.join(layout.base_folder, COMPILED_RECIPE)
+    with open(compiled, "rb") as f:
+        entry = marshal.load(f)
+    assert entry["conandata"] == {"value": 42}
+    assert entry["code"].co_filename == layout.conanfile()
+
+    # Next loads don't parse the conandata.yml again
+    with patch("conans.client.loader.ConanFileLoader._load_data") as load_data:
+        c.run("install --requires=pkg/0.1")
+        load_data.assert_not_called()
+    assert "VALUE: 42!" in c.out
+
+    # A recipe modified in the cache is compiled again
+    save(layout.conanfile(), conanfile.replace("VALUE", "NEW VALUE"))
+    save(layout.conandata(), "value: 43")
+    c.run("install --requires=pkg/0.1")
+    assert "NEW VALUE: 43!" in c.out
+
+    # The local recipes are not compiled
+    c.run("install .")
+    assert not os.path.exists(os.path.join(c.current_folder, "..", COMPILED_RECIPE))
+
+
+def test_compiled_recipe_moved_cache():
+    """ the code is compiled with the path of the recipe, a moved cache compiles it again """
+    c = TestClient()
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+    c.run("create .")
+
+    moved = os.path.join(temp_folder(), "home")
+    shutil.copytree(c.cache_folder, moved)
+    c2 = TestClient(cache_folder=moved)
+    c2.run("install --requires=pkg/0.1")
+    layout = c2.get_latest_ref_layout(RecipeReference.loads("pkg/0.1"))
+    with open(os.path.join(layout.base_folder, COMPILED_RECIPE), "rb") as f:
+        entry = marshal.load(f)
+    assert entry["code"].co_filename == layout.conanfile()
@@ -68,3 +68,15 @@ class ConanRequesterHeadersTests(unittest.TestCase):
             requester.get(url="aaa", headers={"User-Agent": "MyUserAgent"})
             headers = mock_http_requester.get.call_args[1]["headers"]
             self.assertEqual("MyUserAgent", headers["User-Agent"])
+
+
+class ConanRequesterResetTests(unittest.TestCase):
+    def test_reset_connections(self):
+        config = ConfDefinition()
+        config.update("core.net.http:max_retries", 5)
+        requester = ConanRequester(config)
+        session = requester._http_requester
+        requester.reset_connections()
+        self.assertIsNot(session, requester._http_requester)
+        adapter = requester._http_requester.get_adapter("https://conan.io")
+        self.assertEqual(adapter.max_retries.total, 5)
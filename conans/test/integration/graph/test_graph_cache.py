@@ -0,0 +1,117 @@
+import os
+import textwrap
+from unittest.mock import patch
+
+from conans.client.graph.graph_binaries import GraphBinariesAnalyzer
+from conans.client.graph.graph_cache import GRAPH_CACHE_FOLDER
+from conans.client.graph.range_resolver import RangeResolver
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+
+
+def test_graph_cache():
+    c = TestClient(default_server_user=True)
+    c.save({"dep/conanfile.py": GenConanfile("dep"),
+            "conanfile.py": GenConanfile("app", "1.0").with_requires("dep/[>=1.0 <2]")})
+    c.run("export dep --version=1.0")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    c.save_home({"global.conf": "core.graph:cache=True"})
+
+    # The first resolution downloads the recipe from the server, and stores the resolution
+    c.run("graph info .")
+    assert "dep/1.0: Downloaded recipe revision" in c.out
+    assert "Using the cached resolution" not in c.out
+    assert len(os.listdir(os.path.join(c.cache.store, GRAPH_CACHE_FOLDER))) == 1
+
+    # The same computation doesn't resolve the ranges again
+    with patch.object(RangeResolver, "_resolve_local") as resolve:
+        c.run("graph info .")
+        resolve.assert_not_called()
+    assert "Using the cached resolution of the dependency graph" in c.out
+    assert "dep/[>=1.0 <2]: dep/1.0" in c.out
+    assert "dep/1.0#" in c.out
+
+    # Any change in the inputs computes the graph again
+    c.run("export dep --version=1.1")
+    c.run("graph info .")
+    assert "Using the cached resolution" not in c.out
+    assert "dep/[>=1.0 <2]: dep/1.1" in c.out
+    c.run("graph info . -s os=Windows")
+    assert "Using the cached resolution" not in c.out
+    c.save({"conanfile.py": GenConanfile("app", "1.0").with_requires("dep/[>=1.0 <1.1]")})
+    c.run("graph info .")
+    assert "Using the cached resolution" not in c.out
+    assert "dep/[>=1.0 <1.1]: dep/1.0" in c.out
+    c.run("graph info .")
+    assert "Using the cached resolution" in c.out
+    assert "dep/[>=1.0 <1.1]: dep/1.0" in c.out
+
+    # Checking updates doesn't use it
+    c.run("graph info . --update")
+    assert "Using the cached resolution" not in c.out
+
+
+def test_graph_cache_disabled():
+    c = TestClient()
+    c.save({"dep/conanfile.py": GenConanfile("dep", "1.0"),
+            "conanfile.py": GenConanfile("app", "1.0").with_requires("dep/[>=1.0 <2]")})
+    c.run("export dep")
+    c.run("graph info .")
+    c.run("graph info .")
+    assert "Using the cached resolution" not in c.out
+    assert not os.path.exists(os.path.join(c.cache.store, GRAPH_CACHE_FOLDER))
+
+
+def test_graph_cache_binaries():
+    c = TestClient()
+    c.save({"dep/conanfile.py": GenConanfile("dep", "1.0"),
+            "conanfile.py": GenConanfile("app", "1.0").with_requires("dep/[>=1.0 <2]")})
+    c.run("create dep")
+    c.save_home({"global.conf": "core.graph:cache=True"})
+    c.run("install .")  # Stores the binaries analysis
+
+    # The same analysis doesn't evaluate the binaries again
+    with patch.object(GraphBinariesAnalyzer, "_evaluate_node") as evaluate:
+        c.run("install .")
+        evaluate.assert_not_called()
+    assert "dep/1.0#" in c.out and "- Cache" in c.out
+
+    # Other build mode or other packages in the cache evaluate them again
+    with patch.object(GraphBinariesAnalyzer, "_evaluate_node",
+                      side_effect=GraphBinariesAnalyzer._evaluate_node,
+                      autospec=True) as evaluate:
+        c.run("install . --build=missing")
+        assert evaluate.called
+    c.run("remove dep/1.0:* -c")
+    c.run("install .", assert_error=True)
+    assert "ERROR: Missing prebuilt package for 'dep/1.0'" in c.out
+
+
+def test_graph_cache_untracked_inputs():
+    """ a version range changed by an input not in the key, here a file read by the recipe, is
+    resolved again, even if the cached version is still in the range
+    """
+    c = TestClient()
+    conanfile = textwrap.dedent("""
+        from conan import ConanFile
+        from conan.tools.files import load
+
+        class App(ConanFile):
+            def requirements(self):
+                self.requires("dep/[{}]".format(load(self, "range.txt")))
+        """)
+    c.save({"dep/conanfile.py": GenConanfile("dep"),
+            "conanfile.py": conanfile,
+            "range.txt": ">=1.0 <2"})
+    c.run("export dep --version=1.0")
+    c.run("export dep --version=2.0")
+    c.save_home({"global.conf": "core.graph:cache=True"})
+    c.run("graph info .")
+    assert "dep/[>=1.0 <2]: dep/1.0" in c.out
+
+    c.save({"range.txt": ">=1.0 <3"})
+    c.run("graph info .")
+    assert "Using the cached resolution" in c.out
+    assert "dep/[>=1.0 <3]: dep/2.0" in c.out
+    assert "dep/2.0#" in c.out
@@ -0,0 +1,80 @@
+import textwrap
+
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestServer
+
+
+def test_prefetch_recipes():
+    """ the recipes are downloaded in background threads, but the resulting graph is the same
+    """
+    c = TestClient(default_server_user=True)
+    c.save({"dep/conanfile.py": GenConanfile(),
+            "pkg/conanfile.py": GenConanfile().with_requires("dep1/0.1", "dep2/0.1")})
+    for i in range(4):
+        c.run(f"export dep --name=dep{i} --version=0.1")
+    c.run("export pkg --name=pkg --version=0.1")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+
+    c.save_home({"global.conf": "core.graph:prefetch_recipes=4"})
+    c.save({"conanfile.txt": textwrap.dedent("""
+        [requires]
+        pkg/0.1
+        dep0/0.1
+        dep3/0.1
+        """)}, clean_first=True)
+    c.run("graph info . --format=json")
+    for i in range(4):
+        assert f"dep{i}/0.1: Downloaded recipe revision" in c.out
+    c.run("list *")
+    for i in range(4):
+        assert f"dep{i}/0.1" in c.out
+    assert "pkg/0.1" in c.out
+
+
+def test_prefetch_recipes_missing():
+    c = TestClient(default_server_user=True)
+    c.save_home({"global.conf": "core.graph:prefetch_recipes=4"})
+    c.save({"conanfile.txt": "[requires]\nmissing/0.1"})
+    c.run("install .", assert_error=True)
+    assert "Unable to find 'missing/0.1' in remotes" in c.out
+
+
+def test_prefetch_recipes_overridden():
+    """ the overridden requirements are never downloaded
+    """
+    c = TestClient(default_server_user=True)
+    c.save({"dep/conanfile.py": GenConanfile("dep"),
+            "pkg/conanfile.py": GenConanfile("pkg", "0.1").with_requires("dep/0.1")})
+    c.run("export dep --version=0.1")
+    c.run("export dep --version=0.2")
+    c.run("export pkg")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+
+    c.save_home({"global.conf": "core.graph:prefetch_recipes=4"})
+    c.save({"conanfile.py": GenConanfile().with_requires("pkg/0.1")
+                                          .with_requirement("dep/0.2", override=True)},
+           clean_first=True)
+    c.run("graph info .")
+    assert "dep/0.2: Downloaded recipe revision" in c.out
+    c.run("list dep/0.1")
+    assert "ERROR: Recipe 'dep/0.1' not found" in c.out
+
+
+def test_prefetch_recipes_login():
+    """ the prefetch never asks to log in, the recipe is retrieved again by the main thread
+    """
+    server = TestServer(read_permissions=[("*/*@*/*", "admin")], users={"admin": "password"})
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"] * 2)
+    c.save({"dep/conanfile.py": GenConanfile("dep", "0.1")})
+    c.run("export dep")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    c.run("remote logout default")
+
+    c.save_home({"global.conf": "core.graph:prefetch_recipes=4"})
+    c.save({"conanfile.txt": "[requires]\ndep/0.1"}, clean_first=True)
+    c.run("graph info .")
+    assert c.out.count('Please log in to "default"') == 1
+    assert "dep/0.1: Downloaded recipe revision" in c.out
@@ -0,0 +1,95 @@
+import os
+
+from conans.client.rest.metadata_cache import METADATA_CACHE_FOLDER
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestRequester
+
+
+class _QueriesRequester(TestRequester):
+    """ keeps the (status code) of the revisions and search queries to the remote """
+    queries = []
+
+    def get(self, url, **kwargs):
+        response = super(_QueriesRequester, self).get(url, **kwargs)
+        if url.endswith("/latest") or "/search" in url:
+            _QueriesRequester.queries.append(response.status_code)
+        return response
+
+
+def _clients():
+    c = TestClient(default_server_user=True, requester_class=_QueriesRequester)
+    c.save_home({"global.conf": "core.net.http:metadata_cache_ttl=3600"})
+    c.save({"conanfile.py": GenConanfile("pkg")})
+    c.run("create . --version=1.0")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    other = TestClient(servers=c.servers, inputs=["admin", "password"])
+    return c, other
+
+
+def test_metadata_cache_ttl():
+    c, other = _clients()
+    c.run("install --requires=pkg/[>=1.0]")
+    assert "pkg/1.0: Downloaded recipe revision" in c.out
+    assert os.listdir(os.path.join(c.cache_folder, METADATA_CACHE_FOLDER))
+
+    # The responses of the remote are reused, even if the server changed
+    other.save({"conanfile.py": GenConanfile("pkg")})
+    other.run("export . --version=1.1")
+    other.run("upload * -r=default -c")
+    c.run("remove * -c")
+    _QueriesRequester.queries = []
+    c.run("install --requires=pkg/[>=1.0]")
+    assert _QueriesRequester.queries == []
+    assert "pkg/1.0: Downloaded recipe revision" in c.out
+
+    # --update always checks the server
+    c.run("graph info --requires=pkg/[>=1.0] --update")
+    assert _QueriesRequester.queries
+    assert "pkg/1.1: Downloaded recipe revision" in c.out
+    c.run("remove * -c")
+
+    # The uploads and removals of this client discard the stored responses
+    c.save({"conanfile.py": GenConanfile("pkg")})
+    c.run("export . --version=1.2")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    c.run("graph info --requires=pkg/[>=1.0]")
+    assert "pkg/1.2: Downloaded recipe revision" in c.out
+
+
+def test_metadata_cache_revalidate():
+    """ outside the graph resolution, or with a 0 TTL, the remote is always checked, but it
+    answers that the stored responses didn't change without sending them again
+    """
+    c, other = _clients()
+    c.run("list pkg/*#latest -r=default")
+    _QueriesRequester.queries = []
+    c.run("list pkg/*#latest -r=default")
+    assert _QueriesRequester.queries and set(_QueriesRequester.queries) == {304}
+    assert "pkg/1.0" in c.out
+
+    c.save_home({"global.conf": "core.net.http:metadata_cache_ttl=0"})
+    c.run("install --requires=pkg/[>=1.0]")
+    _QueriesRequester.queries = []
+    c.run("remove * -c")
+    c.run("install --requires=pkg/[>=1.0]")
+    assert set(_QueriesRequester.queries) == {304}
+
+    other.save({"conanfile.py": GenConanfile("pkg")})
+    other.run("export . --version=1.1")
+    other.run("upload * -r=default -c")
+    c.run("list pkg/*#latest -r=default")
+    assert "pkg/1.1" in c.out
+    c.run("remove * -c")
+    c.run("graph info --requires=pkg/[>=1.0]")
+    assert "pkg/1.1: Downloaded recipe revision" in c.out
+
+
+def test_metadata_cache_disabled():
+    c = TestClient(default_server_user=True)
+    c.save({"conanfile.py": GenConanfile("pkg", "1.0")})
+    c.run("create .")
+    c.run("upload * -r=default -c")
+    c.run("install --requires=pkg/1.0 --update")
+    assert not os.path.exists(os.path.join(c.cache_folder, METADATA_CACHE_FOLDER))
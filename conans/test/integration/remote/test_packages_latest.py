@@ -0,0 +1,69 @@
+import textwrap
+from collections import OrderedDict
+from unittest.mock import patch
+
+from conans import PACKAGES_LATEST
+from conans.client.rest.rest_client_v2 import RestV2Methods
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestServer
+
+
+def _client(*capabilities):
+    servers = OrderedDict(("remote{}".format(i), TestServer(server_capabilities=list(capabilities)))
+                          for i in range(2))
+    c = TestClient(servers=servers, inputs=["admin", "password"] * 2)
+    c.save({"dep/conanfile.py": GenConanfile().with_settings("os"),
+            "pkg/conanfile.py": GenConanfile("pkg", "0.1").with_settings("os")
+                                                        .with_requires("dep1/0.1", "dep2/0.1")})
+    for name in ("dep1", "dep2"):
+        c.run(f"create dep --name={name} --version=0.1 -s os=Linux")
+    c.run("create pkg -s os=Linux")
+    c.run("upload dep1* -r=remote0 -c")
+    c.run("upload * -r=remote1 -c")
+    c.run("remove * -c")
+    return c
+
+
+def test_packages_latest():
+    """ the binaries of each graph level are looked for in a single request per remote, the
+    first remote that has them is used
+    """
+    c = _client(PACKAGES_LATEST)
+    with patch.object(RestV2Methods, "get_latest_package_reference") as get_latest:
+        with patch.object(RestV2Methods, "get_latest_package_references",
+                          side_effect=RestV2Methods.get_latest_package_references,
+                          autospec=True) as get_latests:
+            c.run("install --requires=pkg/0.1 -s os=Linux")
+    get_latest.assert_not_called()
+    # One per remote and graph level, only with the binaries not found in the previous remotes
+    assert [len(call.args[1]) for call in get_latests.call_args_list] == [2, 1, 1, 1]
+    assert "dep1/0.1: Retrieving package 9a4eb3c8701508aa9458b1a73d0633783ecc2270 " \
+           "from remote 'remote0'" in c.out
+    assert "dep2/0.1: Retrieving package 9a4eb3c8701508aa9458b1a73d0633783ecc2270 " \
+           "from remote 'remote1'" in c.out
+
+    c.run("remove *:* -c")
+    c.run("install --requires=pkg/0.1 -s os=Windows", assert_error=True)
+    assert "ERROR: Missing prebuilt package for 'dep1/0.1', 'dep2/0.1', 'pkg/0.1'" in c.out
+
+    # The compatible binaries are looked for in one request too
+    compat = textwrap.dedent("""\
+        def compatibility(conanfile):
+            return [{"settings": [("os", v)]} for v in ("FreeBSD", "Macos", "Linux")]
+        """)
+    c.save_home({"extensions/plugins/compatibility/compatibility.py": compat})
+    c.run("install --requires=pkg/0.1 -s os=Windows")
+    assert "Main binary package 'ebec3dc6d7f6b907b3ada0c3d3cdc83613a2b715' missing. Using " \
+           "compatible package '9a4eb3c8701508aa9458b1a73d0633783ecc2270'" in c.out
+
+
+def test_packages_latest_not_supported():
+    """ the servers without the capability are requested for every binary """
+    c = _client()
+    with patch.object(RestV2Methods, "get_latest_package_references") as get_latests:
+        c.run("install --requires=pkg/0.1 -s os=Linux")
+    get_latests.assert_not_called()
+    assert "dep1/0.1: Retrieving package 9a4eb3c8701508aa9458b1a73d0633783ecc2270 " \
+           "from remote 'remote0'" in c.out
+    assert "dep2/0.1: Retrieving package 9a4eb3c8701508aa9458b1a73d0633783ecc2270 " \
+           "from remote 'remote1'" in c.out
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+
+from conan.api.output import ConanOutput
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+
+
+class _SlowRequester(TestRequester):
+    """ slow remotes, keeping the maximum number of concurrent lookups """
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def get(self, url, **kwargs):
+        if not url.endswith("/latest") and "/search" not in url:
+            return super(_SlowRequester, self).get(url, **kwargs)
+        with _SlowRequester.lock:
+            _SlowRequester.running += 1
+            _SlowRequester.max_running = max(_SlowRequester.max_running, _SlowRequester.running)
+        try:
+            time.sleep(0.05)
+            return super(_SlowRequester, self).get(url, **kwargs)
+        finally:
+            with _SlowRequester.lock:
+                _SlowRequester.running -= 1
+
+
+def _client():
+    servers = OrderedDict((f"remote{i}", TestServer()) for i in range(3))
+    c = TestClient(servers=servers, inputs=["admin", "password"] * 3,
+                   requester_class=_SlowRequester)
+    # A different revision in every remote, the newest one in the second remote
+    rrevs = {}
+    for i in (0, 2, 1):
+        if i == 1:
+            time.sleep(1)  # The revision timestamps have a resolution of seconds
+        c.save({"conanfile.py": GenConanfile("pkg").with_class_attribute(f"value = {i}")})
+        c.run("create . --version=1.0")
+        rrevs[i] = c.exported_recipe_revision()
+        c.run(f"upload * -r=remote{i} -c")
+        c.run("remove * -c")
+    return c, rrevs
+
+
+def test_remotes_parallel():
+    c, rrevs = _client()
+    c.save({"conanfile.txt": "[requires]\npkg/[>=1.0 <2]"}, clean_first=True)
+    _SlowRequester.max_running = 0
+    c.run("install .")
+    # Without update, the first remote always wins, the next ones are not even checked
+    assert _SlowRequester.max_running == 1
+    assert f"pkg/1.0: Downloaded recipe revision {rrevs[0]}" in c.out
+    assert "Download (remote0)" in c.out
+
+    # With update, all the remotes are checked concurrently, and the newest one wins
+    c.run("install . --update")
+    assert _SlowRequester.max_running > 1
+    assert "Checking remote: remote0\n" \
+           "pkg/1.0: Checking remote: remote1\n" \
+           "pkg/1.0: Checking remote: remote2" in c.out
+    assert f"pkg/1.0: Downloaded recipe revision {rrevs[1]}" in c.out
+    assert "Download (remote1)" in c.out
+
+
+def test_remotes_sequential():
+    c, _ = _client()
+    c.save_home({"global.conf": "core.net.http:remotes_parallel=1"})
+    _SlowRequester.max_running = 0
+    c.run("install --requires=pkg/1.0 --update")
+    assert _SlowRequester.max_running == 1
+    assert "Download (remote1)" in c.out
+
+
+def test_remotes_parallel_login():
+    """ the concurrent checks never ask to log in, the remotes that need it are checked again,
+    in order, by the main thread
+    """
+    servers = OrderedDict((f"remote{i}", TestServer(read_permissions=[("*/*@*/*", "admin")],
+                                                    users={"admin": "password"}))
+                          for i in range(2))
+    c = TestClient(servers=servers, inputs=["admin", "password"] * 4)
+    c.save({"conanfile.py": GenConanfile("pkg", "1.0")})
+    c.run("create .")
+    c.run("upload * -r=remote0 -c")
+    c.run("upload * -r=remote1 -c")
+    c.run("remove * -c")
+    c.run('remote logout "*"')
+
+    c.run("install --requires=pkg/1.0 --update")
+    assert c.out.count('Please log in to "remote0"') == 1
+    assert c.out.count('Please log in to "remote1"') == 1
+    assert c.out.index('Please log in to "remote0"') < c.out.index('Please log in to "remote1"')
+    assert "pkg/1.0: Downloaded recipe revision" in c.out
+
+
+class _WarningRequester(TestRequester):
+    """ remotes that warn when their latest recipe revision is requested """
+    def get(self, url, **kwargs):
+        if url.endswith("/latest"):
+            ConanOutput().warning(f"Deprecated server: {url.split('/')[2]}")
+        return super(_WarningRequester, self).get(url, **kwargs)
+
+
+def test_remotes_parallel_output():
+    """ the output of the concurrent checks is not lost, it is written, in the remotes order,
+    when their results are used
+    """
+    servers = OrderedDict((f"remote{i}", TestServer()) for i in range(2))
+    c = TestClient(servers=servers, inputs=["admin", "password"] * 2,
+                   requester_class=_WarningRequester)
+    c.save({"conanfile.py": GenConanfile("pkg", "1.0")})
+    c.run("create .")
+    c.run("upload * -r=remote0 -c")
+    c.run("upload * -r=remote1 -c")
+    c.run("remove * -c")
+
+    c.run("install --requires=pkg/1.0 --update")
+    warnings = [f"WARN: Deprecated server: {s.fake_url.split('/')[2]}" for s in servers.values()]
+    assert warnings[0] in c.out
+    assert warnings[1] in c.out
+    assert c.out.index(warnings[0]) < c.out.index(warnings[1])
@@ -0,0 +1,84 @@
+import os
+
+from conans import CHECKSUM_DEPLOY
+from conans.server.store.disk_adapter import BLOBS_FOLDER
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestServer, TestRequester
+
+
+class _DeployRequester(TestRequester):
+    """ keeps the status of the checksum deploy requests """
+    deploys = []
+
+    def put(self, url, **kwargs):
+        response = super(_DeployRequester, self).put(url, **kwargs)
+        if kwargs.get("headers", {}).get("X-Checksum-Deploy"):
+            _DeployRequester.deploys.append(response.status_code)
+        return response
+
+
+def _stored_files(server):
+    store = server.server_store.store
+    for root, _, files in os.walk(store):
+        if root != store and BLOBS_FOLDER not in os.path.relpath(root, store).split(os.sep):
+            for f in files:
+                if not f.startswith("revisions.txt"):
+                    yield os.path.join(root, f)
+
+
+def _blobs(server):
+    result = []
+    for root, _, files in os.walk(os.path.join(server.server_store.store, BLOBS_FOLDER)):
+        result.extend(files)
+    return result
+
+
+def test_server_dedup():
+    server = TestServer(server_capabilities=[CHECKSUM_DEPLOY])
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"],
+                   requester_class=_DeployRequester)
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_exports_sources("*"),
+            "file.txt": "contents"})
+    c.run("create .")
+    _DeployRequester.deploys = []
+    c.run("upload * -r=default -c")
+    # The server doesn't have any of the files, all of them are uploaded
+    assert _DeployRequester.deploys and all(s == 404 for s in _DeployRequester.deploys)
+    files = list(_stored_files(server))
+    assert len(files) == len(_blobs(server))
+    assert all(os.stat(f).st_nlink == 2 for f in files)  # The file and its blob
+
+    # All the files are already stored, a forced upload only deploys them by their checksum
+    _DeployRequester.deploys = []
+    c.run("upload * -r=default -c --force")
+    assert _DeployRequester.deploys and all(s == 201 for s in _DeployRequester.deploys)
+    assert len(_DeployRequester.deploys) == len(files)
+    assert all(os.stat(f).st_nlink == 2 for f in _stored_files(server))
+
+    c.run("remove * -r=default -c")
+    assert _blobs(server) == []
+
+
+def test_server_dedup_reupload():
+    """ the blobs of the replaced files are removed, if no other file references them """
+    server = TestServer(server_capabilities=[CHECKSUM_DEPLOY])
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"])
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_exports_sources("*"),
+            "file.txt": "contents" * 1000})
+    c.run("create .")
+    c.run("upload * -r=default -c")
+    blobs = _blobs(server)
+
+    # The same revisions, with other compressed bytes
+    c.save_home({"global.conf": "core.gzip:compresslevel=1"})
+    for root, _, files in os.walk(c.cache.store):
+        for f in files:
+            if f.endswith(".tgz"):  # The client compresses them again
+                os.remove(os.path.join(root, f))
+    c.run("upload * -r=default -c --force")
+    assert len(_blobs(server)) == len(blobs)
+    assert set(_blobs(server)) != set(blobs)
+    assert all(os.stat(f).st_nlink == 2 for f in _stored_files(server))
+    store = os.path.join(server.server_store.store, BLOBS_FOLDER)
+    for root, _, files in os.walk(store):
+        assert all(os.stat(os.path.join(root, f)).st_nlink == 2 for f in files)
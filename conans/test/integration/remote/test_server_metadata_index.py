@@ -0,0 +1,101 @@
+import os
+
+from conans.model.package_ref import PkgReference
+from conans.model.recipe_ref import RecipeReference
+from conans.server.conf import get_server_store
+from conans.server.store.metadata_index import build_metadata_index, METADATA_INDEX_FILE
+from conans.server.store.server_store import REVISIONS_FILE
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util.env import environment_update
+
+
+def _revisions_files(server):
+    for _, _, files in os.walk(server.server_store.store):
+        for f in files:
+            if f == REVISIONS_FILE:
+                yield f
+
+
+def _upload_revisions(c):
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_settings("os")})
+    c.run("create . -s os=Windows")
+    c.run("create . -s os=Linux")
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_settings("os").with_class_attribute(
+        "description='other revision'")})
+    c.run("create . -s os=Windows")
+    c.run("upload *#*:*#* -r=default -c")
+
+
+def test_metadata_index():
+    with environment_update({"CONAN_SERVER_METADATA_INDEX": "1"}):
+        server = TestServer()
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"])
+    _upload_revisions(c)
+    # The revisions.txt files are still written, the index can be disabled later
+    assert len(list(_revisions_files(server))) == 4
+
+    c.run("list pkg/0.1#* -r=default")
+    assert len(server.server_store.get_recipe_revisions_references(
+        RecipeReference.loads("pkg/0.1"))) == 2
+    latest = c.get_latest_ref_layout(RecipeReference.loads("pkg/0.1")).reference
+    assert server.server_store.get_last_revision(latest).revision == latest.revision
+
+    c.run("list pkg/0.1:* -r=default")
+    assert "os: Windows" in c.out
+    c.run("list pkg/0.1#*:* -r=default")
+    assert "os: Linux" in c.out
+    c.run("search pk* -r=default")
+    assert "pkg/0.1" in c.out
+
+    c.run("remove pkg/0.1#*:* -c -r=default")
+    c.run("list pkg/0.1#*:* -r=default")
+    assert "os: " not in c.out
+    c.run("remove pkg/0.1 -c -r=default")
+    c.run("search pkg -r=default")
+    assert "Recipe 'pkg' not found" in c.out
+
+
+def test_build_metadata_index():
+    server = TestServer()
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"])
+    _upload_revisions(c)
+    file_store = server.server_store
+    ref = RecipeReference.loads("pkg/0.1")
+    expected_rrevs = file_store.get_recipe_revisions_references(ref)
+
+    assert build_metadata_index(file_store.store) == (2, 3)
+    index_store = get_server_store(file_store.store, "v2", metadata_index=True)
+    assert index_store.get_recipe_revisions_references(ref) == expected_rrevs
+    for rrev in expected_rrevs:
+        rref = RecipeReference.loads("pkg/0.1#{}".format(rrev.revision))
+        infos = index_store.metadata_index.package_infos(rref)
+        for package_id, content in infos.items():
+            pref = PkgReference(rref, package_id)
+            assert index_store.get_package_revisions_references(pref) == \
+                file_store.get_package_revisions_references(pref)
+            assert "[settings]" in content
+        assert len(infos) == len(os.listdir(file_store.packages(rref)))
+
+
+def test_metadata_index_disable_enable():
+    with environment_update({"CONAN_SERVER_METADATA_INDEX": "1"}):
+        server = TestServer()
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"])
+    _upload_revisions(c)
+    store = server.server_store.store
+    ref = RecipeReference.loads("pkg/0.1")
+    expected_rrevs = server.server_store.get_recipe_revisions_references(ref)
+
+    # Without the index, the same revisions are served from the files, and the index is removed
+    file_store = get_server_store(store, "v2")
+    assert file_store.get_recipe_revisions_references(ref) == expected_rrevs
+    assert not os.path.exists(os.path.join(store, METADATA_INDEX_FILE))
+
+    # The revisions uploaded meanwhile are in the index built when enabled again
+    new_ref = RecipeReference.loads("pkg/0.1#newrevision")
+    file_store.update_last_revision(new_ref)
+    index_store = get_server_store(store, "v2", metadata_index=True)
+    assert index_store.get_last_revision(ref).revision == "newrevision"
+    assert index_store.get_recipe_revisions_references(ref) == \
+        file_store.get_recipe_revisions_references(ref)
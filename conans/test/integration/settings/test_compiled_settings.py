@@ -0,0 +1,41 @@
+import os
+import textwrap
+from unittest.mock import patch
+
+from conans.client.cache.cache import COMPILED_SETTINGS, _settings_definitions
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+from conans.util.files import save
+
+
+def test_compiled_settings():
+    _settings_definitions.clear()  # Other tests in this process could have loaded them
+    c = TestClient()
+    c.save({"conanfile.py": GenConanfile().with_settings("os")})
+    c.run("install . -s os=Linux")
+    compiled = os.path.join(c.cache_folder, COMPILED_SETTINGS)
+    assert os.path.isfile(compiled)
+
+    # A new process doesn't parse the settings.yml again
+    _settings_definitions.clear()
+    with patch("conans.client.cache.cache._parse_settings") as parse:
+        c.run("install . -s os=Linux")
+        parse.assert_not_called()
+    assert "os=Linux" in c.out
+
+    # Changes in the settings files are loaded
+    save(os.path.join(c.cache_folder, "settings_user.yml"), textwrap.dedent("""\
+        os:
+            new_os:
+        """))
+    c.run("install . -s os=new_os")
+    assert "os=new_os" in c.out
+    os.remove(os.path.join(c.cache_folder, "settings_user.yml"))
+    c.run("install . -s os=new_os", assert_error=True)
+    assert "Invalid setting 'new_os' is not a valid 'settings.os' value" in c.out
+
+    # A broken compiled file is ignored
+    save(compiled, "garbage")
+    _settings_definitions.clear()
+    c.run("install . -s os=Linux")
+    assert "os=Linux" in c.out
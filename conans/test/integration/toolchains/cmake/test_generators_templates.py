@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from jinja2 import Environment
+
+from conan.tools.cmake.cmakedeps.templates import _templates as cmakedeps_templates
+from conan.tools.cmake.toolchain.blocks import toolchain_templates
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+
+
+def test_generators_templates_compiled_once():
+    """ the CMakeToolchain and CMakeDeps templates are compiled once per process, not for every
+    block, dependency and configuration
+    """
+    deps = ["dep1", "dep2"]
+    c = TestClient()
+    c.save({"dep/conanfile.py": GenConanfile().with_settings("build_type"),
+            "conanfile.py": GenConanfile().with_settings("build_type")
+                                          .with_requires(*["{}/0.1".format(d) for d in deps])
+                                          .with_generator("CMakeDeps")
+                                          .with_generator("CMakeToolchain")})
+    for dep in deps:
+        c.run("create dep --name={} --version=0.1".format(dep))
+        c.run("create dep --name={} --version=0.1 -s build_type=Debug".format(dep))
+
+    compiled = []
+    from_string = Environment.from_string
+
+    def counted(env, source, *args, **kwargs):
+        if env in (toolchain_templates.environment, cmakedeps_templates.environment):
+            compiled.append(source)
+        return from_string(env, source, *args, **kwargs)
+
+    # Compiled again, even if other tests in this process already compiled them
+    with patch.dict(toolchain_templates._templates, clear=True), \
+            patch.dict(cmakedeps_templates._templates, clear=True), \
+            patch.object(Environment, "from_string", counted):
+        for build_type in ("Release", "Debug", "Release"):
+            c.run("install . -s build_type={}".format(build_type))
+    # Every template compiled at most once, even the ones used by several dependencies and configs
+    assert compiled
+    assert len(compiled) == len(set(compiled))
@@ -0,0 +1,192 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from conan.internal.cache.db.cache_database import CacheDatabase
+from conans.errors import ConanException
+from conans.model.package_ref import PkgReference
+from conans.model.recipe_ref import RecipeReference
+from conans.test.utils.test_files import temp_folder
+
+
+@pytest.fixture
+def db():
+    return CacheDatabase(os.path.join(temp_folder(), "cache.sqlite3"))
+
+
+def _ref(rrev, timestamp):
+    ref = RecipeReference.loads(f"pkg/1.0#{rrev}")
+    ref.timestamp = timestamp
+    return ref
+
+
+def test_connection_reused_per_thread(db):
+    manager = db._connection_manager
+    with manager.connection() as c1:
+        pass
+    with manager.connection() as c2:
+        pass
+    assert c1 is c2
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(manager._get_connection()))
+    t.start()
+    t.join()
+    assert other[0] is not c1
+
+
+def test_wal_journal_mode(db):
+    with db._connection_manager.connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+    assert mode.lower() == "wal"
+
+
+def test_transaction_commit_and_rollback(db):
+    with db.transaction():
+        db.create_recipe("path1", _ref("rev1", 1))
+        db.create_recipe("path2", _ref("rev2", 2))
+    assert db.get_latest_recipe_reference(RecipeReference.loads("pkg/1.0")).revision == "rev2"
+
+    with pytest.raises(ZeroDivisionError):
+        with db.transaction():
+            db.create_recipe("path3", _ref("rev3", 3))
+            1 / 0
+    assert not db.exists_rrev(RecipeReference.loads("pkg/1.0#rev3"))
+    assert len(db.list_references()) == 2
+
+
+def test_remove_recipe_removes_packages(db):
+    ref = _ref("rev1", 1)
+    db.create_recipe("path", ref)
+    db.create_package("pkgpath", PkgReference(ref, "pid", "prev", 1), None)
+    db.remove_recipe(ref)
+    assert db.list_references() == []
+    assert db.get_package_references(ref) == []
+
+
+def test_parameterized_values(db):
+    # values containing quotes are stored and matched literally
+    ref = RecipeReference.loads('pkg/1.0#rev"1')
+    ref.timestamp = 1
+    db.create_recipe('my"path', ref)
+    assert db.try_get_recipe(ref)["path"] == 'my"path'
+
+
+def test_locked_database_error(db):
+    db.create_recipe("path", _ref("rev1", 1))
+    other = sqlite3.connect(db._connection_manager.filename, isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE;")
+    try:
+        db._connection_manager._timeout = 0
+        db.close()  # Force a new connection with the new timeout
+        with pytest.raises(ConanException, match="is locked by another process"):
+            db.create_recipe("path", _ref("rev2", 2))
+    finally:
+        other.execute("ROLLBACK;")
+        other.close()
+
+
+def test_get_latest_recipe_references(db):
+    db.create_recipe("path1", _ref("rev1", 1))
+    db.create_recipe("path2", _ref("rev2", 2))
+    other = RecipeReference.loads("other/1.0@user/channel#rev3")
+    other.timestamp = 1
+    db.create_recipe("path3", other)
+
+    refs = [RecipeReference.loads(r) for r in ("pkg/1.0", "other/1.0@user/channel", "missing/1.0")]
+    result = db.get_latest_recipe_references(refs)
+    assert result[refs[0]].revision == "rev2"
+    assert result[refs[1]].revision == "rev3"
+    assert result[refs[2]] is None
+
+
+def test_get_latest_package_references(db):
+    ref1 = _ref("rev1", 1)
+    ref2 = _ref("rev2", 2)
+    db.create_package("p1", PkgReference(ref1, "pid1", "prev1", 1), None)
+    db.create_package("p2", PkgReference(ref1, "pid1", "prev2", 2), None)
+    db.create_package("p3", PkgReference(ref2, "pid1", "prev3", 1), None)
+
+    prefs = [PkgReference(ref1, "pid1"), PkgReference(ref2, "pid1"), PkgReference(ref1, "pid2")]
+    result = db.get_latest_package_references(prefs)
+    assert result[prefs[0]].revision == "prev2"
+    assert result[prefs[1]].revision == "prev3"
+    assert result[prefs[2]] is None
+
+
+def test_bulk_queries_chunked(db):
+    refs = [RecipeReference.loads(f"pkg{i}/1.0") for i in range(2000)]
+    for ref in refs[::100]:
+        ref = RecipeReference.loads(f"{ref}#rev")
+        ref.timestamp = 1
+        db.create_recipe(f"path_{ref.name}", ref)
+    result = db.get_latest_recipe_references(refs)
+    assert len(result) == 2000
+    assert len([r for r in result.values() if r is not None]) == 20
+
+
+def test_migrate_recipes_name_columns():
+    filename = os.path.join(temp_folder(), "cache.sqlite3")
+    # The table as created by previous Conan versions, without the name, version... columns
+    conn = sqlite3.connect(filename)
+    conn.execute("CREATE TABLE recipes (reference text NOT NULL, rrev text NOT NULL, "
+                 "path text NOT NULL UNIQUE, timestamp real NOT NULL, UNIQUE(reference, rrev));")
+    conn.execute("INSERT INTO recipes VALUES ('pkg/1.0@user/channel', 'rev1', 'path1', 1)")
+    conn.commit()
+    conn.close()
+
+    db = CacheDatabase(filename)
+    assert [r.repr_notime() for r in db.list_references(name="pkg")] == \
+           ["pkg/1.0@user/channel#rev1"]
+    db.create_recipe("path2", _ref("rev2", 2))
+    assert len(db.list_references(name="PKG")) == 2
+    assert len(db.list_references(name="pk", name_prefix=True)) == 2
+    assert db.list_references(name="pk") == []
+
+
+def test_update_lru(db):
+    db.create_recipe("path1", _ref("rev1", 1))
+    db.create_recipe("path2", _ref("rev2", 2))
+    now = time.time()
+    ref = _ref("rev1", 1)
+    db.update_recipes_lru([ref], now + 10)
+    db.update_recipes_lru([_ref("rev2", 2)], now + 5)
+    assert [r["path"] for r in db.lru_recipes()] == ["path2", "path1"]
+    # Not written if the stored value is more recent than the resolution
+    db.update_recipes_lru([ref], now + 15, resolution=10)
+    assert db.lru_recipes()[1]["lru"] == now + 10
+    db.update_recipes_lru([ref], now + 25, resolution=10)
+    assert db.lru_recipes()[1]["lru"] == now + 25
+
+
+def test_migrate_lru_column():
+    filename = os.path.join(temp_folder(), "cache.sqlite3")
+    conn = sqlite3.connect(filename)
+    conn.execute("CREATE TABLE recipes (reference text NOT NULL, rrev text NOT NULL, "
+                 "path text NOT NULL UNIQUE, timestamp real NOT NULL, UNIQUE(reference, rrev));")
+    conn.execute("INSERT INTO recipes VALUES ('pkg/1.0', 'rev1', 'path1', 7)")
+    conn.commit()
+    conn.close()
+
+    db = CacheDatabase(filename)
+    # The existing revisions are considered used when they were created
+    assert db.lru_recipes()[0]["lru"] == 7
+
+
+def test_create_package_extra_column():
+    filename = os.path.join(temp_folder(), "cache.sqlite3")
+    db = CacheDatabase(filename)
+    db.create_recipe("path1", _ref("rev1", 1))
+    # A column added by a later Conan version
+    conn = sqlite3.connect(filename)
+    conn.execute("ALTER TABLE packages ADD COLUMN extra text")
+    conn.commit()
+    conn.close()
+
+    db = CacheDatabase(filename)
+    pref = PkgReference(_ref("rev1", 1), "pkgid", "prev", 2)
+    db.create_package("path2", pref, None)
+    assert db.get_package_revisions_references(pref) == [pref]
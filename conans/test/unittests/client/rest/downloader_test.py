@@ -1,12 +1,15 @@
+import hashlib
+import io
 import os
 import re
+import tarfile
 import tempfile
 import unittest
 
 import pytest
 
 from conans.client.downloaders.file_downloader import FileDownloader
-from conans.errors import ConanException
+from conans.errors import ConanException, ConanConnectionError
 
 
 class MockResponse(object):
@@ -113,3 +116,51 @@ class DownloaderUnitTest(unittest.TestCase):
         downloader.download("fake_url", file_path=self.target)
         actual_content = open(self.target, "rb").read()
         self.assertEqual(expected_content, actual_content)
+
+
+def _tgz(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tgz:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tgz.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class DownloadExtractTest(unittest.TestCase):
+    def setUp(self):
+        self.target = tempfile.mkdtemp()
+        self.data = _tgz({"file.txt": b"some data", "sub/other.txt": b"other data"})
+
+    def test_download_extract(self):
+        requester = MockRequester(self.data)
+        downloader = FileDownloader(requester=requester)
+        downloader.download_extract("fake_url", self.target)
+        with open(os.path.join(self.target, "file.txt"), "rb") as f:
+            self.assertEqual(b"some data", f.read())
+        with open(os.path.join(self.target, "sub", "other.txt"), "rb") as f:
+            self.assertEqual(b"other data", f.read())
+
+    def test_download_extract_checksum(self):
+        sha1 = hashlib.sha1(self.data).hexdigest()
+        requester = MockRequester(self.data, echo_header={"X-Checksum-Sha1": sha1})
+        FileDownloader(requester=requester).download_extract("fake_url", self.target)
+        self.assertTrue(os.path.isfile(os.path.join(self.target, "file.txt")))
+
+        requester = MockRequester(self.data, echo_header={"X-Checksum-Sha1": "1234"})
+        with pytest.raises(ConanException, match=r"sha1 signature failed"):
+            FileDownloader(requester=requester).download_extract("fake_url", self.target)
+
+    def test_download_extract_interrupted(self):
+        # The extraction cannot be resumed, the caller has to download again
+        requester = MockRequester(self.data, chunk_size=len(self.data) // 2)
+        downloader = FileDownloader(requester=requester)
+        with pytest.raises(ConanConnectionError, match=r"Transfer interrupted"):
+            downloader.download_extract("fake_url", self.target)
+
+    def test_download_extract_corrupted(self):
+        requester = MockRequester(b"not a tgz file")
+        downloader = FileDownloader(requester=requester)
+        with pytest.raises(ConanException, match=r"Error while extracting downloaded file"):
+            downloader.download_extract("fake_url", self.target)
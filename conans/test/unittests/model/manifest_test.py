@@ -1,11 +1,13 @@
 import os
 import platform
+import time
+from unittest.mock import patch
 
 import pytest
 
 from conans.model.manifest import FileTreeManifest
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import load, md5, save
+from conans.util.files import load, md5, md5sum, save
 
 
 @pytest.mark.skipif(platform.system() == "Windows", reason="decent symlinks only")
@@ -82,3 +84,45 @@ def test_pycache_included():
     manifest = repr(manifest)
     assert "pythonfile.pyc" in manifest
     assert "__pycache__/damn.py" in manifest
+
+
+def test_tree_manifest_parallel():
+    tmp_dir = temp_folder()
+    for i in range(100):
+        save(os.path.join(tmp_dir, "folder{}".format(i % 7), "file{}.h".format(i)), str(i) * i)
+    manifest = FileTreeManifest.create(tmp_dir, threads=8)
+    assert manifest == FileTreeManifest.create(tmp_dir, threads=1)
+    assert manifest.file_sums["folder3/file10.h"] == md5("10" * 10)
+
+
+def test_hashes_cache():
+    tmp_dir = temp_folder()
+    folder = os.path.join(tmp_dir, "p")
+    hashes_file = os.path.join(tmp_dir, "hashes.json")
+    save(os.path.join(folder, "old.h"), "old")
+    save(os.path.join(folder, "new.h"), "new")
+    # Only the files not modified while hashing them can be cached
+    past = time.time() - 100
+    os.utime(os.path.join(folder, "old.h"), (past, past))
+    expected = FileTreeManifest.create(folder)
+
+    hashed = []
+
+    def counted(path):
+        hashed.append(os.path.basename(path))
+        return md5sum(path)
+
+    with patch("conans.model.manifest.md5sum", counted):
+        assert FileTreeManifest.create(folder, hashes_file=hashes_file) == expected
+        assert sorted(hashed) == ["new.h", "old.h"]
+        hashed.clear()
+        assert FileTreeManifest.create(folder, hashes_file=hashes_file) == expected
+        assert hashed == ["new.h"]
+
+        # Any modification is detected
+        hashed.clear()
+        save(os.path.join(folder, "old.h"), "modified")
+        os.utime(os.path.join(folder, "old.h"), (past, past))
+        manifest = FileTreeManifest.create(folder, hashes_file=hashes_file)
+        assert manifest.file_sums["old.h"] == md5("modified")
+        assert sorted(hashed) == ["new.h", "old.h"]
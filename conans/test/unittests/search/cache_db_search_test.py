@@ -1,3 +1,54 @@
-class CacheDbSearchTest:
-    # TODO: cache2.0 add some unittests for serach in cache db
-    pass
+import pytest
+
+from conans.client.cache.cache import ClientCache
+from conans.model.recipe_ref import RecipeReference
+from conans.search.search import search_recipes, _pattern_name
+from conans.test.utils.test_files import temp_folder
+
+
+class TestCacheDbSearch:
+
+    @pytest.fixture(scope="class")
+    def cache(self):
+        cache = ClientCache(temp_folder())
+        for i, r in enumerate(["zlib/1.0#r1", "zlib/1.1#r2", "zlib/1.1#r3", "zlix/1.0#r4",
+                               "zlib/2.0@user/channel#r5", "my_pkg/1.0#r6", "myxpkg/1.0#r7",
+                               "Upper/1.0#r8"]):
+            ref = RecipeReference.loads(r)
+            ref.timestamp = i + 1
+            cache._data_cache._db.create_recipe(f"path{i}", ref)
+        return cache
+
+    @pytest.mark.parametrize("pattern, expected", [
+        ("zlib", ["zlib/2.0@user/channel#r5", "zlib/1.1#r3", "zlib/1.1#r2", "zlib/1.0#r1"]),
+        ("zlib/*", ["zlib/2.0@user/channel#r5", "zlib/1.1#r3", "zlib/1.1#r2", "zlib/1.0#r1"]),
+        ("zli*", ["zlib/2.0@user/channel#r5", "zlix/1.0#r4", "zlib/1.1#r3", "zlib/1.1#r2",
+                  "zlib/1.0#r1"]),
+        ("zlib/1.1", ["zlib/1.1#r3", "zlib/1.1#r2"]),
+        ("zlib/*@user/channel", ["zlib/2.0@user/channel#r5"]),
+        ("my_*", ["my_pkg/1.0#r6"]),
+        ("upper/*", ["Upper/1.0#r8"]),
+        ("*/1.0", ["Upper/1.0#r8", "myxpkg/1.0#r7", "my_pkg/1.0#r6", "zlix/1.0#r4",
+                   "zlib/1.0#r1"]),
+    ])
+    def test_search(self, cache, pattern, expected):
+        refs = search_recipes(cache, pattern)
+        assert [r.repr_notime() for r in refs] == expected
+
+    def test_search_case_sensitive(self, cache):
+        assert search_recipes(cache, "upper/*", ignorecase=False) == []
+        refs = search_recipes(cache, "Upper/*", ignorecase=False)
+        assert [r.repr_notime() for r in refs] == ["Upper/1.0#r8"]
+
+
+@pytest.mark.parametrize("pattern, name", [
+    ("zlib", ("zlib", False)),
+    ("zlib/*", ("zlib", False)),
+    ("zlib/1.0@user/channel", ("zlib", False)),
+    ("zli*", ("zli", True)),
+    ("zl?b/1.0", ("zl", True)),
+    ("*", (None, False)),
+    ("*/1.0", (None, False)),
+])
+def test_pattern_name(pattern, name):
+    assert _pattern_name(pattern) == name
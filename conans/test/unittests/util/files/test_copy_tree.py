@@ -0,0 +1,77 @@
+import os
+import platform
+import shutil
+import stat
+import time
+
+import pytest
+
+from conans.test.utils.test_files import temp_folder
+from conans.util.copy_tree import copy_tree, COPY_STRATEGIES
+from conans.util.files import save, load
+
+
+def _tree(files=10, size=100):
+    folder = temp_folder()
+    for i in range(files):
+        save(os.path.join(folder, "src", "dir{}".format(i % 5), "file{}.cpp".format(i)),
+             "x" * size)
+    save(os.path.join(folder, "CMakeLists.txt"), "project(pkg)")
+    os.makedirs(os.path.join(folder, "empty"))
+    if platform.system() != "Windows":
+        os.chmod(os.path.join(folder, "CMakeLists.txt"), 0o755)
+        os.symlink("CMakeLists.txt", os.path.join(folder, "link.txt"))
+        os.symlink("src", os.path.join(folder, "link_dir"))
+        os.symlink("missing", os.path.join(folder, "broken"))
+    return folder
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+@pytest.mark.parametrize("strategy", COPY_STRATEGIES)
+def test_copy_tree(strategy, threads):
+    src = _tree()
+    dst = os.path.join(temp_folder(), "build")
+    copy_tree(src, dst, strategy, threads=threads)
+
+    expected = os.path.join(temp_folder(), "expected")
+    shutil.copytree(src, expected, symlinks=True)
+    for root, dirs, files in os.walk(expected):
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            copied = os.path.join(dst, os.path.relpath(path, expected))
+            assert os.path.islink(path) == os.path.islink(copied)
+            if os.path.islink(path):
+                assert os.readlink(path) == os.readlink(copied)
+            elif os.path.isfile(path):
+                assert load(path) == load(copied)
+                executable = os.stat(path).st_mode & stat.S_IXUSR
+                assert os.stat(copied).st_mode & stat.S_IXUSR == executable
+            else:
+                assert os.path.isdir(copied)
+
+    cmakelists = os.path.join(dst, "CMakeLists.txt")
+    if strategy == "hardlink-readonly":
+        assert os.path.samefile(cmakelists, os.path.join(src, "CMakeLists.txt"))
+        assert not os.stat(cmakelists).st_mode & stat.S_IWUSR
+    else:
+        assert not os.path.samefile(cmakelists, os.path.join(src, "CMakeLists.txt"))
+        save(cmakelists, "modified")
+        assert load(os.path.join(src, "CMakeLists.txt")) == "project(pkg)"
+
+
+@pytest.mark.benchmark
+def test_copy_tree_benchmark():
+    """ the time to populate the build folder of a synthetic large source tree with every
+    strategy. Run with "-m benchmark -s" to see the timings
+    """
+    src = _tree(files=2000, size=20000)
+    timings = {}
+    for strategy in COPY_STRATEGIES:
+        for threads in (1, 8):
+            dst = os.path.join(temp_folder(), "build")
+            start = time.time()
+            copy_tree(src, dst, strategy, threads=threads)
+            timings[(strategy, threads)] = time.time() - start
+            assert len(os.listdir(os.path.join(dst, "src"))) == 5
+    print("copy of 2000 files, 40MB: {}".format(", ".join("{} ({} threads) {:.3f}s".format(s, t, v)
+                                                         for (s, t), v in timings.items())))
@@ -0,0 +1,72 @@
+import gzip
+import io
+import os
+import random
+import tarfile
+
+import pytest
+
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import gzopen_without_timestamps, save, tar_extract, load
+from conans.util.parallel_gzip import ParallelGzipWriter
+
+
+def _data(size):
+    r = random.Random(42)
+    words = [bytes(r.choice(b"abcdefghij") for _ in range(8)) for _ in range(1000)]
+    return b" ".join(r.choice(words) for _ in range(size // 9))
+
+
+@pytest.mark.parametrize("size", [0, 10, 100000, 1000000])
+@pytest.mark.parametrize("compresslevel", [1, 6, 9])
+def test_parallel_gzip_standard_stream(size, compresslevel):
+    data = _data(size)
+    output = io.BytesIO()
+    writer = ParallelGzipWriter(output, compresslevel=compresslevel, threads=4, block_size=16384)
+    writer.write(data[:size // 3])
+    writer.write(data[size // 3:])
+    assert writer.tell() == len(data)
+    writer.close()
+    # It is readable by the standard gzip
+    assert gzip.decompress(output.getvalue()) == data
+
+
+def test_parallel_gzip_reproducible():
+    data = _data(300000)
+
+    def compress(threads):
+        output = io.BytesIO()
+        writer = ParallelGzipWriter(output, threads=threads, block_size=16384)
+        for i in range(0, len(data), 1000):
+            writer.write(data[i:i + 1000])
+        writer.close()
+        return output.getvalue()
+
+    result = compress(2)
+    assert result == compress(2)
+    assert result == compress(8)
+    # The dictionary from the previous block keeps the ratio close to a single stream
+    assert len(result) < len(gzip.compress(data)) * 1.05
+
+
+def test_parallel_tgz():
+    folder = temp_folder()
+    files = {}
+    for i in range(10):
+        name = f"folder{i % 3}/file{i}.txt"
+        save(os.path.join(folder, "src", name), _data(i * 50000).decode())
+        files[name] = os.path.join(folder, "src", name)
+
+    tgz_path = os.path.join(folder, "file.tgz")
+    with open(tgz_path, "wb") as tgz_handle:
+        tgz = gzopen_without_timestamps("file.tgz", mode="w", fileobj=tgz_handle, threads=3)
+        for name, path in sorted(files.items()):
+            tgz.add(path, name, recursive=False)
+        tgz.close()
+
+    with open(tgz_path, "rb") as f:
+        assert tarfile.open(fileobj=f).getnames() == sorted(files)
+        f.seek(0)
+        tar_extract(f, os.path.join(folder, "dst"))
+    for name, path in files.items():
+        assert load(os.path.join(folder, "dst", name)) == load(path)
@@ -0,0 +1,121 @@
+import errno
+import os
+import platform
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+COPY_STRATEGIES = ("copy", "reflink", "hardlink-readonly")
+
+_FICLONE = 0x40049409  # Linux ioctl, supported by btrfs, xfs, bcachefs, overlayfs...
+# The errors of a filesystem (or the pair of them) that can't clone or link files
+UNSUPPORTED_ERRORS = (errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY,
+                      errno.ENOSYS, errno.EPERM)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def reflink(src, dst):
+    """ copy-on-write clone of the ``src`` file, that doesn't use disk space until one of them
+    is modified. Raises OSError if the filesystem or the platform doesn't support it
+    """
+    system = platform.system()
+    if system == "Linux":
+        import fcntl
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            _remove(dst)
+            raise
+    elif system == "Darwin":
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), dst)
+    else:
+        raise OSError(errno.EOPNOTSUPP, "reflinks not supported in {}".format(system), dst)
+    shutil.copystat(src, dst)
+
+
+def reflink_or_copy(src, dst):
+    try:
+        reflink(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class _FileLinker:
+    """ creates the files of the destination tree with the given strategy, falling back to a
+    regular copy for good once the filesystem has shown it doesn't support it
+    """
+
+    def __init__(self, strategy):
+        self._strategy = strategy
+        self._supported = strategy != "copy"
+
+    def __call__(self, src, dst):
+        if self._supported:
+            try:
+                if self._strategy == "reflink":
+                    reflink(src, dst)
+                else:
+                    # The source file is shared, so it is protected from the builds
+                    mode = stat.S_IMODE(os.stat(src).st_mode)
+                    if mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+                        os.chmod(src, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+                    os.link(src, dst)
+                return
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRORS + (errno.EMLINK,):
+                    raise
+                if e.errno != errno.EMLINK:  # Too many links is specific to this file
+                    self._supported = False
+        shutil.copy2(src, dst)
+
+
+def copy_tree(src, dst, strategy="copy", threads=8):
+    """ the equivalent of ``shutil.copytree(src, dst, symlinks=True)``, but creating the files in
+    parallel threads, as regular copies (``copy``), as copy-on-write clones that only use disk
+    space once they are modified (``reflink``), or as hardlinks to the source files, that are
+    made read-only because any modification would modify the source too (``hardlink-readonly``).
+
+    The ``reflink`` and ``hardlink-readonly`` strategies fall back to regular copies when the
+    filesystem doesn't support them.
+    """
+    link = _FileLinker(strategy)
+    files = []
+    folders = []
+    for root, dirs, filenames in os.walk(src):
+        dst_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(dst_root, exist_ok=True)
+        folders.append((root, dst_root))
+        for name in dirs + filenames:
+            src_path = os.path.join(root, name)
+            dst_path = os.path.join(dst_root, name)
+            if os.path.islink(src_path):
+                os.symlink(os.readlink(src_path), dst_path)
+            elif name in filenames:
+                files.append((src_path, dst_path))
+
+    errors = []
+
+    def _copy(item):
+        try:
+            link(*item)
+        except OSError as e:
+            errors.append((item[0], item[1], str(e)))
+
+    with ThreadPoolExecutor(max(1, threads), thread_name_prefix="conan_copy") as pool:
+        list(pool.map(_copy, files))
+    # The folders modification times are restored once their files have been created
+    for src_folder, dst_folder in reversed(folders):
+        shutil.copystat(src_folder, dst_folder)
+    if errors:
+        raise shutil.Error(errors)
@@ -97,7 +97,7 @@ def _generic_algorithm_sum(file_path, algorithm_name):
         except ValueError:  # FIPS error https://github.com/conan-io/conan/issues/7800
             m = hashlib.new(algorithm_name, usedforsecurity=False)
         while True:
-            data = fh.read(8192)
+            data = fh.read(1024 * 1024)  # hashlib releases the GIL for large blocks
             if not data:
                 break
             m.update(data)
@@ -251,10 +251,12 @@ def mkdir(path):
     os.makedirs(path)
 
 
-def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None, **kwargs):
+def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None, threads=None,
+                              **kwargs):
     """ !! Method overrided by laso to pass mtime=0 (!=None) to avoid time.time() was
         setted in Gzip file causing md5 to change. Not possible using the
         previous tarfile open because arguments are not passed to GzipFile constructor
+        With threads > 1, the writing is compressed by blocks in parallel threads
     """
 
     if mode not in ("r", "w"):
@@ -262,7 +264,11 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
 
     try:
         compresslevel = compresslevel if compresslevel is not None else 9  # default Gzip = 9
-        fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
+        if mode == "w" and threads is not None and threads > 1:
+            from conans.util.parallel_gzip import ParallelGzipWriter
+            fileobj = ParallelGzipWriter(fileobj, compresslevel, threads)
+        else:
+            fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
     except OSError:
         if fileobj is not None and mode == 'r':
             raise tarfile.ReadError("not a gzip file")
@@ -285,8 +291,9 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
     return t
 
 
-def tar_extract(fileobj, destination_dir):
-    the_tar = tarfile.open(fileobj=fileobj)
+def tar_extract(fileobj, destination_dir, stream=False):
+    # A stream is extracted sequentially as it is read, without seeking, e.g. while downloading
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
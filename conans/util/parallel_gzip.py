@@ -0,0 +1,90 @@
+import struct
+import zlib
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+BLOCK_SIZE = 1024 * 1024  # Uncompressed bytes of every independently compressed block
+_DICTIONARY_SIZE = 32 * 1024  # Max deflate window, the tail of every block primes the next one
+
+
+def _deflate(block, dictionary, compresslevel, last):
+    if dictionary:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS,
+                                      zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # A sync flush ends the block in a byte boundary, so the raw deflate outputs of all blocks
+    # can be concatenated. Only the last one is finished, marking the end of the deflate stream
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if last else
+                                                         zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipWriter:
+    """ Write-only file object that produces a standard gzip stream, like gzip.GzipFile, but
+    compressing the data in blocks in parallel threads (the pigz approach).
+
+    The data is split in blocks of a fixed size, every block is deflated independently, using
+    the last 32KB of the previous block as dictionary to keep the compression ratio, and the
+    results are written in order. As the blocks boundaries only depend on the data, the output
+    is reproducible for the same input and compression level, irrespective of the number of
+    threads. The header doesn't contain the file name nor the modification time (mtime=0).
+    """
+
+    def __init__(self, fileobj, compresslevel=9, threads=2, block_size=BLOCK_SIZE):
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._block_size = block_size
+        self._pool = ThreadPool(threads)
+        self._max_pending = 2 * threads  # Bounded memory, while keeping all threads busy
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self.closed = False
+        # Same extra flags as gzip.GzipFile: 2 for max compression, 4 for the fastest
+        xfl = 2 if compresslevel == 9 else 4 if compresslevel == 1 else 0
+        # magic, deflate method, no flags, mtime=0, extra flags, unknown OS
+        fileobj.write(b"\x1f\x8b\x08\x00" + struct.pack("<L", 0) + bytes([xfl, 255]))
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[:self._block_size])
+            del self._buffer[:self._block_size]
+            self._compress(block, last=False)
+        return len(data)
+
+    def tell(self):
+        # Uncompressed position, as GzipFile, it is what tarfile uses
+        return self._size + len(self._buffer)
+
+    def flush(self):
+        pass
+
+    def _compress(self, block, last):
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        self._pending.append(self._pool.apply_async(_deflate, (block, self._dictionary,
+                                                               self._compresslevel, last)))
+        self._dictionary = block[-_DICTIONARY_SIZE:]
+        while len(self._pending) > self._max_pending:
+            self._fileobj.write(self._pending.popleft().get())
+
+    def close(self):
+        """ writes the pending data and the gzip trailer, but doesn't close the underlying
+        file object, that belongs to the caller
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._compress(bytes(self._buffer), last=True)
+            self._buffer = bytearray()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().get())
+            self._fileobj.write(struct.pack("<LL", self._crc & 0xffffffff,
+                                            self._size & 0xffffffff))
+        finally:
+            self._pool.close()
+            self._pool.join()
@@ -0,0 +1,33 @@
+import threading
+
+from jinja2 import Environment
+
+# Most templates are class attributes, so this is only reached with dynamically built ones
+_MAX_TEMPLATES = 1000
+
+
+class TemplatesCache:
+    """ A jinja2 Environment that keeps its compiled templates for the whole process.
+
+    The generators render the same few templates again and again (the CMakeToolchain blocks, the
+    CMakeDeps files of every dependency and configuration...), and compiling them costs much
+    more than rendering them.
+    """
+
+    def __init__(self, **options):
+        self.environment = Environment(**options)
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def get(self, source):
+        template = self._templates.get(source)
+        if template is None:
+            template = self.environment.from_string(source)
+            with self._lock:
+                if len(self._templates) >= _MAX_TEMPLATES:
+                    self._templates.clear()
+                self._templates[source] = template
+        return template
+
+    def render(self, source, *args, **kwargs):
+        return self.get(source).render(*args, **kwargs)